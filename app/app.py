@@ -1,3 +1,5 @@
+import logging
+
 import reflex as rx
 from app.pages.dashboard import dashboard_page
 from app.pages.orders import orders_page
@@ -9,12 +11,21 @@ from app.states.orders_state import OrdersState
 from app.states.products_state import ProductsState
 from app.states.customers_state import CustomersState
 from app.states.analytics_state import AnalyticsState
+from app.db.migrations import migrate
+from app.db.storage import report as storage_report
+from app.metrics import create_metrics_app
 
 
 def index() -> rx.Component:
     return dashboard_page()
 
 
+# Aplica las migraciones de esquema pendientes sobre northwind.db.
+migrate()
+logger = logging.getLogger(__name__)
+if logger.isEnabledFor(logging.INFO):
+    logger.info(storage_report())
+
 app = rx.App(
     theme=rx.theme(
             appearance="light", # Puede ser "light", "dark", o "inherit"
@@ -29,6 +40,8 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    # Prometheus /metrics for this worker, served next to the Reflex backend.
+    api_transformer=create_metrics_app(lambda: app),
 )
 app.add_page(index, route="/", on_load=DashboardState.on_load)
 app.add_page(orders_page, route="/orders", on_load=[OrdersState.fetch_orders, OrdersState.fetch_stats])
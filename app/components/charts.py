@@ -4,9 +4,6 @@ from typing import List, Dict, Any
 
 
 from app.states.dashboard_state import DashboardState
-import plotly.express as px
-import pandas as pd
-
 
 
 def sales_over_time_chart() -> rx.Component:
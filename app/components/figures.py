@@ -0,0 +1,83 @@
+"""Plotly figures of the dashboard, built once per distinct data.
+
+Sessions looking at the same dates get the same ``geo_sales`` rows, so the
+choropleth is keyed by those rows and shared: it is built from a ``go.Choropleth``
+trace template (no DataFrame, no plotly.express) and serialized to plotly JSON
+once, and that JSON is what Reflex sends for every session showing it.
+
+``plotly.graph_objects`` is imported at module level on purpose: Reflex's own
+serializers load it at startup anyway, and ``CachedFigure`` and its
+serializer need the class. Only plotly.express and pandas stay out.
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Mapping
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from reflex.utils.serializers import serializer
+
+# Distinct date ranges whose figure is kept.
+MAX_FIGURES = 32
+
+LAYOUT = {
+    "template": "plotly_white",
+    "margin": {"l": 0, "r": 0, "t": 0, "b": 0},
+    "geo": {"bgcolor": "rgba(0,0,0,0)"},
+    "paper_bgcolor": "rgba(0,0,0,0)",
+}
+
+# Same look as px.choropleth(color="sales", hover_name="country", color_continuous_scale=Teal).
+GEO_SALES_TRACE = {
+    "type": "choropleth",
+    "locationmode": "country names",
+    "colorscale": "Teal",
+    "colorbar": {"title": {"text": "sales"}},
+    "hovertemplate": "<b>%{location}</b><br><br>sales=%{z}<extra></extra>",
+}
+
+
+class CachedFigure(go.Figure):
+    """A figure whose plotly JSON is computed once; treat it as read-only."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._plotly_json = json.loads(pio.to_json(self, validate=False))
+
+
+@serializer
+def serialize_cached_figure(figure: CachedFigure) -> dict:
+    return figure._plotly_json
+
+
+_figures: OrderedDict[tuple, CachedFigure] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _geo_sales_figure(rows: tuple[tuple[str, float], ...]) -> CachedFigure:
+    if not rows:
+        return CachedFigure(layout={key: value for key, value in LAYOUT.items() if key != "template"})
+    countries, sales = zip(*rows)
+    return CachedFigure(data=[{**GEO_SALES_TRACE, "locations": countries, "z": sales}], layout=LAYOUT)
+
+
+def clear_figures() -> None:
+    with _lock:
+        _figures.clear()
+
+
+def geo_sales_figure(geo_sales: Iterable[Mapping[str, Any]]) -> CachedFigure:
+    """Choropleth of ``{"country", "sales"}`` rows, shared by every caller with the same rows."""
+    key = tuple((row["country"], row["sales"]) for row in geo_sales)
+    with _lock:
+        figure = _figures.get(key)
+        if figure is not None:
+            _figures.move_to_end(key)
+            return figure
+    figure = _geo_sales_figure(key)
+    with _lock:
+        _figures[key] = figure
+        while len(_figures) > MAX_FIGURES:
+            _figures.popitem(last=False)
+    return figure
@@ -0,0 +1,199 @@
+"""Process-wide cache of query results keyed by SQL text and parameters.
+
+Entries are bounded by an approximate memory budget (LRU eviction) and a
+TTL, and the whole cache is dropped as soon as the database changes, i.e.
+``PRAGMA data_version`` moves on a dedicated probe connection (commits from
+any other connection or process). Lookups run on the event loop, so the probe
+is only asked every ``DATA_VERSION_INTERVAL`` seconds; in between, the last
+version is reused.
+"""
+import dataclasses
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, TypedDict
+
+from app.db.settings import DATA_VERSION_INTERVAL, DB_PATH, QUERY_CACHE_MAX_BYTES, QUERY_CACHE_TTL
+from app.db.storage import open_reader
+
+MISSING = object()
+
+
+class CacheStats(TypedDict):
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    hit_rate: float
+
+
+class DataVersion:
+    """Cheap token that changes whenever committed data in the DB file changes.
+
+    At most ``interval`` seconds stale: a commit may go unnoticed for that
+    long, which readers of a snapshot already tolerate.
+    """
+
+    def __init__(self, db_path: str, interval: float = DATA_VERSION_INTERVAL):
+        self.db_path = db_path
+        self.interval = interval
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # (monotonic time of the probe, version); replaced as a whole, so read without the lock.
+        self._last: tuple[float, int] = (float("-inf"), -1)
+
+    def _probe(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = open_reader(self.db_path)
+        return self._conn
+
+    def current(self) -> int:
+        checked_at, version = self._last
+        if time.monotonic() - checked_at < self.interval:
+            return version
+        with self._lock:
+            checked_at, version = self._last
+            now = time.monotonic()
+            if now - checked_at < self.interval:
+                return version
+            try:
+                version = self._probe().execute("PRAGMA data_version").fetchone()[0]
+            except sqlite3.Error:
+                version = -1
+            self._last = (now, version)
+            return version
+
+
+def _estimate_size(value: Any) -> int:
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _estimate_size(k) + _estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, sqlite3.Row):
+        return 56 + sum(sys.getsizeof(item) for item in value)
+    # NumPy arrays (getsizeof only counts the buffer of arrays that own it) and
+    # objects reporting their own footprint, such as the columnar fact store.
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return max(sys.getsizeof(value), nbytes)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sys.getsizeof(value) + sum(
+            _estimate_size(getattr(value, field.name)) for field in dataclasses.fields(value)
+        )
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        return sys.getsizeof(value) + _estimate_size(vars(value))
+    return sys.getsizeof(value)
+
+
+class QueryCache:
+    def __init__(self, db_path: str, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._version = DataVersion(db_path)
+        self._seen_version: int | None = None
+        self._entries: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def _check_version(self) -> None:
+        version = self._version.current()
+        if version != self._seen_version:
+            if self._seen_version is not None and self._entries:
+                self._invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._seen_version = version
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for ``key`` or ``MISSING``."""
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return MISSING
+            stored_at, size, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._bytes -= size
+                self._expirations += 1
+                self._misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, version: int | None = None) -> None:
+        """Store ``value``; skipped when it was computed against an older ``version``."""
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if version is not None:
+                self._check_version()
+                if version != self._seen_version:
+                    return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (time.monotonic(), size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def data_version(self) -> int:
+        return self._version.current()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+_cache: QueryCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> QueryCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = QueryCache(DB_PATH, QUERY_CACHE_MAX_BYTES, QUERY_CACHE_TTL)
+    return _cache
+
+
+def cache_stats() -> CacheStats:
+    return get_cache().stats()
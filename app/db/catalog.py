@@ -0,0 +1,38 @@
+"""Indexes behind the sorts and filters of the /products catalog.
+
+``SORT_COLUMNS`` maps each sort of the page to its SQL expression. Every
+``Products`` column sort, and the inventory status (through an index on the
+same ``CASE`` expression), has an index of its own and one within a category,
+so the first page of any of them is an index walk. Category and supplier names
+live in other tables and are sorted with a temp b-tree.
+"""
+import sqlite3
+
+INVENTORY_STATUS = (
+    "CASE WHEN COALESCE(UnitsInStock, 0) = 0 THEN 'Out of Stock' "
+    "WHEN UnitsInStock < 10 THEN 'Low Stock' ELSE 'In Stock' END"
+)
+
+# Sort key of the /products page -> SQL expression over Products p, Categories c, Suppliers s.
+SORT_COLUMNS = {
+    "product_name": "p.ProductName",
+    "unit_price": "p.UnitPrice",
+    "units_in_stock": "p.UnitsInStock",
+    "inventory_status": INVENTORY_STATUS,
+    "category_name": "COALESCE(c.CategoryName, 'Uncategorized')",
+    "supplier_name": "COALESCE(s.CompanyName, 'Unknown')",
+}
+INDEXED_SORTS = {
+    "product_name": "ProductName",
+    "unit_price": "UnitPrice",
+    "units_in_stock": "UnitsInStock",
+    "inventory_status": INVENTORY_STATUS,
+}
+
+
+def create_product_indexes(conn: sqlite3.Connection) -> None:
+    for key, expression in INDEXED_SORTS.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_products_{key} ON Products({expression})")
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_products_category_{key} ON Products(CategoryID, {expression})"
+        )
@@ -0,0 +1,336 @@
+"""Process-wide columnar snapshot of orders and order lines for analytics.
+
+``OrderDetails`` joined with ``Orders`` is read into NumPy arrays, one entry
+per order line, with every dimension reduced to a dense integer code, so
+analytics aggregates are ``np.bincount`` calls over contiguous arrays instead
+of SQL round trips and loops over Python tuples. Order counts are of orders
+with lines, as in the ``Orders JOIN OrderDetails`` they replace; ``Orders``
+gets arrays of its own so the watermark below also covers orders without
+lines. The snapshot is shared by every session of the worker, together with
+``SalesSeries``: running totals by month, category and employee.
+
+Refreshes are incremental. The store remembers the highest OrderID it has
+folded in (its watermark) and the ``SalesRewrites`` generation. When the data
+version moves but the generation has not, only orders from the watermark on
+are read (the watermark order itself again, in case lines were added to it)
+and their contributions are swapped into the series, so a refresh costs what
+was added, not the whole history. Any other change (an edit, a delete, an
+insert behind the watermark, a product moved to another category, reordered
+dimension rows) falls back to a full load.
+"""
+import sqlite3
+import threading
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from app.db.cache import get_cache
+from app.db.query import run
+
+CHUNK_ROWS = 100_000
+# julianday() of 1970-01-01, so day numbers line up with datetime64[D].
+UNIX_EPOCH_JD = 2440587.5
+DAY = f"julianday(substr(o.OrderDate, 1, 10)) - {UNIX_EPOCH_JD}"
+# Month 0 of the monthly series (quarter aligned); earlier dates are left out.
+MONTH_ORIGIN = np.datetime64("1900-01", "M")
+
+LINES_SQL = f"""
+    SELECT od.OrderID, {DAY}, o.CustomerID, od.ProductID, o.EmployeeID, od.Quantity, od.LineTotal
+    FROM OrderDetails od
+    JOIN Orders o ON o.OrderID = od.OrderID
+    {{where}}
+    ORDER BY od.OrderID, od.ProductID
+"""
+ORDERS_SQL = "SELECT o.OrderID FROM Orders o {where} ORDER BY o.OrderID"
+
+LINE_COLUMNS = ("order", "day", "customer", "product", "employee", "category", "quantity", "revenue")
+ORDER_COLUMNS = ("order_id",)
+
+
+@dataclass(frozen=True)
+class Dimensions:
+    """Dimension rows in insertion order, so new rows only append codes."""
+
+    customer_ids: list[str]
+    customer_names: list[str]
+    employee_ids: list[int]
+    employee_names: list[str]
+    category_ids: list[int]
+    category_names: list[str]
+    product_category: dict[int, int | None]  # ProductID -> CategoryID
+
+    def extends(self, old: "Dimensions") -> bool:
+        """Whether every code of ``old`` still means the same row here."""
+        return (
+            self.customer_ids[: len(old.customer_ids)] == old.customer_ids
+            and self.employee_ids[: len(old.employee_ids)] == old.employee_ids
+            and self.category_ids[: len(old.category_ids)] == old.category_ids
+            and all(
+                product in self.product_category and self.product_category[product] == category
+                for product, category in old.product_category.items()
+            )
+        )
+
+
+@dataclass(frozen=True)
+class SalesSeries:
+    """Running totals; months count from ``MONTH_ORIGIN``, the rest are indexed by code."""
+
+    month_revenue: np.ndarray
+    month_lines: np.ndarray
+    month_orders: np.ndarray
+    category_revenue: np.ndarray
+    category_lines: np.ndarray
+    employee_revenue: np.ndarray
+    employee_lines: np.ndarray
+    employee_orders: np.ndarray
+
+
+def _empty_series() -> SalesSeries:
+    def sums() -> np.ndarray:
+        return np.zeros(0, dtype=np.float64)
+
+    def counts() -> np.ndarray:
+        return np.zeros(0, dtype=np.int64)
+
+    return SalesSeries(sums(), counts(), counts(), sums(), counts(), sums(), counts(), counts())
+
+
+@dataclass(frozen=True)
+class FactStore:
+    """Lines and orders sorted by OrderID; codes index ``dimensions``, -1 if unknown."""
+
+    version: int
+    generation: int
+    # One entry per order line.
+    order: np.ndarray  # int64 OrderID
+    day: np.ndarray  # datetime64[D], NaT without an OrderDate
+    customer: np.ndarray  # int32
+    product: np.ndarray  # int64 ProductID
+    employee: np.ndarray  # int32
+    category: np.ndarray  # int32
+    quantity: np.ndarray  # int64
+    revenue: np.ndarray  # float64
+    # One entry per order.
+    order_id: np.ndarray  # int64
+    dimensions: Dimensions
+    series: SalesSeries
+
+    @property
+    def watermark(self) -> int | None:
+        """Highest OrderID folded in."""
+        return int(self.order_id[-1]) if len(self.order_id) else None
+
+    @property
+    def nbytes(self) -> int:
+        return sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+
+
+def _codes(values, index: dict) -> np.ndarray:
+    return np.fromiter((index.get(value, -1) for value in values), dtype=np.int32, count=len(values))
+
+
+def _days(values: tuple) -> np.ndarray:
+    # julianday() is NULL without a date: NaN here, NaT in the result.
+    days = np.array(values, dtype=np.float64)
+    result = np.full(len(days), np.datetime64("NaT"), dtype="datetime64[D]")
+    known = ~np.isnan(days)
+    result[known] = np.round(days[known]).astype(np.int64).astype("datetime64[D]")
+    return result
+
+
+def _ints(values: tuple) -> np.ndarray:
+    return np.array(values, dtype=np.int64)
+
+
+def _columns(cursor: sqlite3.Cursor, convert: tuple) -> list[np.ndarray]:
+    """Read ``cursor`` in chunks, turning column ``i`` into an array with ``convert[i]``."""
+    chunks: list[list[np.ndarray]] = [[] for _ in convert]
+    while rows := cursor.fetchmany(CHUNK_ROWS):
+        for parts, to_array, values in zip(chunks, convert, zip(*rows)):
+            parts.append(to_array(values))
+    return [
+        np.concatenate(parts) if parts else to_array(())
+        for parts, to_array in zip(chunks, convert)
+    ]
+
+
+def load_dimensions(conn: sqlite3.Connection) -> Dimensions:
+    customers = conn.execute("SELECT CustomerID, CompanyName FROM Customers ORDER BY rowid").fetchall()
+    employees = conn.execute(
+        "SELECT EmployeeID, FirstName || ' ' || LastName FROM Employees ORDER BY EmployeeID"
+    ).fetchall()
+    categories = conn.execute("SELECT CategoryID, CategoryName FROM Categories ORDER BY CategoryID").fetchall()
+    return Dimensions(
+        customer_ids=[row[0] for row in customers],
+        customer_names=[row[1] for row in customers],
+        employee_ids=[row[0] for row in employees],
+        employee_names=[row[1] for row in employees],
+        category_ids=[row[0] for row in categories],
+        category_names=[row[1] for row in categories],
+        product_category=dict(conn.execute("SELECT ProductID, CategoryID FROM Products")),
+    )
+
+
+def _read_lines(conn: sqlite3.Connection, dimensions: Dimensions, where: str = "", params: tuple = ()) -> dict:
+    customer_index = {key: code for code, key in enumerate(dimensions.customer_ids)}
+    employee_index = {key: code for code, key in enumerate(dimensions.employee_ids)}
+    category_index = {key: code for code, key in enumerate(dimensions.category_ids)}
+    order, day, customer, product, employee, quantity, revenue = _columns(
+        conn.execute(LINES_SQL.format(where=where), params),
+        (
+            _ints,
+            _days,
+            lambda values: _codes(values, customer_index),
+            _ints,
+            lambda values: _codes(values, employee_index),
+            _ints,
+            lambda values: np.nan_to_num(np.array(values, dtype=np.float64)),
+        ),
+    )
+    product_category = {
+        product_id: category_index.get(category_id, -1)
+        for product_id, category_id in dimensions.product_category.items()
+    }
+    return {
+        "order": order,
+        "day": day,
+        "customer": customer,
+        "product": product,
+        "employee": employee,
+        "category": _codes(product.tolist(), product_category),
+        "quantity": quantity,
+        "revenue": revenue,
+    }
+
+
+def _read_orders(conn: sqlite3.Connection, where: str = "", params: tuple = ()) -> dict:
+    (order_id,) = _columns(conn.execute(ORDERS_SQL.format(where=where), params), (_ints,))
+    return {"order_id": order_id}
+
+
+def _months(days: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Months since ``MONTH_ORIGIN`` of the entries dated on or after it, and their mask."""
+    months = np.full(len(days), -1, dtype=np.int64)
+    dated = ~np.isnat(days)
+    months[dated] = (days[dated].astype("datetime64[M]") - MONTH_ORIGIN).astype(np.int64)
+    in_range = months >= 0
+    return months[in_range], in_range
+
+
+def _add(total: np.ndarray, keys: np.ndarray, weights: np.ndarray | None, sign: int) -> np.ndarray:
+    counts = np.bincount(keys, weights, minlength=len(total))
+    if len(counts) > len(total):
+        total = np.pad(total, (0, len(counts) - len(total)))
+    return total + sign * counts
+
+
+def _fold(series: SalesSeries, lines: dict, sign: int) -> SalesSeries:
+    """``series`` with the given lines added (sign 1) or taken out (sign -1).
+
+    ``lines`` must hold every line of the orders it touches: an order is
+    counted on its first line.
+    """
+    months, dated = _months(lines["day"])
+    order = lines["order"]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = order[1:] != order[:-1]
+    category = lines["category"] >= 0
+    employee = lines["employee"] >= 0
+    revenue = lines["revenue"]
+    return SalesSeries(
+        month_revenue=_add(series.month_revenue, months, revenue[dated], sign),
+        month_lines=_add(series.month_lines, months, None, sign),
+        month_orders=_add(series.month_orders, months[first[dated]], None, sign),
+        category_revenue=_add(series.category_revenue, lines["category"][category], revenue[category], sign),
+        category_lines=_add(series.category_lines, lines["category"][category], None, sign),
+        employee_revenue=_add(series.employee_revenue, lines["employee"][employee], revenue[employee], sign),
+        employee_lines=_add(series.employee_lines, lines["employee"][employee], None, sign),
+        employee_orders=_add(series.employee_orders, lines["employee"][employee & first], None, sign),
+    )
+
+
+def load_fact_store(
+    conn: sqlite3.Connection, dimensions: Dimensions, generation: int, version: int
+) -> FactStore:
+    lines = _read_lines(conn, dimensions)
+    orders = _read_orders(conn)
+    return FactStore(
+        version=version,
+        generation=generation,
+        dimensions=dimensions,
+        series=_fold(_empty_series(), lines, 1),
+        **lines,
+        **orders,
+    )
+
+
+def extend_fact_store(
+    conn: sqlite3.Connection, store: FactStore, dimensions: Dimensions, version: int
+) -> FactStore:
+    """``store`` plus the orders from its watermark on; the watermark order is re-read."""
+    watermark = store.watermark
+    line_start = int(np.searchsorted(store.order, watermark, "left"))
+    order_start = int(np.searchsorted(store.order_id, watermark, "left"))
+    stale_lines = {name: getattr(store, name)[line_start:] for name in LINE_COLUMNS}
+    lines = _read_lines(conn, dimensions, "WHERE od.OrderID >= ?", (watermark,))
+    orders = _read_orders(conn, "WHERE o.OrderID >= ?", (watermark,))
+    series = _fold(_fold(store.series, stale_lines, -1), lines, 1)
+    return replace(
+        store,
+        version=version,
+        dimensions=dimensions,
+        series=series,
+        **{name: np.concatenate((getattr(store, name)[:line_start], lines[name])) for name in LINE_COLUMNS},
+        **{name: np.concatenate((getattr(store, name)[:order_start], orders[name])) for name in ORDER_COLUMNS},
+    )
+
+
+def refresh_fact_store(
+    conn: sqlite3.Connection, store: FactStore | None, version: int
+) -> FactStore:
+    # One read transaction, so lines, orders and dimensions are one snapshot
+    # (or the caller's, when it already holds one).
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN")
+    try:
+        generation = conn.execute("SELECT Generation FROM SalesRewrites").fetchone()[0]
+        dimensions = load_dimensions(conn)
+        if (
+            store is not None
+            and store.watermark is not None
+            and store.generation == generation
+            and dimensions.extends(store.dimensions)
+        ):
+            return extend_fact_store(conn, store, dimensions, version)
+        return load_fact_store(conn, dimensions, generation, version)
+    finally:
+        if own_transaction:
+            conn.rollback()
+
+
+_store: FactStore | None = None
+_lock = threading.Lock()
+
+
+def current_fact_store(conn: sqlite3.Connection) -> FactStore:
+    global _store
+    version = get_cache().data_version()
+    # One refresh at a time; concurrent callers wait for it and share the result.
+    with _lock:
+        if _store is None or _store.version != version:
+            _store = refresh_fact_store(conn, _store, version)
+        return _store
+
+
+def clear_fact_store() -> None:
+    """Drop the snapshot; the next caller loads it from scratch."""
+    global _store
+    with _lock:
+        _store = None
+
+
+async def get_fact_store() -> FactStore:
+    """The snapshot for the current data version, loading or extending it if needed."""
+    return await run(current_fact_store, label="analytics.fact_store")
@@ -0,0 +1,166 @@
+"""Pre-aggregated ``DailySales`` fact table.
+
+One row per date x product x customer x employee x ship country with the
+revenue, quantity and order count of the matching order lines. Triggers on
+``Orders`` and ``OrderDetails`` keep it current; ``rebuild`` recomputes it
+from scratch::
+
+    python -m app.db.facts rebuild
+
+``LineCount`` is the number of order lines behind a fact row. An order holds
+each product once, so within one row it is also the number of orders, but it
+must not be summed across products to count orders; use ``Orders`` for that.
+
+``SalesRewrites`` holds a single generation counter, bumped by every change to
+``Orders`` or ``OrderDetails`` that is not an append (an order above every
+existing OrderID, or a line of the newest order). Incremental readers such as
+``app.db.columnar`` only fold in rows past their OrderID watermark, and start
+over when the generation moves.
+"""
+import argparse
+import sqlite3
+
+from app.db.settings import DB_PATH
+
+FACT_KEY = "SaleDate, ProductID, CustomerID, EmployeeID, ShipCountry"
+
+
+def _apply_line(sign: str, line: str, order: str, source: str) -> str:
+    """Upsert a +/- line delta. ``line`` and ``order`` are the row aliases to read from."""
+    return f"""
+        INSERT INTO DailySales ({FACT_KEY}, Revenue, Quantity, LineCount)
+        SELECT COALESCE(date({order}.OrderDate), ''), {line}.ProductID,
+               COALESCE({order}.CustomerID, ''), COALESCE({order}.EmployeeID, 0),
+               COALESCE({order}.ShipCountry, ''),
+               {sign}({line}.UnitPrice * {line}.Quantity * (1 - {line}.Discount)),
+               {sign}{line}.Quantity, {sign}1
+        {source}
+        ON CONFLICT ({FACT_KEY}) DO UPDATE SET
+            Revenue = Revenue + excluded.Revenue,
+            Quantity = Quantity + excluded.Quantity,
+            LineCount = LineCount + excluded.LineCount;"""
+
+
+def _prune(order_date: str) -> str:
+    return f"""
+        DELETE FROM DailySales
+        WHERE SaleDate = COALESCE(date({order_date}), '') AND LineCount <= 0;"""
+
+
+def create_daily_sales(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS DailySales (
+            SaleDate TEXT NOT NULL,
+            ProductID INTEGER NOT NULL,
+            CustomerID TEXT NOT NULL,
+            EmployeeID INTEGER NOT NULL,
+            ShipCountry TEXT NOT NULL,
+            Revenue REAL NOT NULL DEFAULT 0,
+            Quantity INTEGER NOT NULL DEFAULT 0,
+            LineCount INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (SaleDate, ProductID, CustomerID, EmployeeID, ShipCountry)
+        ) WITHOUT ROWID
+        """
+    )
+    line_order = "FROM Orders o WHERE o.OrderID = {line}.OrderID"
+    order_lines = "FROM OrderDetails od WHERE od.OrderID = {order}.OrderID"
+    triggers = {
+        "trg_dailysales_line_insert": (
+            "AFTER INSERT ON OrderDetails",
+            _apply_line("+", "NEW", "o", line_order.format(line="NEW")),
+        ),
+        "trg_dailysales_line_delete": (
+            "AFTER DELETE ON OrderDetails",
+            _apply_line("-", "OLD", "o", line_order.format(line="OLD"))
+            + _prune("(SELECT OrderDate FROM Orders WHERE OrderID = OLD.OrderID)"),
+        ),
+        "trg_dailysales_line_update": (
+            "AFTER UPDATE OF OrderID, ProductID, UnitPrice, Quantity, Discount ON OrderDetails",
+            _apply_line("-", "OLD", "o", line_order.format(line="OLD"))
+            + _apply_line("+", "NEW", "o", line_order.format(line="NEW"))
+            + _prune("(SELECT OrderDate FROM Orders WHERE OrderID = OLD.OrderID)"),
+        ),
+        # Lines inserted before their order found no order to join to; fold them in now.
+        "trg_dailysales_order_insert": (
+            "AFTER INSERT ON Orders",
+            _apply_line("+", "od", "NEW", order_lines.format(order="NEW")),
+        ),
+        "trg_dailysales_order_update": (
+            "AFTER UPDATE OF OrderDate, CustomerID, EmployeeID, ShipCountry ON Orders",
+            _apply_line("-", "od", "OLD", order_lines.format(order="OLD"))
+            + _apply_line("+", "od", "NEW", order_lines.format(order="NEW"))
+            + _prune("OLD.OrderDate"),
+        ),
+        "trg_dailysales_order_delete": (
+            "AFTER DELETE ON Orders",
+            _apply_line("-", "od", "OLD", order_lines.format(order="OLD")) + _prune("OLD.OrderDate"),
+        ),
+    }
+    for name, (event, body) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+
+
+def rebuild_daily_sales(conn: sqlite3.Connection) -> int:
+    """Recompute every fact row from Orders and OrderDetails; returns the row count."""
+    conn.execute("DELETE FROM DailySales")
+    conn.execute(
+        f"""
+        INSERT INTO DailySales ({FACT_KEY}, Revenue, Quantity, LineCount)
+        SELECT COALESCE(date(o.OrderDate), ''), od.ProductID, COALESCE(o.CustomerID, ''),
+               COALESCE(o.EmployeeID, 0), COALESCE(o.ShipCountry, ''),
+               SUM(od.LineTotal), SUM(od.Quantity), COUNT(*)
+        FROM OrderDetails od
+        JOIN Orders o ON o.OrderID = od.OrderID
+        GROUP BY 1, 2, 3, 4, 5
+        """
+    )
+    return conn.execute("SELECT COUNT(*) FROM DailySales").fetchone()[0]
+
+
+def create_sales_rewrites(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS SalesRewrites (
+            Id INTEGER PRIMARY KEY CHECK (Id = 1),
+            Generation INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute("INSERT OR IGNORE INTO SalesRewrites (Id) VALUES (1)")
+    bump = "UPDATE SalesRewrites SET Generation = Generation + 1 WHERE Id = 1;"
+    # Below the newest order, i.e. not an append.
+    behind = "WHEN NEW.OrderID < (SELECT MAX(OrderID) FROM Orders)"
+    triggers = {
+        "trg_salesrewrites_order_insert": f"AFTER INSERT ON Orders {behind}",
+        "trg_salesrewrites_order_update": "AFTER UPDATE OF OrderID, OrderDate, CustomerID, EmployeeID ON Orders",
+        "trg_salesrewrites_order_delete": "AFTER DELETE ON Orders",
+        "trg_salesrewrites_line_insert": f"AFTER INSERT ON OrderDetails {behind}",
+        # Not LineTotal: its own trigger sets it on every insert.
+        "trg_salesrewrites_line_update": (
+            "AFTER UPDATE OF OrderID, ProductID, UnitPrice, Quantity, Discount ON OrderDetails"
+        ),
+        "trg_salesrewrites_line_delete": "AFTER DELETE ON OrderDetails",
+    }
+    for name, event in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {bump} END")
+
+
+def main() -> None:
+    from app.db.migrations import migrate
+    from app.db.storage import open_writer
+
+    parser = argparse.ArgumentParser(description="Maintain the DailySales fact table.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database file")
+    args = parser.parse_args()
+    migrate(args.db)
+    conn = open_writer(args.db)
+    with conn:
+        rows = rebuild_daily_sales(conn)
+    conn.close()
+    print(f"{args.db}: DailySales rebuilt ({rows} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""Synthetic Northwind data at a configurable scale factor.
+
+Scale factor 1 is roughly the size of the classic Northwind sample (830
+orders, ~2,200 order lines); every unit of scale adds another 830 orders, so
+``--scale 10000`` produces ~8.3M orders and ~25M lines. Output is fully
+determined by ``--seed``::
+
+    python -m app.db.generate --scale 100 --db northwind_sf100.db
+    python -m app.db.generate --scale 1 --seed 7 --force
+
+Rows are generated with NumPy in chunks and bulk-loaded with ``executemany``
+into bare tables; indexes, triggers and fact tables are built afterwards by
+``migrate()``, which is much faster than maintaining them row by row.
+"""
+import argparse
+import math
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.db.migrations import migrate
+from app.db.settings import DB_PATH
+from app.db.storage import open_writer
+
+ORDERS_PER_SCALE = 830
+FIRST_ORDER_ID = 10248
+START_DATE = "2022-01-01"
+END_DATE = "2024-12-31"
+CHUNK_ORDERS = 200_000
+
+SCHEMA = [
+    "CREATE TABLE Categories (CategoryID INTEGER PRIMARY KEY, CategoryName TEXT, Description TEXT)",
+    "CREATE TABLE Customers (CustomerID TEXT PRIMARY KEY, CompanyName TEXT, ContactName TEXT, City TEXT, Country TEXT)",
+    "CREATE TABLE Employees (EmployeeID INTEGER PRIMARY KEY, LastName TEXT, FirstName TEXT, Title TEXT, BirthDate TEXT, City TEXT, Country TEXT)",
+    "CREATE TABLE Shippers (ShipperID INTEGER PRIMARY KEY, CompanyName TEXT, Phone TEXT)",
+    "CREATE TABLE Suppliers (SupplierID INTEGER PRIMARY KEY, CompanyName TEXT, ContactName TEXT, City TEXT, Country TEXT)",
+    "CREATE TABLE Products (ProductID INTEGER PRIMARY KEY, ProductName TEXT, SupplierID INTEGER, CategoryID INTEGER, UnitPrice REAL, UnitsInStock INTEGER, FOREIGN KEY(SupplierID) REFERENCES Suppliers(SupplierID), FOREIGN KEY(CategoryID) REFERENCES Categories(CategoryID))",
+    "CREATE TABLE Orders (OrderID INTEGER PRIMARY KEY, CustomerID TEXT, EmployeeID INTEGER, OrderDate TEXT, RequiredDate TEXT, ShippedDate TEXT, ShipVia INTEGER, Freight REAL, ShipCity TEXT, ShipCountry TEXT, FOREIGN KEY(CustomerID) REFERENCES Customers(CustomerID), FOREIGN KEY(EmployeeID) REFERENCES Employees(EmployeeID), FOREIGN KEY(ShipVia) REFERENCES Shippers(ShipperID))",
+    "CREATE TABLE OrderDetails (OrderID INTEGER, ProductID INTEGER, UnitPrice REAL, Quantity INTEGER, Discount REAL, PRIMARY KEY (OrderID, ProductID), FOREIGN KEY(OrderID) REFERENCES Orders(OrderID), FOREIGN KEY(ProductID) REFERENCES Products(ProductID))",
+]
+
+CATEGORIES = [
+    (1, "Beverages", "Soft drinks, coffees, teas"),
+    (2, "Condiments", "Sweet and savory sauces"),
+    (3, "Confections", "Desserts, candies, and sweet breads"),
+    (4, "Dairy Products", "Cheeses"),
+    (5, "Grains/Cereals", "Breads, crackers, pasta"),
+    (6, "Meat/Poultry", "Prepared meats"),
+    (7, "Produce", "Dried fruit and bean curd"),
+    (8, "Seafood", "Seaweed and fish"),
+]
+
+SHIPPERS = [
+    (1, "Speedy Express", "(503) 555-9831"),
+    (2, "United Package", "(503) 555-3199"),
+    (3, "Federal Shipping", "(503) 555-9931"),
+]
+
+# Las filas originales del dataset de ejemplo; el generador las conserva y
+# completa hasta el tamaño pedido con filas sintéticas.
+BASE_CUSTOMERS = [
+    ("ALFKI", "Alfreds Futterkiste", "Maria Anders", "Berlin", "Germany"),
+    ("ANATR", "Ana Trujillo Emparedados", "Ana Trujillo", "México D.F.", "Mexico"),
+    ("ANTON", "Antonio Moreno Taquería", "Antonio Moreno", "México D.F.", "Mexico"),
+    ("BERGS", "Berglunds snabbköp", "Christina Berglund", "Luleå", "Sweden"),
+    ("BLAUS", "Blauer See Delikatessen", "Hanna Moos", "Mannheim", "Germany"),
+    ("BONAP", "Bon app", "Laurence Lebihan", "Marseille", "France"),
+    ("BOTTM", "Bottom-Dollar Markets", "Elizabeth Lincoln", "Tsawassen", "Canada"),
+    ("BSBEV", "Bs Beverages", "Victoria Ashworth", "London", "UK"),
+    ("CACTU", "Cactus Comidas para llevar", "Patricio Simpson", "Buenos Aires", "Argentina"),
+    ("CENTC", "Centro comercial Moctezuma", "Francisco Chang", "México D.F.", "Mexico"),
+]
+
+BASE_EMPLOYEES = [
+    (1, "Davolio", "Nancy", "Sales Rep", "1948-12-08", "Seattle", "USA"),
+    (2, "Fuller", "Andrew", "VP Sales", "1952-02-19", "Tacoma", "USA"),
+    (3, "Leverling", "Janet", "Sales Rep", "1963-08-30", "Kirkland", "USA"),
+    (4, "Peacock", "Margaret", "Sales Rep", "1937-09-19", "Redmond", "USA"),
+    (5, "Buchanan", "Steven", "Sales Manager", "1955-03-04", "London", "UK"),
+]
+
+BASE_SUPPLIERS = [
+    (1, "Exotic Liquids", "Charlotte Cooper", "London", "UK"),
+    (2, "New Orleans Cajun Delights", "Shelley Burke", "New Orleans", "USA"),
+    (3, "Grandma Kellys Homestead", "Regina Murphy", "Ann Arbor", "USA"),
+    (4, "Tokyo Traders", "Yoshi Nagase", "Tokyo", "Japan"),
+    (5, "Cooperativa de Quesos", "Antonio del Valle", "Oviedo", "Spain"),
+]
+
+BASE_PRODUCTS = [
+    (1, "Chai", 1, 1, 18, 39),
+    (2, "Chang", 1, 1, 19, 17),
+    (3, "Aniseed Syrup", 1, 2, 10, 13),
+    (4, "Chef Antons Cajun Seasoning", 2, 2, 22, 53),
+    (5, "Chef Antons Gumbo Mix", 2, 2, 21.35, 0),
+    (6, "Grandmas Boysenberry Spread", 3, 2, 25, 120),
+    (7, "Uncle Bobs Organic Dried Pears", 3, 7, 30, 15),
+    (8, "Northwoods Cranberry Sauce", 3, 2, 40, 6),
+    (9, "Mishi Kobe Niku", 4, 6, 97, 29),
+    (10, "Ikura", 4, 8, 31, 31),
+    (11, "Queso Cabrales", 5, 4, 21, 22),
+    (12, "Queso Manchego La Pastora", 5, 4, 38, 86),
+]
+
+# Customer country mix of the original Northwind data, with a few cities each.
+COUNTRIES = {
+    "USA": (13, ["Seattle", "Portland", "Boise", "Albuquerque", "Anchorage", "San Francisco"]),
+    "Germany": (11, ["Berlin", "Mannheim", "München", "Frankfurt a.M.", "Köln", "Leipzig"]),
+    "France": (11, ["Paris", "Marseille", "Lyon", "Nantes", "Lille", "Strasbourg"]),
+    "Brazil": (9, ["Sao Paulo", "Rio de Janeiro", "Campinas", "Resende"]),
+    "UK": (7, ["London", "Cowes", "Manchester"]),
+    "Spain": (5, ["Madrid", "Barcelona", "Sevilla"]),
+    "Mexico": (5, ["México D.F.", "Guadalajara", "Monterrey"]),
+    "Venezuela": (4, ["Caracas", "San Cristóbal", "Barquisimeto"]),
+    "Argentina": (3, ["Buenos Aires", "Córdoba"]),
+    "Italy": (3, ["Torino", "Bergamo", "Reggio Emilia"]),
+    "Canada": (3, ["Montréal", "Tsawassen", "Vancouver"]),
+    "Sweden": (2, ["Luleå", "Bräcke"]),
+    "Finland": (2, ["Helsinki", "Oulu"]),
+    "Belgium": (2, ["Bruxelles", "Charleroi"]),
+    "Denmark": (2, ["København", "Århus"]),
+    "Austria": (2, ["Graz", "Salzburg"]),
+    "Portugal": (2, ["Lisboa", "Porto"]),
+    "Switzerland": (2, ["Bern", "Genève"]),
+    "Ireland": (1, ["Cork", "Dublin"]),
+    "Norway": (1, ["Stavern", "Oslo"]),
+    "Poland": (1, ["Warszawa", "Kraków"]),
+}
+
+FIRST_NAMES = ["Maria", "Ana", "Antonio", "Thomas", "Christina", "Hanna", "Frédérique", "Martín", "Laurence", "Elizabeth", "Victoria", "Patricio", "Francisco", "Yang", "Pedro", "Sven", "Janine", "Carlos", "Paolo", "Helen", "Pirkko", "Karl", "Rita", "Jonas", "Lúcia", "Howard", "Yvonne", "Liz"]
+LAST_NAMES = ["Anders", "Trujillo", "Moreno", "Hardy", "Berglund", "Moos", "Citeaux", "Sommer", "Lebihan", "Lincoln", "Ashworth", "Simpson", "Chang", "Wang", "Afonso", "Ottlieb", "Labrune", "Hernández", "Accorti", "Bennett", "Koskitalo", "Jablonski", "Müller", "Pereira", "Carvalho", "Snyder", "Moncada", "Nixon"]
+COMPANY_WORDS = ["Alpine", "Blue", "Golden", "Harbor", "Royal", "Nordic", "Sierra", "Pacific", "Old", "Green", "Central", "Island", "Lonely", "Great", "Little", "Eastern"]
+COMPANY_KINDS = ["Markets", "Delikatessen", "Comidas", "Trading", "Provisions", "Grocers", "Imports", "Bistro", "Foods", "Supermercado", "Epicerie", "Handel"]
+PRODUCT_WORDS = ["Organic", "Smoked", "Spicy", "Sweet", "Dried", "Aged", "Wild", "Classic", "Imported", "Farmhouse", "Roasted", "Premium"]
+PRODUCT_KINDS = {
+    1: ["Tea", "Coffee", "Lager", "Cider", "Lemonade"],
+    2: ["Mustard", "Syrup", "Chutney", "Relish", "Pesto"],
+    3: ["Chocolate", "Biscuits", "Marzipan", "Toffee", "Tart"],
+    4: ["Cheddar", "Gouda", "Mozzarella", "Brie", "Yogurt"],
+    5: ["Gnocchi", "Crackers", "Rye Bread", "Couscous", "Ravioli"],
+    6: ["Sausage", "Pâté", "Ham", "Salami", "Chicken"],
+    7: ["Tofu", "Apples", "Figs", "Mushrooms", "Raisins"],
+    8: ["Salmon", "Crab Meat", "Herring", "Shrimp", "Caviar"],
+}
+EMPLOYEE_TITLES = ["Sales Rep", "Sales Rep", "Sales Rep", "Inside Sales Coordinator", "Sales Manager"]
+DISCOUNTS = np.array([0.0, 0.05, 0.1, 0.15, 0.2, 0.25])
+DISCOUNT_WEIGHTS = np.array([0.62, 0.1, 0.1, 0.08, 0.06, 0.04])
+
+
+@dataclass(frozen=True)
+class Sizes:
+    orders: int
+    customers: int
+    employees: int
+    suppliers: int
+    products: int
+
+    @classmethod
+    def for_scale(cls, scale: int) -> "Sizes":
+        # Customers and orders grow linearly; the catalogue and the sales team
+        # grow with sqrt(scale), like a real business adding markets.
+        root = math.ceil(math.sqrt(scale))
+        return cls(
+            orders=ORDERS_PER_SCALE * scale,
+            customers=91 * scale,
+            employees=9 * root,
+            suppliers=29 * root,
+            products=77 * root,
+        )
+
+
+def _pick(rng: np.random.Generator, words: list[str], size: int) -> np.ndarray:
+    return np.asarray(words, dtype=object)[rng.integers(0, len(words), size)]
+
+
+def _weights(values: np.ndarray) -> np.ndarray:
+    return values / values.sum()
+
+
+def _rows(*columns) -> list[tuple]:
+    return list(zip(*[c.tolist() if isinstance(c, np.ndarray) else c for c in columns]))
+
+
+def _dimensions(rng: np.random.Generator, sizes: Sizes) -> dict:
+    country_names = list(COUNTRIES)
+    country_p = _weights(np.array([COUNTRIES[c][0] for c in country_names], dtype=float))
+
+    n = sizes.customers - len(BASE_CUSTOMERS)
+    countries = np.asarray(country_names, dtype=object)[rng.choice(len(country_names), n, p=country_p)]
+    cities = np.array([COUNTRIES[c][1][i % len(COUNTRIES[c][1])] for c, i in zip(countries, rng.integers(0, 64, n))], dtype=object)
+    companies = _pick(rng, COMPANY_WORDS, n) + " " + _pick(rng, LAST_NAMES, n) + " " + _pick(rng, COMPANY_KINDS, n)
+    contacts = _pick(rng, FIRST_NAMES, n) + " " + _pick(rng, LAST_NAMES, n)
+    customers = BASE_CUSTOMERS + _rows(
+        [f"C{i:07d}" for i in range(1, n + 1)], companies, contacts, cities, countries
+    )
+
+    first_employee = len(BASE_EMPLOYEES) + 1
+    n = sizes.employees - len(BASE_EMPLOYEES)
+    birth = np.datetime64("1950-01-01") + rng.integers(0, 365 * 40, n)
+    employee_countries = np.where(rng.random(n) < 0.7, "USA", "UK").astype(object)
+    employee_cities = np.where(employee_countries == "USA", _pick(rng, ["Seattle", "Tacoma", "Kirkland", "Redmond"], n), "London")
+    employees = BASE_EMPLOYEES + _rows(
+        np.arange(first_employee, first_employee + n),
+        _pick(rng, LAST_NAMES, n),
+        _pick(rng, FIRST_NAMES, n),
+        _pick(rng, EMPLOYEE_TITLES, n),
+        np.datetime_as_string(birth, unit="D"),
+        employee_cities,
+        employee_countries,
+    )
+
+    first_supplier = len(BASE_SUPPLIERS) + 1
+    n = sizes.suppliers - len(BASE_SUPPLIERS)
+    supplier_countries = np.asarray(country_names, dtype=object)[rng.choice(len(country_names), n, p=country_p)]
+    suppliers = BASE_SUPPLIERS + _rows(
+        np.arange(first_supplier, first_supplier + n),
+        _pick(rng, COMPANY_WORDS, n) + " " + _pick(rng, LAST_NAMES, n) + " " + _pick(rng, COMPANY_KINDS, n),
+        _pick(rng, FIRST_NAMES, n) + " " + _pick(rng, LAST_NAMES, n),
+        np.array([COUNTRIES[c][1][0] for c in supplier_countries], dtype=object),
+        supplier_countries,
+    )
+
+    first_product = len(BASE_PRODUCTS) + 1
+    n = sizes.products - len(BASE_PRODUCTS)
+    category = rng.integers(1, len(CATEGORIES) + 1, n)
+    kinds = np.array([PRODUCT_KINDS[c][i % 5] for c, i in zip(category.tolist(), rng.integers(0, 5, n).tolist())], dtype=object)
+    names = _pick(rng, PRODUCT_WORDS, n) + " " + kinds + " " + np.arange(first_product, first_product + n).astype(str).astype(object)
+    prices = np.round(rng.lognormal(3.0, 0.7, n), 2)
+    # ~5% sin stock y ~10% por debajo del umbral de "Low Stock".
+    stock = rng.integers(10, 130, n)
+    stock_roll = rng.random(n)
+    stock = np.where(stock_roll < 0.05, 0, np.where(stock_roll < 0.15, rng.integers(1, 10, n), stock))
+    products = BASE_PRODUCTS + _rows(
+        np.arange(first_product, first_product + n),
+        names,
+        rng.integers(1, sizes.suppliers + 1, n),
+        category,
+        prices,
+        stock,
+    )
+
+    return {
+        "customers": customers,
+        "employees": employees,
+        "suppliers": suppliers,
+        "products": products,
+    }
+
+
+def _order_days(rng: np.random.Generator, n_orders: int) -> np.ndarray:
+    """Day offsets from START_DATE, sorted so OrderID follows OrderDate."""
+    start, end = np.datetime64(START_DATE), np.datetime64(END_DATE)
+    days = np.arange((end - start).astype(int) + 1)
+    dates = start + days
+    day_of_year = (dates - dates.astype("datetime64[Y]")).astype(int)
+    weekday = (dates.astype(int) + 3) % 7  # 0 = lunes
+    # ~30% yearly growth, a Q4 peak and quiet weekends.
+    trend = 1.0 + 0.3 * days / 365.0
+    season = 1.0 + 0.35 * np.cos(2 * np.pi * (day_of_year - 335) / 365.0)
+    week = np.where(weekday >= 5, 0.35, 1.0)
+    counts = rng.multinomial(n_orders, _weights(trend * season * week))
+    return np.repeat(days, counts)
+
+
+def _insert(conn: sqlite3.Connection, table: str, rows: list[tuple]) -> None:
+    if rows:
+        marks = ", ".join("?" * len(rows[0]))
+        conn.executemany(f"INSERT INTO {table} VALUES ({marks})", rows)
+
+
+def generate(
+    db_path: str = DB_PATH,
+    scale: int = 1,
+    seed: int = 42,
+    chunk_orders: int = CHUNK_ORDERS,
+    verbose: bool = False,
+) -> dict[str, int]:
+    """Write a fresh database at ``db_path`` and return the row counts per table."""
+    if not 1 <= scale <= 10_000:
+        raise ValueError("scale must be between 1 and 10000")
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+    rng = np.random.default_rng(seed)
+    sizes = Sizes.for_scale(scale)
+    started = time.perf_counter()
+
+    def log(message: str) -> None:
+        if verbose:
+            print(f"[{time.perf_counter() - started:7.1f}s] {message}")
+
+    conn = open_writer(db_path, isolation_level=None)
+    # Carga inicial sobre un fichero nuevo: si se interrumpe se vuelve a generar.
+    conn.execute("PRAGMA synchronous = OFF")
+    counts = {}
+    try:
+        conn.execute("BEGIN")
+        for ddl in SCHEMA:
+            conn.execute(ddl)
+        dims = _dimensions(rng, sizes)
+        _insert(conn, "Categories", CATEGORIES)
+        _insert(conn, "Shippers", SHIPPERS)
+        for table in ("customers", "employees", "suppliers", "products"):
+            _insert(conn, table.capitalize(), dims[table])
+            counts[table.capitalize()] = len(dims[table])
+        conn.execute("COMMIT")
+        log(f"dimensions loaded ({counts})")
+
+        customer_ids = np.array([c[0] for c in dims["customers"]], dtype=object)
+        customer_city = np.array([c[3] for c in dims["customers"]], dtype=object)
+        customer_country = np.array([c[4] for c in dims["customers"]], dtype=object)
+        # Heavy-tailed popularity: a few key accounts and best sellers carry most of the volume.
+        customer_p = _weights(rng.lognormal(0.0, 1.2, sizes.customers))
+        employee_p = _weights(rng.lognormal(0.0, 0.4, sizes.employees))
+        product_p = _weights(rng.lognormal(0.0, 1.0, sizes.products))
+        product_price = np.array([p[4] for p in dims["products"]], dtype=float)
+
+        start = np.datetime64(START_DATE)
+        end = np.datetime64(END_DATE)
+        order_days = _order_days(rng, sizes.orders)
+        n_lines = 0
+        for offset in range(0, sizes.orders, chunk_orders):
+            days = order_days[offset:offset + chunk_orders]
+            n = len(days)
+            order_ids = np.arange(FIRST_ORDER_ID + offset, FIRST_ORDER_ID + offset + n)
+            order_date = start + days
+            customer = rng.choice(sizes.customers, n, p=customer_p)
+            required = order_date + rng.choice([14, 28, 42], n, p=[0.1, 0.8, 0.1])
+            shipped = order_date + 1 + rng.gamma(2.0, 2.5, n).astype(int)
+            # Unshipped: anything whose ship date would fall past the snapshot, plus a few stragglers.
+            pending = (shipped > end) | (rng.random(n) < 0.02)
+            shipped_text = np.datetime_as_string(shipped, unit="D").astype(object)
+            shipped_text[pending] = None
+            orders = _rows(
+                order_ids,
+                customer_ids[customer],
+                rng.choice(sizes.employees, n, p=employee_p) + 1,
+                np.datetime_as_string(order_date, unit="D"),
+                np.datetime_as_string(required, unit="D"),
+                shipped_text,
+                rng.choice(len(SHIPPERS), n, p=[0.3, 0.4, 0.3]) + 1,
+                np.round(rng.gamma(1.5, 50.0, n), 2),
+                customer_city[customer],
+                customer_country[customer],
+            )
+
+            # Basket sizes ~ 1 + Poisson(2); repeated products in an order are dropped.
+            basket = 1 + np.minimum(rng.poisson(2.0, n), 24)
+            line_order = np.repeat(np.arange(n), basket)
+            line_product = rng.choice(sizes.products, len(line_order), p=product_p)
+            keys = np.unique(line_order.astype(np.int64) * sizes.products + line_product)
+            line_order, line_product = keys // sizes.products, keys % sizes.products
+            m = len(keys)
+            quantity = np.clip(rng.lognormal(2.7, 0.8, m), 1, 130).astype(int)
+            discount = DISCOUNTS[rng.choice(len(DISCOUNTS), m, p=DISCOUNT_WEIGHTS)]
+            details = _rows(
+                order_ids[line_order],
+                line_product + 1,
+                product_price[line_product],
+                quantity,
+                discount,
+            )
+
+            conn.execute("BEGIN")
+            _insert(conn, "Orders", orders)
+            conn.executemany(
+                "INSERT INTO OrderDetails (OrderID, ProductID, UnitPrice, Quantity, Discount) VALUES (?, ?, ?, ?, ?)",
+                details,
+            )
+            conn.execute("COMMIT")
+            n_lines += m
+            log(f"orders {offset + n:,}/{sizes.orders:,}, lines {n_lines:,}")
+        counts["Orders"] = sizes.orders
+        counts["OrderDetails"] = n_lines
+    finally:
+        conn.close()
+
+    # Índices, LineTotal y DailySales se construyen una sola vez sobre los datos cargados.
+    version = migrate(db_path)
+    log(f"migrated to schema version {version}")
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Northwind database.")
+    parser.add_argument("--scale", type=int, default=1, help="scale factor, 1..10000 (830 orders each)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database file to create")
+    parser.add_argument("--chunk", type=int, default=CHUNK_ORDERS, help="orders per insert transaction")
+    parser.add_argument("--force", action="store_true", help="overwrite an existing database file")
+    args = parser.parse_args()
+    if os.path.exists(args.db) and not args.force:
+        parser.error(f"{args.db} already exists; pass --force to overwrite it")
+    counts = generate(args.db, args.scale, args.seed, args.chunk, verbose=True)
+    print(f"{args.db}: " + ", ".join(f"{table}={rows:,}" for table, rows in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
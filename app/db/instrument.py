@@ -0,0 +1,225 @@
+"""Per-query timing, attributed to the state handler that issued the query.
+
+Every unit of work that ``app.db.query`` runs on a pooled connection is timed
+and reported to subscribers as a ``QueryRecord``, whether it returned or
+raised. When ``SLOW_QUERY_LOG`` is set, queries slower than ``SLOW_QUERY_MS``
+are appended to that JSONL file together with the ``EXPLAIN QUERY PLAN`` of
+the distinct statements they ran (at most ``MAX_STATEMENTS``) and the error
+they raised, if any; the log is rotated past ``SLOW_QUERY_LOG_MAX_BYTES``.
+
+Handlers opt in to attribution with ``@timed_handler`` (under ``@rx.event``)::
+
+    @rx.event(background=True)
+    @timed_handler
+    async def fetch_orders(self): ...
+"""
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, TypedDict, TypeVar
+
+from app.db.settings import SLOW_QUERY_LOG, SLOW_QUERY_LOG_MAX_BYTES, SLOW_QUERY_MS
+
+T = TypeVar("T")
+
+# Distinct statements kept per slow-query record, and characters kept of each.
+MAX_STATEMENTS = 20
+MAX_STATEMENT_CHARS = 4000
+
+current_handler: ContextVar[str | None] = ContextVar("northwind_handler", default=None)
+
+
+class QueryRecord(TypedDict):
+    label: str
+    handler: str | None
+    duration: float
+    rows: int | None
+    error: bool
+
+
+class HandlerRecord(TypedDict):
+    handler: str
+    duration: float
+    error: bool
+
+
+_query_listeners: list[Callable[[QueryRecord], None]] = []
+_handler_listeners: list[Callable[[HandlerRecord], None]] = []
+_log_lock = threading.Lock()
+_in_flight: dict[str, int] = {}
+_in_flight_lock = threading.Lock()
+
+
+def subscribe(
+    on_query: Callable[[QueryRecord], None] | None = None,
+    on_handler: Callable[[HandlerRecord], None] | None = None,
+) -> None:
+    """Register callbacks; ``on_query`` is called from the DB executor threads."""
+    if on_query is not None:
+        _query_listeners.append(on_query)
+    if on_handler is not None:
+        _handler_listeners.append(on_handler)
+
+
+def unsubscribe(callback: Callable[[Any], None]) -> None:
+    for listeners in (_query_listeners, _handler_listeners):
+        if callback in listeners:
+            listeners.remove(callback)
+
+
+def in_flight() -> dict[str, int]:
+    """Handlers currently running, by name."""
+    with _in_flight_lock:
+        return dict(_in_flight)
+
+
+def timed_handler(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Time an async event handler and tag the queries it issues with its name."""
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = current_handler.set(name)
+        with _in_flight_lock:
+            _in_flight[name] = _in_flight.get(name, 0) + 1
+        started = time.perf_counter()
+        error = False
+        try:
+            return await fn(*args, **kwargs)
+        except BaseException:
+            error = True
+            raise
+        finally:
+            current_handler.reset(token)
+            with _in_flight_lock:
+                _in_flight[name] -= 1
+            record: HandlerRecord = {
+                "handler": name,
+                "duration": time.perf_counter() - started,
+                "error": error,
+            }
+            for listener in _handler_listeners:
+                listener(record)
+
+    return wrapper
+
+
+def _row_count(result: Any) -> int | None:
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, sqlite3.Row):
+        return 1
+    if result is None:
+        return 0
+    return None
+
+
+def _query_plan(conn: sqlite3.Connection, sql: str) -> list[str]:
+    if not sql.lstrip()[:6].upper().startswith(("SELECT", "WITH")):
+        return []
+    try:
+        rows = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+    except sqlite3.Error as exc:
+        return [f"unavailable: {exc}"]
+    # (id, parent, notused, detail): indent each step under its parent.
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+class StatementTrace:
+    """Trace callback keeping the first ``MAX_STATEMENTS`` distinct top-level statements.
+
+    SQLite also reports the statements run by triggers and virtual tables
+    (FTS5 shadow tables) as ``-- <sql>`` comments; those are skipped, and
+    statements past the cap are only counted.
+    """
+
+    def __init__(self):
+        self.statements: list[str] = []
+        self.omitted = 0
+
+    def __call__(self, sql: str) -> None:
+        if sql.startswith("--") or sql in self.statements:
+            return
+        if len(self.statements) < MAX_STATEMENTS:
+            self.statements.append(sql)
+        else:
+            self.omitted += 1
+
+
+def _append_log(line: str) -> None:
+    with _log_lock:
+        try:
+            if os.path.getsize(SLOW_QUERY_LOG) + len(line) > SLOW_QUERY_LOG_MAX_BYTES:
+                os.replace(SLOW_QUERY_LOG, SLOW_QUERY_LOG + ".1")
+        except FileNotFoundError:
+            pass
+        with open(SLOW_QUERY_LOG, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def _log_slow(
+    conn: sqlite3.Connection, record: QueryRecord, trace: StatementTrace, error: BaseException | None
+) -> None:
+    entry = {
+        "ts": datetime.now().isoformat(timespec="milliseconds"),
+        "label": record["label"],
+        "handler": record["handler"],
+        "duration_ms": round(record["duration"] * 1000, 3),
+        "rows": record["rows"],
+        "statements": [
+            {"sql": sql[:MAX_STATEMENT_CHARS], "plan": _query_plan(conn, sql)} for sql in trace.statements
+        ],
+        "statements_omitted": trace.omitted,
+        "error": f"{type(error).__name__}: {error}" if error is not None else None,
+    }
+    _append_log(json.dumps(entry, ensure_ascii=False))
+
+
+def timed(
+    conn: sqlite3.Connection,
+    label: str,
+    handler: str | None,
+    fn: Callable[..., T],
+    *args: Any,
+) -> T:
+    """Run ``fn(conn, *args)``, report it to subscribers and log it if slow, even if it raised."""
+    # Statements are only traced when they may end up in the slow-query log.
+    trace = StatementTrace() if SLOW_QUERY_LOG and SLOW_QUERY_MS >= 0 else None
+    if trace is not None:
+        # The callback receives each statement with its parameters already bound,
+        # which is exactly what EXPLAIN QUERY PLAN needs.
+        conn.set_trace_callback(trace)
+    started = time.perf_counter()
+    result = None
+    error = None
+    try:
+        result = fn(conn, *args)
+        return result
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        if trace is not None:
+            conn.set_trace_callback(None)
+        record: QueryRecord = {
+            "label": label,
+            "handler": handler,
+            "duration": duration,
+            "rows": _row_count(result) if error is None else None,
+            "error": error is not None,
+        }
+        for listener in _query_listeners:
+            listener(record)
+        if trace is not None and duration * 1000 >= SLOW_QUERY_MS:
+            _log_slow(conn, record, trace, error)
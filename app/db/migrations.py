@@ -0,0 +1,243 @@
+"""Versioned schema migrations for northwind.db.
+
+Each migration runs once, inside its own transaction, and is recorded in the
+``SchemaMigrations`` table. Running ``migrate()`` again is a no-op, so it is
+safe to call on every startup and against existing database files::
+
+    python -m app.db.migrations            # apply pending migrations
+    python -m app.db.migrations --status   # list applied versions
+"""
+import argparse
+import os
+import sqlite3
+from datetime import datetime
+from typing import Callable
+
+from app.db.catalog import create_product_indexes
+from app.db.facts import create_daily_sales, create_sales_rewrites, rebuild_daily_sales
+from app.db.rollup import create_customer_rollup, rebuild_customer_rollup
+from app.db.search import (
+    create_customer_search,
+    create_order_search,
+    create_product_search,
+    rebuild_customer_search,
+    rebuild_order_search,
+    rebuild_product_search,
+)
+from app.db.settings import DB_PATH
+from app.db.summary import (
+    create_order_counts,
+    create_order_summary,
+    rebuild_order_counts,
+    rebuild_order_summary,
+)
+from app.db.storage import open_reader, open_writer
+
+
+def _hot_path_indexes(conn: sqlite3.Connection) -> None:
+    # Date-range filters used by the dashboard and the analytics pages.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_orderdate ON Orders(OrderDate)")
+    # Customer and employee rollups join Orders on these keys, usually with a date range.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orders_customer_date ON Orders(CustomerID, OrderDate)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orders_employee_date ON Orders(EmployeeID, OrderDate)"
+    )
+    # Shipped / pending counters and the status filter on /orders.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_shippeddate ON Orders(ShippedDate)")
+    # Covering indexes for UnitPrice * Quantity * (1 - Discount), so revenue
+    # aggregates never have to visit the OrderDetails table itself.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orderdetails_order_revenue "
+        "ON OrderDetails(OrderID, ProductID, UnitPrice, Quantity, Discount)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orderdetails_product_revenue "
+        "ON OrderDetails(ProductID, OrderID, UnitPrice, Quantity, Discount)"
+    )
+    conn.execute("ANALYZE")
+
+
+def _line_total_column(conn: sqlite3.Connection) -> None:
+    # Stored once per line instead of recomputing UnitPrice * Quantity * (1 - Discount)
+    # in every aggregate; triggers keep it current for new and edited lines.
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(OrderDetails)")]
+    if "LineTotal" not in columns:
+        conn.execute("ALTER TABLE OrderDetails ADD COLUMN LineTotal REAL")
+    conn.execute("UPDATE OrderDetails SET LineTotal = UnitPrice * Quantity * (1 - Discount)")
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_orderdetails_linetotal_insert
+        AFTER INSERT ON OrderDetails
+        BEGIN
+            UPDATE OrderDetails SET LineTotal = NEW.UnitPrice * NEW.Quantity * (1 - NEW.Discount)
+            WHERE rowid = NEW.rowid;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_orderdetails_linetotal_update
+        AFTER UPDATE OF UnitPrice, Quantity, Discount ON OrderDetails
+        BEGIN
+            UPDATE OrderDetails SET LineTotal = NEW.UnitPrice * NEW.Quantity * (1 - NEW.Discount)
+            WHERE rowid = NEW.rowid;
+        END
+        """
+    )
+    # Replace the expression-column covering indexes from migration 1.
+    conn.execute("DROP INDEX IF EXISTS idx_orderdetails_order_revenue")
+    conn.execute("DROP INDEX IF EXISTS idx_orderdetails_product_revenue")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orderdetails_order_linetotal "
+        "ON OrderDetails(OrderID, LineTotal, ProductID, Quantity)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orderdetails_product_linetotal "
+        "ON OrderDetails(ProductID, OrderID, LineTotal, Quantity)"
+    )
+    conn.execute("ANALYZE")
+
+
+def _daily_sales_facts(conn: sqlite3.Connection) -> None:
+    create_daily_sales(conn)
+    rebuild_daily_sales(conn)
+    conn.execute("ANALYZE DailySales")
+
+
+def _order_summary(conn: sqlite3.Connection) -> None:
+    create_order_summary(conn)
+    rebuild_order_summary(conn)
+    conn.execute("ANALYZE OrderSummary")
+
+
+def _order_counts(conn: sqlite3.Connection) -> None:
+    create_order_counts(conn)
+    rebuild_order_counts(conn)
+
+
+def _order_search(conn: sqlite3.Connection) -> None:
+    create_order_search(conn)
+    rebuild_order_search(conn)
+
+
+def _product_catalog(conn: sqlite3.Connection) -> None:
+    create_product_indexes(conn)
+    create_product_search(conn)
+    rebuild_product_search(conn)
+    conn.execute("ANALYZE Products")
+
+
+def _customer_directory(conn: sqlite3.Connection) -> None:
+    # Sorts and country / city filters of the /customers page.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_customers_company ON Customers(CompanyName)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_customers_contact ON Customers(ContactName)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_customers_city ON Customers(City, CompanyName)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_customers_country ON Customers(Country, City, CompanyName)"
+    )
+    create_customer_search(conn)
+    rebuild_customer_search(conn)
+    conn.execute("ANALYZE Customers")
+
+
+def _customer_rollup(conn: sqlite3.Connection) -> None:
+    create_customer_rollup(conn)
+    rebuild_customer_rollup(conn)
+    conn.execute("ANALYZE CustomerRollup")
+
+
+def _sales_rewrites(conn: sqlite3.Connection) -> None:
+    create_sales_rewrites(conn)
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "hot path indexes", _hot_path_indexes),
+    (2, "materialized OrderDetails.LineTotal", _line_total_column),
+    (3, "DailySales fact table", _daily_sales_facts),
+    (4, "OrderSummary for keyset pagination", _order_summary),
+    (5, "OrderCounts per status", _order_counts),
+    (6, "OrderSearch FTS5 trigram index", _order_search),
+    (7, "Products catalog indexes and ProductSearch", _product_catalog),
+    (8, "Customers directory indexes and CustomerSearch", _customer_directory),
+    (9, "CustomerRollup per customer", _customer_rollup),
+    (10, "SalesRewrites generation for incremental analytics", _sales_rewrites),
+]
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def applied_versions(conn: sqlite3.Connection) -> list[int]:
+    if not _table_exists(conn, "SchemaMigrations"):
+        return []
+    return [row[0] for row in conn.execute("SELECT Version FROM SchemaMigrations ORDER BY Version")]
+
+
+def migrate(db_path: str = DB_PATH) -> int:
+    """Apply pending migrations and return the resulting schema version."""
+    if not os.path.exists(db_path):
+        return 0
+    conn = open_writer(db_path, isolation_level=None)
+    try:
+        if not _table_exists(conn, "Orders"):
+            # Nothing to migrate until the Northwind tables have been created.
+            return 0
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS SchemaMigrations (Version INTEGER PRIMARY KEY, Name TEXT, AppliedAt TEXT)"
+        )
+        applied = set(applied_versions(conn))
+        for version, name, apply in MIGRATIONS:
+            if version in applied:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            # Workers starting together all see the version as pending; only the
+            # first one to take the write lock applies it.
+            if conn.execute("SELECT 1 FROM SchemaMigrations WHERE Version = ?", (version,)).fetchone():
+                conn.execute("ROLLBACK")
+                applied.add(version)
+                continue
+            try:
+                apply(conn)
+                conn.execute(
+                    "INSERT INTO SchemaMigrations VALUES (?, ?, ?)",
+                    (version, name, datetime.now().isoformat(timespec="seconds")),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            applied.add(version)
+        return max(applied, default=0)
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply northwind.db schema migrations.")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database file")
+    parser.add_argument("--status", action="store_true", help="only list applied versions")
+    args = parser.parse_args()
+    if args.status:
+        if not os.path.exists(args.db):
+            print(f"{args.db}: not found")
+            return
+        conn = open_reader(args.db)
+        versions = applied_versions(conn)
+        conn.close()
+        print(f"{args.db}: schema version {max(versions, default=0)}")
+        for version, name, _ in MIGRATIONS:
+            mark = "x" if version in versions else " "
+            print(f"  [{mark}] {version:03d} {name}")
+        return
+    version = migrate(args.db)
+    print(f"{args.db}: schema version {version}")
+
+
+if __name__ == "__main__":
+    main()
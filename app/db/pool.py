@@ -0,0 +1,163 @@
+"""Bounded pool of read-only SQLite connections shared by every state."""
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, TypedDict
+
+from app.db.settings import DB_PATH, POOL_SIZE, POOL_TIMEOUT
+from app.db.storage import open_reader
+
+
+class PoolStats(TypedDict):
+    size: int
+    open_connections: int
+    idle_connections: int
+    checkouts: int
+    hits: int
+    misses: int
+    waits: int
+    wait_time: float
+    timeouts: int
+    hit_rate: float
+
+
+class ConnectionPool:
+    def __init__(self, db_path: str, size: int, timeout: float):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._checkouts = 0
+        self._hits = 0
+        self._misses = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._timeouts = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = open_reader(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+        if conn is not None:
+            with self._lock:
+                self._checkouts += 1
+                self._hits += 1
+            return conn
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if can_open:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+            with self._lock:
+                self._checkouts += 1
+                self._misses += 1
+            return conn
+
+        # Pool exhausted: wait for another handler to give a connection back.
+        started = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self._waits += 1
+                self._timeouts += 1
+                self._wait_time += time.perf_counter() - started
+            raise TimeoutError(
+                f"No database connection available after {self.timeout}s "
+                f"(pool size {self.size})"
+            )
+        with self._lock:
+            self._checkouts += 1
+            self._waits += 1
+            self._wait_time += time.perf_counter() - started
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return {
+                "size": self.size,
+                "open_connections": self._opened,
+                "idle_connections": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "hits": self._hits,
+                "misses": self._misses,
+                "waits": self._waits,
+                "wait_time": self._wait_time,
+                "timeouts": self._timeouts,
+                "hit_rate": self._hits / self._checkouts if self._checkouts else 0.0,
+            }
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH, POOL_SIZE, POOL_TIMEOUT)
+    return _pool
+
+
+def configure_pool(
+    db_path: str = DB_PATH,
+    size: int = POOL_SIZE,
+    timeout: float = POOL_TIMEOUT,
+) -> ConnectionPool:
+    """Replace the shared pool (closing the old one), e.g. to point it at another file."""
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, ConnectionPool(db_path, size, timeout)
+    if old is not None:
+        old.close()
+    return _pool
+
+
+def connection():
+    return get_pool().connection()
+
+
+def pool_stats() -> PoolStats:
+    return get_pool().stats()
@@ -0,0 +1,171 @@
+"""Async query API: SQLite work runs on a dedicated executor, never on the event loop."""
+import asyncio
+import functools
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Sequence, TypeVar
+
+from app.db.cache import MISSING, get_cache
+from app.db.instrument import current_handler, timed
+from app.db.pool import connection
+from app.db.settings import DB_PARALLELISM, DB_THREADS, QUERY_CACHE_ENABLED
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DB_THREADS, thread_name_prefix="northwind-db"
+                )
+    return _executor
+
+
+def _with_connection(
+    label: str, handler: str | None, fn: Callable[..., T], *args: Any
+) -> T:
+    with connection() as conn:
+        return timed(conn, label, handler, fn, *args)
+
+
+def _label(fn: Callable[..., Any], args: tuple) -> str:
+    if fn in (_fetch_all, _fetch_one):
+        # Unlabelled SQL: the start of the statement is the best name we have.
+        return " ".join(args[0].split())[:60]
+    return fn.__qualname__
+
+
+async def run(fn: Callable[..., T], *args: Any, label: str | None = None) -> T:
+    """Run ``fn(conn, *args)`` with a pooled connection on the DB executor."""
+    loop = asyncio.get_running_loop()
+    # The executor does not inherit the handler's context, so pass its name along.
+    return await loop.run_in_executor(
+        get_executor(),
+        functools.partial(
+            _with_connection, label or _label(fn, args), current_handler.get(), fn, *args
+        ),
+    )
+
+
+def _fetch_all(conn: sqlite3.Connection, sql: str, params: Sequence) -> list[sqlite3.Row]:
+    return conn.execute(sql, params).fetchall()
+
+
+def _fetch_one(conn: sqlite3.Connection, sql: str, params: Sequence) -> sqlite3.Row | None:
+    return conn.execute(sql, params).fetchone()
+
+
+async def _cached(fn: Callable[..., T], args: tuple, cache: bool, label: str | None = None) -> T:
+    if not (cache and QUERY_CACHE_ENABLED):
+        return await run(fn, *args, label=label)
+    cache = get_cache()
+    key = (fn.__module__, fn.__qualname__, *args)
+    result = cache.get(key)
+    if result is MISSING:
+        version = cache.data_version()
+        result = await run(fn, *args, label=label)
+        cache.put(key, result, version)
+    return result
+
+
+async def run_cached(fn: Callable[..., T], *args: Any, label: str | None = None) -> T:
+    """Like ``run`` but memoized in the query cache by function and (hashable) arguments."""
+    return await _cached(fn, args, True, label)
+
+
+async def fetch_all(
+    sql: str, params: Sequence = (), cache: bool = True, label: str | None = None
+) -> list[sqlite3.Row]:
+    return await _cached(_fetch_all, (sql, tuple(params)), cache, label)
+
+
+async def fetch_one(
+    sql: str, params: Sequence = (), cache: bool = True, label: str | None = None
+) -> sqlite3.Row | None:
+    return await _cached(_fetch_one, (sql, tuple(params)), cache, label)
+
+
+async def fetch_value(
+    sql: str,
+    params: Sequence = (),
+    default: Any = None,
+    cache: bool = True,
+    label: str | None = None,
+) -> Any:
+    row = await fetch_one(sql, params, cache, label)
+    if row is None or row[0] is None:
+        return default
+    return row[0]
+
+
+class QueryGroup:
+    """Independent queries fanned out over separate pooled connections.
+
+    ``execute()`` runs up to ``parallelism`` of them at once, so the wall time
+    is set by the slowest query rather than the sum. The data version is
+    checked before and after; if a commit landed in between, the group is
+    retried, and after ``retries`` attempts it falls back to running every
+    query serially inside one read transaction, which is a single snapshot.
+    """
+
+    def __init__(self, parallelism: int = DB_PARALLELISM, retries: int = 2):
+        self.parallelism = max(1, parallelism)
+        self.retries = retries
+        self._items: dict[str, tuple[Callable[..., Any], tuple, Callable[[Any], Any], bool]] = {}
+
+    def run(self, label: str, fn: Callable[..., Any], *args: Any, cache: bool = True) -> "QueryGroup":
+        """``cache=False`` for results ``fn`` already keeps per data version itself."""
+        self._items[label] = (fn, args, lambda result: result, cache)
+        return self
+
+    def fetch_all(self, label: str, sql: str, params: Sequence = ()) -> "QueryGroup":
+        self._items[label] = (_fetch_all, (sql, tuple(params)), lambda result: result, True)
+        return self
+
+    def fetch_value(
+        self, label: str, sql: str, params: Sequence = (), default: Any = None
+    ) -> "QueryGroup":
+        def first_column(row: sqlite3.Row | None) -> Any:
+            if row is None or row[0] is None:
+                return default
+            return row[0]
+
+        self._items[label] = (_fetch_one, (sql, tuple(params)), first_column, True)
+        return self
+
+    async def _fan_out(self) -> dict[str, Any]:
+        semaphore = asyncio.Semaphore(self.parallelism)
+
+        async def one(label: str, fn: Callable[..., Any], args: tuple, cache: bool) -> Any:
+            async with semaphore:
+                return await _cached(fn, args, cache, label)
+
+        results = await asyncio.gather(
+            *(one(label, fn, args, cache) for label, (fn, args, _, cache) in self._items.items())
+        )
+        return dict(zip(self._items, results))
+
+    def _serial_snapshot(self, conn: sqlite3.Connection) -> dict[str, Any]:
+        conn.execute("BEGIN")
+        try:
+            return {label: fn(conn, *args) for label, (fn, args, _, _) in self._items.items()}
+        finally:
+            conn.rollback()
+
+    async def execute(self) -> dict[str, Any]:
+        cache = get_cache()
+        for _ in range(self.retries + 1):
+            before = cache.data_version()
+            raw = await self._fan_out()
+            if cache.data_version() == before:
+                break
+        else:
+            raw = await run(self._serial_snapshot, label="serial_snapshot")
+        return {label: self._items[label][2](raw[label]) for label in self._items}
@@ -0,0 +1,125 @@
+"""``CustomerRollup``: order count, revenue and first / last order per customer.
+
+One row per customer (including those without orders), so the /customers
+directory, its stats and the analytics customer figures read a row instead of
+aggregating ``Orders`` x ``OrderDetails``. Triggers on ``Customers``, ``Orders``
+and ``OrderDetails`` apply each change as a delta; only first / last order
+dates are re-read, from ``idx_orders_customer_date``, when an order is removed
+or moved. Segments are relative to the other customers and are derived from
+these numbers in ``app.queries.segments``.
+"""
+import sqlite3
+
+from app.db.summary import LINE_TOTAL
+
+
+def _order_revenue(order: str) -> str:
+    return f"COALESCE((SELECT SUM({LINE_TOTAL.format(line='od')}) FROM OrderDetails od WHERE od.OrderID = {order}.OrderID), 0)"
+
+
+def _add_order(order: str, sign: str) -> str:
+    """Count ``order`` in (+) or out of (-) its customer's rollup."""
+    return f"""
+        UPDATE CustomerRollup SET
+            Orders = Orders {sign} 1,
+            Revenue = Revenue {sign} {_order_revenue(order)}
+        WHERE CustomerID = {order}.CustomerID;"""
+
+
+def _order_dates(customer: str) -> str:
+    return f"""
+        UPDATE CustomerRollup SET
+            FirstOrder = (SELECT MIN(OrderDate) FROM Orders WHERE CustomerID = {customer}),
+            LastOrder = (SELECT MAX(OrderDate) FROM Orders WHERE CustomerID = {customer})
+        WHERE CustomerID = {customer};"""
+
+
+def _add_line(line: str, sign: str) -> str:
+    return f"""
+        UPDATE CustomerRollup SET Revenue = Revenue {sign} {LINE_TOTAL.format(line=line)}
+        WHERE CustomerID = (SELECT CustomerID FROM Orders WHERE OrderID = {line}.OrderID);"""
+
+
+def create_customer_rollup(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS CustomerRollup (
+            CustomerID TEXT PRIMARY KEY,
+            Orders INTEGER NOT NULL DEFAULT 0,
+            Revenue REAL NOT NULL DEFAULT 0,
+            FirstOrder TEXT,
+            LastOrder TEXT
+        ) WITHOUT ROWID
+        """
+    )
+    # Rollup sorts and the segment filter (orders, revenue cutoff) of the /customers page.
+    for name, columns in (("orders", "Orders"), ("revenue", "Revenue"), ("lastorder", "LastOrder")):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_customerrollup_{name} ON CustomerRollup({columns})")
+    triggers = {
+        "trg_customerrollup_customer_insert": (
+            "AFTER INSERT ON Customers",
+            "INSERT OR IGNORE INTO CustomerRollup (CustomerID) VALUES (NEW.CustomerID);",
+        ),
+        "trg_customerrollup_customer_rekey": (
+            "AFTER UPDATE OF CustomerID ON Customers",
+            # Orders keep pointing at the old key, so recount for the new one.
+            f"""DELETE FROM CustomerRollup WHERE CustomerID = OLD.CustomerID;
+            INSERT OR REPLACE INTO CustomerRollup (CustomerID, Orders, Revenue, FirstOrder, LastOrder)
+            SELECT NEW.CustomerID, COUNT(*), COALESCE(SUM({_order_revenue("o")}), 0), MIN(o.OrderDate), MAX(o.OrderDate)
+            FROM Orders o WHERE o.CustomerID = NEW.CustomerID;""",
+        ),
+        "trg_customerrollup_customer_delete": (
+            "AFTER DELETE ON Customers",
+            "DELETE FROM CustomerRollup WHERE CustomerID = OLD.CustomerID;",
+        ),
+        "trg_customerrollup_order_insert": (
+            "AFTER INSERT ON Orders",
+            _add_order("NEW", "+")
+            + """
+        UPDATE CustomerRollup SET
+            FirstOrder = CASE WHEN FirstOrder IS NULL OR NEW.OrderDate < FirstOrder THEN NEW.OrderDate ELSE FirstOrder END,
+            LastOrder = CASE WHEN LastOrder IS NULL OR NEW.OrderDate > LastOrder THEN NEW.OrderDate ELSE LastOrder END
+        WHERE CustomerID = NEW.CustomerID;""",
+        ),
+        "trg_customerrollup_order_update": (
+            "AFTER UPDATE OF OrderID, CustomerID, OrderDate ON Orders",
+            _add_order("OLD", "-")
+            + _add_order("NEW", "+")
+            + _order_dates("OLD.CustomerID")
+            + _order_dates("NEW.CustomerID"),
+        ),
+        "trg_customerrollup_order_delete": (
+            "AFTER DELETE ON Orders",
+            _add_order("OLD", "-") + _order_dates("OLD.CustomerID"),
+        ),
+        "trg_customerrollup_line_insert": ("AFTER INSERT ON OrderDetails", _add_line("NEW", "+")),
+        "trg_customerrollup_line_delete": ("AFTER DELETE ON OrderDetails", _add_line("OLD", "-")),
+        "trg_customerrollup_line_update": (
+            "AFTER UPDATE OF OrderID, UnitPrice, Quantity, Discount ON OrderDetails",
+            _add_line("OLD", "-") + _add_line("NEW", "+"),
+        ),
+    }
+    for name, (event, body) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+
+
+def rebuild_customer_rollup(conn: sqlite3.Connection) -> int:
+    """Recompute every rollup row; returns the row count."""
+    conn.execute("DELETE FROM CustomerRollup")
+    conn.execute(
+        """
+        INSERT INTO CustomerRollup (CustomerID, Orders, Revenue, FirstOrder, LastOrder)
+        SELECT c.CustomerID, COALESCE(o.Orders, 0), COALESCE(r.Revenue, 0), o.FirstOrder, o.LastOrder
+        FROM Customers c
+        LEFT JOIN (
+            SELECT CustomerID, COUNT(*) AS Orders, MIN(OrderDate) AS FirstOrder, MAX(OrderDate) AS LastOrder
+            FROM Orders GROUP BY CustomerID
+        ) o ON o.CustomerID = c.CustomerID
+        LEFT JOIN (
+            SELECT o.CustomerID, SUM(od.LineTotal) AS Revenue
+            FROM Orders o JOIN OrderDetails od ON od.OrderID = o.OrderID
+            GROUP BY o.CustomerID
+        ) r ON r.CustomerID = c.CustomerID
+        """
+    )
+    return conn.execute("SELECT COUNT(*) FROM CustomerRollup").fetchone()[0]
@@ -0,0 +1,235 @@
+"""FTS5 trigram indexes behind the /orders and /products search boxes.
+
+``OrderSearch``: one row per order (``rowid`` = OrderID) holding the order ID,
+customer company and contact, employee name and ship city / country.
+``ProductSearch``: one row per product (``rowid`` = ProductID) holding the
+product, category and supplier names as displayed on /products.
+``CustomerSearch``: an external-content index over ``Customers`` (``rowid`` =
+the Customers rowid) of the company, contact, city and country; the text is
+read back from ``Customers``. ``Customers`` has a TEXT key, whose implicit
+rowid ``VACUUM`` may renumber, so run ``rebuild_customer_search`` after one.
+
+The trigram tokenizer indexes every 3-character substring, so
+``MATCH '"term"'`` answers the same case-insensitive "contains" question as
+``LIKE '%term%'`` from the index instead of rescanning the join. Terms shorter
+than three characters have no trigram and fall back to a ``LIKE`` scan of the
+same table; non-ASCII terms are compared against ``py_lower`` (Python's
+``str.lower``, registered on every connection by ``app.db.storage``) since
+SQLite's ``LIKE`` only folds ASCII case.
+Triggers on the source tables keep the indexes current.
+"""
+import sqlite3
+from typing import Any
+
+SEARCH_COLUMNS = ("OrderKey", "CustomerName", "ContactName", "EmployeeName", "ShipCity", "ShipCountry")
+PRODUCT_SEARCH_COLUMNS = ("ProductName", "CategoryName", "SupplierName")
+CUSTOMER_SEARCH_COLUMNS = ("CompanyName", "ContactName", "City", "Country")
+MIN_TRIGRAM = 3
+
+
+def py_lower(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+
+def register_functions(conn: sqlite3.Connection) -> None:
+    conn.create_function("py_lower", 1, py_lower, deterministic=True)
+
+
+def _like_pattern(term: str) -> str:
+    """``%term%`` for ``LIKE ? ESCAPE '\\'``, with ``term`` matched literally."""
+    escaped = term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _search_row(order: str) -> str:
+    return f"""
+        SELECT {order}.OrderID, CAST({order}.OrderID AS TEXT),
+               COALESCE((SELECT CompanyName FROM Customers WHERE CustomerID = {order}.CustomerID), ''),
+               COALESCE((SELECT ContactName FROM Customers WHERE CustomerID = {order}.CustomerID), ''),
+               COALESCE((SELECT FirstName || ' ' || LastName FROM Employees WHERE EmployeeID = {order}.EmployeeID), ''),
+               COALESCE({order}.ShipCity, ''), COALESCE({order}.ShipCountry, '')"""
+
+
+def create_order_search(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS OrderSearch
+        USING fts5({", ".join(SEARCH_COLUMNS)}, tokenize = 'trigram')
+        """
+    )
+    insert = f"INSERT INTO OrderSearch (rowid, {', '.join(SEARCH_COLUMNS)}) {_search_row('NEW')};"
+    triggers = {
+        "trg_ordersearch_order_insert": ("AFTER INSERT ON Orders", insert),
+        "trg_ordersearch_order_update": (
+            "AFTER UPDATE OF OrderID, CustomerID, EmployeeID, ShipCity, ShipCountry ON Orders",
+            "DELETE FROM OrderSearch WHERE rowid = OLD.OrderID;" + insert,
+        ),
+        "trg_ordersearch_order_delete": (
+            "AFTER DELETE ON Orders",
+            "DELETE FROM OrderSearch WHERE rowid = OLD.OrderID;",
+        ),
+        "trg_ordersearch_customer_update": (
+            "AFTER UPDATE OF CompanyName, ContactName ON Customers",
+            """UPDATE OrderSearch SET CustomerName = COALESCE(NEW.CompanyName, ''),
+                                      ContactName = COALESCE(NEW.ContactName, '')
+               WHERE rowid IN (SELECT OrderID FROM Orders WHERE CustomerID = NEW.CustomerID);""",
+        ),
+        "trg_ordersearch_employee_update": (
+            "AFTER UPDATE OF FirstName, LastName ON Employees",
+            """UPDATE OrderSearch SET EmployeeName = COALESCE(NEW.FirstName || ' ' || NEW.LastName, '')
+               WHERE rowid IN (SELECT OrderID FROM Orders WHERE EmployeeID = NEW.EmployeeID);""",
+        ),
+    }
+    for name, (event, body) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+
+
+def rebuild_order_search(conn: sqlite3.Connection) -> int:
+    """Re-index every order; returns the row count."""
+    conn.execute("DELETE FROM OrderSearch")
+    conn.execute(
+        f"""
+        INSERT INTO OrderSearch (rowid, {", ".join(SEARCH_COLUMNS)})
+        SELECT o.OrderID, CAST(o.OrderID AS TEXT),
+               COALESCE(c.CompanyName, ''), COALESCE(c.ContactName, ''),
+               COALESCE(e.FirstName || ' ' || e.LastName, ''),
+               COALESCE(o.ShipCity, ''), COALESCE(o.ShipCountry, '')
+        FROM Orders o
+        LEFT JOIN Customers c ON c.CustomerID = o.CustomerID
+        LEFT JOIN Employees e ON e.EmployeeID = o.EmployeeID
+        """
+    )
+    # Merge the b-trees written by the bulk insert into one segment.
+    conn.execute("INSERT INTO OrderSearch (OrderSearch) VALUES ('optimize')")
+    return conn.execute("SELECT COUNT(*) FROM OrderSearch").fetchone()[0]
+
+
+def _product_row(product: str) -> str:
+    return f"""
+        SELECT {product}.ProductID, COALESCE({product}.ProductName, ''),
+               COALESCE((SELECT CategoryName FROM Categories WHERE CategoryID = {product}.CategoryID), 'Uncategorized'),
+               COALESCE((SELECT CompanyName FROM Suppliers WHERE SupplierID = {product}.SupplierID), 'Unknown')"""
+
+
+def create_product_search(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS ProductSearch
+        USING fts5({", ".join(PRODUCT_SEARCH_COLUMNS)}, tokenize = 'trigram')
+        """
+    )
+    insert = f"INSERT INTO ProductSearch (rowid, {', '.join(PRODUCT_SEARCH_COLUMNS)}) {_product_row('NEW')};"
+    triggers = {
+        "trg_productsearch_product_insert": ("AFTER INSERT ON Products", insert),
+        "trg_productsearch_product_update": (
+            "AFTER UPDATE OF ProductID, ProductName, CategoryID, SupplierID ON Products",
+            "DELETE FROM ProductSearch WHERE rowid = OLD.ProductID;" + insert,
+        ),
+        "trg_productsearch_product_delete": (
+            "AFTER DELETE ON Products",
+            "DELETE FROM ProductSearch WHERE rowid = OLD.ProductID;",
+        ),
+        "trg_productsearch_category_update": (
+            "AFTER UPDATE OF CategoryName ON Categories",
+            """UPDATE ProductSearch SET CategoryName = COALESCE(NEW.CategoryName, 'Uncategorized')
+               WHERE rowid IN (SELECT ProductID FROM Products WHERE CategoryID = NEW.CategoryID);""",
+        ),
+        "trg_productsearch_supplier_update": (
+            "AFTER UPDATE OF CompanyName ON Suppliers",
+            """UPDATE ProductSearch SET SupplierName = COALESCE(NEW.CompanyName, 'Unknown')
+               WHERE rowid IN (SELECT ProductID FROM Products WHERE SupplierID = NEW.SupplierID);""",
+        ),
+    }
+    for name, (event, body) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+
+
+def rebuild_product_search(conn: sqlite3.Connection) -> int:
+    """Re-index every product; returns the row count."""
+    conn.execute("DELETE FROM ProductSearch")
+    conn.execute(
+        f"""
+        INSERT INTO ProductSearch (rowid, {", ".join(PRODUCT_SEARCH_COLUMNS)})
+        SELECT p.ProductID, COALESCE(p.ProductName, ''),
+               COALESCE(c.CategoryName, 'Uncategorized'), COALESCE(s.CompanyName, 'Unknown')
+        FROM Products p
+        LEFT JOIN Categories c ON c.CategoryID = p.CategoryID
+        LEFT JOIN Suppliers s ON s.SupplierID = p.SupplierID
+        """
+    )
+    conn.execute("INSERT INTO ProductSearch (ProductSearch) VALUES ('optimize')")
+    return conn.execute("SELECT COUNT(*) FROM ProductSearch").fetchone()[0]
+
+
+def create_customer_search(conn: sqlite3.Connection) -> None:
+    columns = ", ".join(CUSTOMER_SEARCH_COLUMNS)
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS CustomerSearch
+        USING fts5({columns}, content = 'Customers', content_rowid = 'rowid', tokenize = 'trigram')
+        """
+    )
+    new = ", ".join(f"NEW.{name}" for name in CUSTOMER_SEARCH_COLUMNS)
+    old = ", ".join(f"OLD.{name}" for name in CUSTOMER_SEARCH_COLUMNS)
+    insert = f"INSERT INTO CustomerSearch (rowid, {columns}) VALUES (NEW.rowid, {new});"
+    # External content: the index is told which values the row held.
+    delete = f"INSERT INTO CustomerSearch (CustomerSearch, rowid, {columns}) VALUES ('delete', OLD.rowid, {old});"
+    triggers = {
+        "trg_customersearch_insert": ("AFTER INSERT ON Customers", insert),
+        "trg_customersearch_update": (f"AFTER UPDATE OF {columns} ON Customers", delete + insert),
+        "trg_customersearch_delete": ("AFTER DELETE ON Customers", delete),
+    }
+    for name, (event, body) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+
+
+def rebuild_customer_search(conn: sqlite3.Connection) -> int:
+    """Re-index every customer from ``Customers``; returns the row count."""
+    conn.execute("INSERT INTO CustomerSearch (CustomerSearch) VALUES ('rebuild')")
+    conn.execute("INSERT INTO CustomerSearch (CustomerSearch) VALUES ('optimize')")
+    return conn.execute("SELECT COUNT(*) FROM Customers").fetchone()[0]
+
+
+def _match(
+    table: str,
+    columns: tuple[str, ...],
+    term: str,
+    column: str,
+    per_row: bool,
+) -> tuple[str, list[Any]]:
+    if len(term) >= MIN_TRIGRAM:
+        phrase = '"' + term.replace('"', '""') + '"'
+        return f"{column} IN (SELECT rowid FROM {table} WHERE {table} MATCH ?)", [phrase]
+    # LIKE already folds ASCII case; py_lower (a Python call per value) is only
+    # needed to fold the other letters of a non-ASCII term.
+    lower = "{}" if term.isascii() else "py_lower({})"
+    condition = " OR ".join(f"{lower.format(name)} LIKE ? ESCAPE '\\'" for name in columns)
+    params = [_like_pattern(term)] * len(columns)
+    if per_row:
+        return f"EXISTS (SELECT 1 FROM {table} WHERE rowid = {column} AND ({condition}))", params
+    return f"{column} IN (SELECT rowid FROM {table} WHERE {condition})", params
+
+
+def search_clause(term: str, column: str = "OrderID", per_row: bool = False) -> tuple[str, list[Any]]:
+    """Condition restricting rows to orders whose indexed text contains ``term``.
+
+    ``per_row`` only changes the plan for terms too short for a trigram: the
+    LIKE check runs as each row is visited instead of collecting every match
+    up front, which is what a ``LIMIT``ed page walking a sort index wants.
+    Counts should leave it off.
+    """
+    return _match("OrderSearch", SEARCH_COLUMNS, term, column, per_row)
+
+
+def product_search_clause(
+    term: str, column: str = "ProductID", per_row: bool = False
+) -> tuple[str, list[Any]]:
+    """Same as ``search_clause`` for products."""
+    return _match("ProductSearch", PRODUCT_SEARCH_COLUMNS, term, column, per_row)
+
+
+def customer_search_clause(
+    term: str, column: str = "rowid", per_row: bool = False
+) -> tuple[str, list[Any]]:
+    """Same as ``search_clause`` for customers; ``column`` is the Customers rowid."""
+    return _match("CustomerSearch", CUSTOMER_SEARCH_COLUMNS, term, column, per_row)
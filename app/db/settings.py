@@ -0,0 +1,40 @@
+"""Shared database settings, overridable through environment variables."""
+import os
+
+DB_PATH = os.environ.get("NORTHWIND_DB_PATH", "northwind.db")
+
+# Read-only connections kept open by the pool.
+POOL_SIZE = int(os.environ.get("NORTHWIND_POOL_SIZE", "8"))
+# Seconds a handler waits for a free connection before giving up.
+POOL_TIMEOUT = float(os.environ.get("NORTHWIND_POOL_TIMEOUT", "10"))
+
+# Worker threads that run SQLite work off the event loop.
+DB_THREADS = int(os.environ.get("NORTHWIND_DB_THREADS", str(POOL_SIZE)))
+
+# Process-wide query result cache (see app/db/cache.py).
+QUERY_CACHE_ENABLED = os.environ.get("NORTHWIND_QUERY_CACHE", "1") != "0"
+QUERY_CACHE_MAX_BYTES = int(os.environ.get("NORTHWIND_QUERY_CACHE_MB", "64")) * 1024 * 1024
+QUERY_CACHE_TTL = float(os.environ.get("NORTHWIND_QUERY_CACHE_TTL", "300"))
+# Seconds a data version check is reused before the probe connection is asked
+# again; commits show up in caches at most this late. 0 checks on every lookup.
+DATA_VERSION_INTERVAL = float(os.environ.get("NORTHWIND_DATA_VERSION_INTERVAL", "0.25"))
+
+# Queries of one QueryGroup allowed to run at the same time, each on its own connection.
+DB_PARALLELISM = int(os.environ.get("NORTHWIND_DB_PARALLELISM", str(min(4, POOL_SIZE))))
+
+# Storage profile applied to every connection (see app/db/storage.py).
+JOURNAL_MODE = os.environ.get("NORTHWIND_JOURNAL_MODE", "wal")
+SYNCHRONOUS = os.environ.get("NORTHWIND_SYNCHRONOUS", "normal")
+MMAP_SIZE = int(os.environ.get("NORTHWIND_MMAP_MB", "256")) * 1024 * 1024
+# Page cache per connection, in KiB.
+CACHE_SIZE_KIB = int(os.environ.get("NORTHWIND_CACHE_MB", "64")) * 1024
+TEMP_STORE = os.environ.get("NORTHWIND_TEMP_STORE", "memory")
+BUSY_TIMEOUT_MS = int(os.environ.get("NORTHWIND_BUSY_TIMEOUT_MS", "5000"))
+
+# Queries slower than this (ms) are written, with their query plans, to the
+# slow-query log (see app/db/instrument.py). The log is off unless a path is
+# given; a negative threshold also turns it off.
+SLOW_QUERY_MS = float(os.environ.get("NORTHWIND_SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG = os.environ.get("NORTHWIND_SLOW_QUERY_LOG", "")
+# Past this size the log is moved to ``<log>.1`` (replacing the previous one) and restarted.
+SLOW_QUERY_LOG_MAX_BYTES = int(os.environ.get("NORTHWIND_SLOW_QUERY_LOG_MB", "10")) * 1024 * 1024
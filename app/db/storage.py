@@ -0,0 +1,84 @@
+"""Storage tuning profile shared by every SQLite connection the app opens.
+
+Readers are opened through a ``mode=ro`` URI with ``query_only`` set, and get
+memory-mapped I/O, a larger page cache and in-memory temp storage. Writers
+(migrations, fact rebuilds, data generation) switch the file to WAL so those
+readers never block on nightly loads.
+"""
+import argparse
+import sqlite3
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from app.db import settings
+from app.db.search import register_functions
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    journal_mode: str = settings.JOURNAL_MODE
+    synchronous: str = settings.SYNCHRONOUS
+    mmap_size: int = settings.MMAP_SIZE
+    cache_size_kib: int = settings.CACHE_SIZE_KIB
+    temp_store: str = settings.TEMP_STORE
+    busy_timeout_ms: int = settings.BUSY_TIMEOUT_MS
+
+
+PROFILE = StorageProfile()
+
+
+def _apply_common(conn: sqlite3.Connection, profile: StorageProfile) -> None:
+    conn.execute(f"PRAGMA busy_timeout = {int(profile.busy_timeout_ms)}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile.mmap_size)}")
+    # Negative cache_size is interpreted by SQLite as KiB rather than pages.
+    conn.execute(f"PRAGMA cache_size = {-int(profile.cache_size_kib)}")
+    conn.execute(f"PRAGMA temp_store = {profile.temp_store}")
+    register_functions(conn)
+
+
+def open_reader(db_path: str, profile: StorageProfile = PROFILE) -> sqlite3.Connection:
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    _apply_common(conn, profile)
+    conn.execute("PRAGMA query_only = 1")
+    return conn
+
+
+def open_writer(
+    db_path: str, profile: StorageProfile = PROFILE, **kwargs: Any
+) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, **kwargs)
+    conn.execute(f"PRAGMA journal_mode = {profile.journal_mode}")
+    conn.execute(f"PRAGMA synchronous = {profile.synchronous}")
+    _apply_common(conn, profile)
+    return conn
+
+
+def effective_settings(conn: sqlite3.Connection) -> dict[str, Any]:
+    pragmas = ["journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store", "query_only", "page_size"]
+    return {name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in pragmas}
+
+
+def report(db_path: str = settings.DB_PATH) -> str:
+    """Describe the configured profile and what a reader connection actually got."""
+    lines = [f"storage profile: {asdict(PROFILE)}"]
+    if Path(db_path).exists():
+        conn = open_reader(db_path)
+        try:
+            lines.append(f"reader settings for {db_path}: {effective_settings(conn)}")
+        finally:
+            conn.close()
+    else:
+        lines.append(f"{db_path} not found; settings apply once it exists")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show the storage profile and what a reader connection gets.")
+    parser.add_argument("--db", default=settings.DB_PATH, help="SQLite database file")
+    print(report(parser.parse_args().db))
+
+
+if __name__ == "__main__":
+    main()
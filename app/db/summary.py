@@ -0,0 +1,178 @@
+"""``OrderSummary``: one pre-joined row per order for the /orders table.
+
+Holds the customer and employee names, dates, status and order total, with a
+``(column, OrderID)`` index per sortable column so pages can be fetched with a
+keyset seek instead of re-aggregating the join for every ``OFFSET``. Every sort
+column is NOT NULL (pending orders store ``''`` as ShippedDate) because row
+value comparisons against NULL never match. Triggers on ``Orders``,
+``OrderDetails``, ``Customers`` and ``Employees`` keep it current.
+
+``OrderCounts`` holds the number of orders per status, so the unfiltered and
+status-only totals of the /orders pager are a single-row lookup.
+"""
+import sqlite3
+
+LINE_TOTAL = "{line}.UnitPrice * {line}.Quantity * (1 - {line}.Discount)"
+STATUS = "CASE WHEN {order}.ShippedDate IS NULL THEN 'Pending' ELSE 'Shipped' END"
+
+# Sort key of the /orders page -> OrderSummary column.
+SORT_COLUMNS = {
+    "order_id": "OrderID",
+    "customer_name": "CustomerName",
+    "employee_name": "EmployeeName",
+    "order_date": "OrderDate",
+    "shipped_date": "ShippedDate",
+    "status": "Status",
+    "total_revenue": "TotalRevenue",
+}
+
+
+def _summary_row(order: str) -> str:
+    return f"""
+        SELECT {order}.OrderID,
+               COALESCE((SELECT CompanyName FROM Customers WHERE CustomerID = {order}.CustomerID), ''),
+               COALESCE((SELECT FirstName || ' ' || LastName FROM Employees WHERE EmployeeID = {order}.EmployeeID), ''),
+               COALESCE({order}.OrderDate, ''),
+               COALESCE({order}.ShippedDate, ''),
+               {STATUS.format(order=order)},
+               COALESCE((SELECT SUM({LINE_TOTAL.format(line="od")}) FROM OrderDetails od WHERE od.OrderID = {order}.OrderID), 0)"""
+
+
+def _add_line(sign: str, line: str) -> str:
+    return f"""
+        UPDATE OrderSummary SET TotalRevenue = TotalRevenue {sign} {LINE_TOTAL.format(line=line)}
+        WHERE OrderID = {line}.OrderID;"""
+
+
+def _customer_name(customer: str) -> str:
+    return f"""
+        UPDATE OrderSummary SET CustomerName = COALESCE(
+            (SELECT CompanyName FROM Customers WHERE CustomerID = {customer}.CustomerID), '')
+        WHERE OrderID IN (SELECT OrderID FROM Orders WHERE CustomerID = {customer}.CustomerID);"""
+
+
+def _employee_name(employee: str) -> str:
+    return f"""
+        UPDATE OrderSummary SET EmployeeName = COALESCE(
+            (SELECT FirstName || ' ' || LastName FROM Employees WHERE EmployeeID = {employee}.EmployeeID), '')
+        WHERE OrderID IN (SELECT OrderID FROM Orders WHERE EmployeeID = {employee}.EmployeeID);"""
+
+
+def create_order_summary(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS OrderSummary (
+            OrderID INTEGER PRIMARY KEY,
+            CustomerName TEXT NOT NULL,
+            EmployeeName TEXT NOT NULL,
+            OrderDate TEXT NOT NULL,
+            ShippedDate TEXT NOT NULL,
+            Status TEXT NOT NULL,
+            TotalRevenue REAL NOT NULL DEFAULT 0
+        )
+        """
+    )
+    for key, column in SORT_COLUMNS.items():
+        if column != "OrderID":
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_ordersummary_{key} ON OrderSummary({column}, OrderID)"
+            )
+    triggers = {
+        "trg_ordersummary_order_insert": (
+            "AFTER INSERT ON Orders",
+            f"INSERT OR REPLACE INTO OrderSummary {_summary_row('NEW')};",
+        ),
+        "trg_ordersummary_order_update": (
+            "AFTER UPDATE ON Orders",
+            f"DELETE FROM OrderSummary WHERE OrderID = OLD.OrderID;"
+            f"INSERT OR REPLACE INTO OrderSummary {_summary_row('NEW')};",
+        ),
+        "trg_ordersummary_order_delete": (
+            "AFTER DELETE ON Orders",
+            "DELETE FROM OrderSummary WHERE OrderID = OLD.OrderID;",
+        ),
+        "trg_ordersummary_line_insert": ("AFTER INSERT ON OrderDetails", _add_line("+", "NEW")),
+        "trg_ordersummary_line_delete": ("AFTER DELETE ON OrderDetails", _add_line("-", "OLD")),
+        "trg_ordersummary_line_update": (
+            "AFTER UPDATE OF OrderID, UnitPrice, Quantity, Discount ON OrderDetails",
+            _add_line("-", "OLD") + _add_line("+", "NEW"),
+        ),
+        # Orders keep their CustomerID / EmployeeID when the row they point at is
+        # renamed, rekeyed, deleted or (re)inserted, so re-read the name for both keys.
+        "trg_ordersummary_customer_insert": ("AFTER INSERT ON Customers", _customer_name("NEW")),
+        "trg_ordersummary_customer_update": (
+            "AFTER UPDATE OF CustomerID, CompanyName ON Customers",
+            _customer_name("OLD") + _customer_name("NEW"),
+        ),
+        "trg_ordersummary_customer_delete": ("AFTER DELETE ON Customers", _customer_name("OLD")),
+        "trg_ordersummary_employee_insert": ("AFTER INSERT ON Employees", _employee_name("NEW")),
+        "trg_ordersummary_employee_update": (
+            "AFTER UPDATE OF EmployeeID, FirstName, LastName ON Employees",
+            _employee_name("OLD") + _employee_name("NEW"),
+        ),
+        "trg_ordersummary_employee_delete": ("AFTER DELETE ON Employees", _employee_name("OLD")),
+    }
+    for name, (event, body) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+
+
+def rebuild_order_summary(conn: sqlite3.Connection) -> int:
+    """Recompute every summary row; returns the row count."""
+    conn.execute("DELETE FROM OrderSummary")
+    conn.execute(
+        """
+        INSERT INTO OrderSummary
+        SELECT o.OrderID, COALESCE(c.CompanyName, ''),
+               COALESCE(e.FirstName || ' ' || e.LastName, ''),
+               COALESCE(o.OrderDate, ''), COALESCE(o.ShippedDate, ''),
+               CASE WHEN o.ShippedDate IS NULL THEN 'Pending' ELSE 'Shipped' END,
+               COALESCE(t.Total, 0)
+        FROM Orders o
+        LEFT JOIN Customers c ON c.CustomerID = o.CustomerID
+        LEFT JOIN Employees e ON e.EmployeeID = o.EmployeeID
+        LEFT JOIN (
+            SELECT OrderID, SUM(LineTotal) AS Total FROM OrderDetails GROUP BY OrderID
+        ) t ON t.OrderID = o.OrderID
+        """
+    )
+    return conn.execute("SELECT COUNT(*) FROM OrderSummary").fetchone()[0]
+
+
+def _count(order: str, delta: str) -> str:
+    return f"""
+        INSERT INTO OrderCounts (Status, Orders) VALUES ({STATUS.format(order=order)}, {delta})
+        ON CONFLICT (Status) DO UPDATE SET Orders = Orders + excluded.Orders;"""
+
+
+def create_order_counts(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS OrderCounts (
+            Status TEXT PRIMARY KEY,
+            Orders INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """
+    )
+    triggers = {
+        "trg_ordercounts_insert": ("AFTER INSERT ON Orders", _count("NEW", "1")),
+        "trg_ordercounts_delete": ("AFTER DELETE ON Orders", _count("OLD", "-1")),
+        "trg_ordercounts_update": (
+            "AFTER UPDATE OF ShippedDate ON Orders "
+            "WHEN (OLD.ShippedDate IS NULL) != (NEW.ShippedDate IS NULL)",
+            _count("OLD", "-1") + _count("NEW", "1"),
+        ),
+    }
+    for name, (event, body) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+
+
+def rebuild_order_counts(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM OrderCounts")
+    conn.execute("INSERT INTO OrderCounts VALUES ('Shipped', 0), ('Pending', 0)")
+    conn.execute(
+        f"""
+        INSERT INTO OrderCounts (Status, Orders)
+        SELECT {STATUS.format(order="Orders")}, COUNT(*) FROM Orders WHERE true GROUP BY 1
+        ON CONFLICT (Status) DO UPDATE SET Orders = excluded.Orders
+        """
+    )
@@ -0,0 +1,217 @@
+"""Prometheus text-format metrics for this worker, served at ``/metrics``.
+
+Everything is kept in-process (no client library, no push gateway): each
+backend worker exposes its own numbers and a scraper can be pointed at any of
+them. Latencies come from ``app.db.instrument``; cache and pool figures are
+read from their stats at scrape time. Session state sizes are sampled off the
+event loop and reused for ``STATE_SIZE_INTERVAL`` seconds.
+"""
+import asyncio
+import os
+import pickle
+import random
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.db.cache import cache_stats
+from app.db.instrument import HandlerRecord, QueryRecord, in_flight, subscribe
+from app.db.pool import pool_stats
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds a session state size sample is reused for; negative disables the state gauges.
+STATE_SIZE_INTERVAL = float(os.environ.get("NORTHWIND_STATE_SIZE_INTERVAL", "60"))
+# Sessions serialized per sample; the total is extrapolated from them.
+STATE_SIZE_SAMPLE = int(os.environ.get("NORTHWIND_STATE_SIZE_SAMPLE", "100"))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: Any) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a single label."""
+
+    def __init__(self, name: str, help: str, label: str, buckets: tuple[float, ...] = BUCKETS):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # key -> (bucket counts, sum, count)
+        self._series: dict[str, tuple[list[int], float, int]] = {}
+
+    def observe(self, key: str, value: float) -> None:
+        with self._lock:
+            counts, total, n = self._series.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._series[key] = (counts, total + value, n + 1)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(c), s, n) for key, (c, s, n) in self._series.items()}
+        for key, (counts, total, n) in sorted(series.items()):
+            for bound, count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_labels(**{self.label: key, 'le': bound})} {count}")
+            lines.append(f"{self.name}_bucket{_labels(**{self.label: key, 'le': '+Inf'})} {n}")
+            lines.append(f"{self.name}_sum{_labels(**{self.label: key})} {total}")
+            lines.append(f"{self.name}_count{_labels(**{self.label: key})} {n}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str, label: str):
+        self.name = name
+        self.help = help
+        self.label = label
+        self._lock = threading.Lock()
+        self._values: dict[str, float] = {}
+
+    def inc(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(**{self.label: key})} {value}")
+        return lines
+
+
+def _gauge(name: str, help: str, samples: Iterable[tuple[dict, float]], kind: str = "gauge") -> list[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    lines += [f"{name}{_labels(**labels)} {value}" for labels, value in samples]
+    return lines
+
+
+handler_latency = Histogram(
+    "northwind_handler_duration_seconds", "Event handler wall time.", "handler"
+)
+handler_errors = Counter(
+    "northwind_handler_errors_total", "Event handlers that raised.", "handler"
+)
+query_latency = Histogram(
+    "northwind_query_duration_seconds", "Time spent running a query on a pooled connection.", "label"
+)
+query_rows = Counter("northwind_query_rows_total", "Rows returned by queries.", "label")
+
+
+def _on_handler(record: HandlerRecord) -> None:
+    handler_latency.observe(record["handler"], record["duration"])
+    if record["error"]:
+        handler_errors.inc(record["handler"])
+
+
+def _on_query(record: QueryRecord) -> None:
+    query_latency.observe(record["label"], record["duration"])
+    if record["rows"] is not None:
+        query_rows.inc(record["label"], record["rows"])
+
+
+subscribe(on_query=_on_query, on_handler=_on_handler)
+
+
+class StateSizes:
+    """Session count and the serialized sizes of a random sample of their states."""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._taken = 0.0
+        self._sample: tuple[int, list[int]] = (0, [])
+
+    @staticmethod
+    def _measure(app: Any) -> tuple[int, list[int]]:
+        try:
+            states = getattr(app.state_manager, "states", None)
+        except Exception:
+            return 0, []
+        # Copy first: sessions are added from the event loop while we iterate.
+        states = list((states or {}).values())
+        sizes = []
+        for state in random.sample(states, min(len(states), STATE_SIZE_SAMPLE)):
+            try:
+                serialize = getattr(state, "_serialize", None)
+                sizes.append(len(serialize() if serialize else pickle.dumps(state)))
+            except Exception:
+                continue
+        return len(states), sizes
+
+    async def get(self, app: Any) -> tuple[int, list[int]]:
+        """The last sample, retaken on a worker thread once it is ``STATE_SIZE_INTERVAL`` old."""
+        async with self._lock:
+            if not self._taken or time.monotonic() - self._taken >= STATE_SIZE_INTERVAL:
+                loop = asyncio.get_running_loop()
+                self._sample = await loop.run_in_executor(None, self._measure, app)
+                self._taken = time.monotonic()
+            return self._sample
+
+
+_state_sizes = StateSizes()
+
+
+def render(state_sizes: tuple[int, list[int]] | None = None) -> str:
+    lines = handler_latency.render() + handler_errors.render()
+    lines += _gauge(
+        "northwind_handlers_in_flight",
+        "Background event handlers currently running.",
+        [({"handler": name}, count) for name, count in sorted(in_flight().items())],
+    )
+    lines += query_latency.render() + query_rows.render()
+
+    cache = cache_stats()
+    lines += _gauge("northwind_query_cache_hits_total", "Query cache hits.", [({}, cache["hits"])], "counter")
+    lines += _gauge("northwind_query_cache_misses_total", "Query cache misses.", [({}, cache["misses"])], "counter")
+    lines += _gauge("northwind_query_cache_hit_ratio", "Hits over lookups since start.", [({}, cache["hit_rate"])])
+    lines += _gauge("northwind_query_cache_bytes", "Estimated size of cached results.", [({}, cache["bytes"])])
+    lines += _gauge("northwind_query_cache_entries", "Cached results.", [({}, cache["entries"])])
+
+    pool = pool_stats()
+    lines += _gauge("northwind_pool_connections", "Pooled connections by state.", [
+        ({"state": "open"}, pool["open_connections"]),
+        ({"state": "idle"}, pool["idle_connections"]),
+    ])
+    lines += _gauge("northwind_pool_checkouts_total", "Connections handed out.", [({}, pool["checkouts"])], "counter")
+    lines += _gauge("northwind_pool_waits_total", "Checkouts that had to wait for a connection.", [({}, pool["waits"])], "counter")
+    lines += _gauge("northwind_pool_wait_seconds_total", "Time spent waiting for a connection.", [({}, pool["wait_time"])], "counter")
+    lines += _gauge("northwind_pool_timeouts_total", "Checkouts that gave up.", [({}, pool["timeouts"])], "counter")
+
+    if state_sizes is not None:
+        sessions, sizes = state_sizes
+        mean = sum(sizes) / len(sizes) if sizes else 0
+        lines += _gauge("northwind_sessions", "Sessions with state in this worker.", [({}, sessions)])
+        lines += _gauge("northwind_session_state_bytes", "Serialized session state size, from a sample of sessions.", [
+            ({"stat": "total"}, mean * sessions),
+            ({"stat": "max"}, max(sizes, default=0)),
+            ({"stat": "mean"}, mean),
+        ])
+    return "\n".join(lines) + "\n"
+
+
+def create_metrics_app(get_app: Callable[[], Any] | None = None) -> Starlette:
+    """ASGI app serving ``/metrics``; pass it to ``rx.App(api_transformer=...)``."""
+
+    async def metrics(request: Request) -> PlainTextResponse:
+        state_sizes = None
+        if get_app is not None and STATE_SIZE_INTERVAL >= 0:
+            state_sizes = await _state_sizes.get(get_app())
+        return PlainTextResponse(render(state_sizes), media_type=CONTENT_TYPE)
+
+    return Starlette(routes=[Route("/metrics", metrics)])
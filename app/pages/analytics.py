@@ -276,6 +276,7 @@ def top_customers_clv_section() -> rx.Component:
                     rx.el.th("Company", class_name="text-left py-2 text-sm font-medium text-gray-600"),
                     rx.el.th("Orders", class_name="text-center py-2 text-sm font-medium text-gray-600"),
                     rx.el.th("Revenue", class_name="text-right py-2 text-sm font-medium text-gray-600"),
+                    rx.el.th("RFM", class_name="text-center py-2 text-sm font-medium text-gray-600"),
                     rx.el.th("CLV", class_name="text-right py-2 text-sm font-medium text-gray-600"),
                 )
             ),
@@ -286,6 +287,7 @@ def top_customers_clv_section() -> rx.Component:
                         rx.el.td(customer["company_name"], class_name="py-2 text-sm font-medium"),
                         rx.el.td(str(f"{customer['order_count']}"), class_name="py-2 text-sm text-center"),
                         rx.el.td(f"${customer['total_revenue']:,.2f}", class_name="py-2 text-sm text-right"),
+                        rx.el.td(customer["rfm"], class_name="py-2 text-sm text-center font-mono"),
                         rx.el.td(f"${customer['clv']:,.2f}", class_name="py-2 text-sm text-right font-medium text-green-600"),
                         class_name="border-b hover:bg-gray-50"
                     ),
@@ -83,7 +83,7 @@ def filters_and_controls() -> rx.Component:
                 ),
                 rx.el.input(
                     placeholder="Search customers...",
-                    on_change=CustomersState.set_search_query,
+                    on_change=CustomersState.set_search_query.debounce(300),
                     class_name="w-full max-w-sm pl-10 pr-4 py-2 border rounded-lg bg-white shadow-sm",
                 ),
                 class_name="relative",
@@ -135,7 +135,7 @@ def filters_and_controls() -> rx.Component:
 def customers_display() -> rx.Component:
     return rx.el.div(
         rx.foreach(
-            CustomersState.paginated_customers,
+            CustomersState.customers,
             customer_card,
         ),
         class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-4",
@@ -80,7 +80,7 @@ def filters() -> rx.Component:
                 class_name="absolute left-3 top-1/2 -translate-y-1/2 h-5 w-5 text-gray-500",
             ),
             rx.el.input(
-                placeholder="Search by Order ID, Customer...",
+                placeholder="Search by order ID, customer, employee, city...",
                 on_change=OrdersState.set_search_query.debounce(300),
                 class_name="w-full max-w-sm pl-10 pr-4 py-2 border rounded-lg bg-white shadow-sm",
             ),
@@ -173,6 +173,13 @@ def pagination_controls() -> rx.Component:
             class_name="text-sm text-gray-700",
         ),
         rx.el.div(
+            rx.el.input(
+                type="number",
+                min=1,
+                placeholder="Go to page",
+                on_blur=OrdersState.go_to_page,
+                class_name="w-28 me-3 px-3 py-2 text-sm border border-gray-300 rounded-lg bg-white",
+            ),
             rx.el.button(
                 "Previous",
                 on_click=OrdersState.prev_page,
@@ -82,7 +82,7 @@ def filters_and_controls() -> rx.Component:
                 ),
                 rx.el.input(
                     placeholder="Search products...",
-                    on_change=ProductsState.set_search_query,
+                    on_change=ProductsState.set_search_query.debounce(300),
                     class_name="w-full max-w-sm pl-10 pr-4 py-2 border rounded-lg bg-white shadow-sm",
                 ),
                 class_name="relative",
@@ -156,7 +156,7 @@ def products_display() -> rx.Component:
 def products_grid() -> rx.Component:
     return rx.el.div(
         rx.foreach(
-            ProductsState.paginated_products,
+            ProductsState.products,
             product_card,
         ),
         class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-4",
@@ -220,7 +220,7 @@ def products_list() -> rx.Component:
                     )
                 ),
                 rx.el.tbody(
-                    rx.foreach(ProductsState.paginated_products, product_row)
+                    rx.foreach(ProductsState.products, product_row)
                 ),
                 class_name="w-full text-sm text-left text-gray-500",
             ),
@@ -0,0 +1,83 @@
+"""Sales aggregates of the /analytics page, read from the running ``SalesSeries``.
+
+``app.db.columnar`` keeps per month, category and employee totals current as
+orders are added, so the page turns a few hundred array entries into rows
+instead of aggregating the order history.
+"""
+import sqlite3
+from typing import TypedDict
+
+import numpy as np
+
+from app.db.columnar import MONTH_ORIGIN, FactStore, current_fact_store
+
+
+class SalesAnalytics(TypedDict):
+    # (YYYY-MM, revenue, orders), by month
+    monthly: list[tuple[str, float, int]]
+    # (category, revenue, lines), by revenue descending
+    categories: list[tuple[str, float, int]]
+    # (employee, revenue, orders), by revenue descending
+    employees: list[tuple[str, float, int]]
+    # (year, quarter, revenue), by quarter
+    quarters: list[tuple[str, str, float]]
+
+
+def _padded(values: np.ndarray, size: int) -> np.ndarray:
+    return np.pad(values, (0, max(0, size - len(values))))
+
+
+def _ranked(names: list[str], revenue: np.ndarray, lines: np.ndarray, counts: np.ndarray) -> list:
+    size = len(names)
+    revenue, lines, counts = (_padded(values, size) for values in (revenue, lines, counts))
+    codes = np.flatnonzero(lines[:size])
+    codes = codes[np.argsort(-revenue[codes], kind="stable")]
+    return [(names[code], float(revenue[code]), int(counts[code])) for code in codes]
+
+
+def monthly_revenue(store: FactStore) -> list[tuple[str, float, int]]:
+    series = store.series
+    months = np.flatnonzero(series.month_lines)
+    orders = _padded(series.month_orders, len(series.month_lines))
+    labels = np.datetime_as_string(MONTH_ORIGIN + months, unit="M")
+    return [
+        (str(label), float(series.month_revenue[month]), int(orders[month]))
+        for label, month in zip(labels, months)
+    ]
+
+
+def category_revenue(store: FactStore) -> list[tuple[str, float, int]]:
+    series = store.series
+    return _ranked(
+        store.dimensions.category_names, series.category_revenue, series.category_lines, series.category_lines
+    )
+
+
+def employee_revenue(store: FactStore) -> list[tuple[str, float, int]]:
+    series = store.series
+    return _ranked(
+        store.dimensions.employee_names, series.employee_revenue, series.employee_lines, series.employee_orders
+    )
+
+
+def quarterly_revenue(store: FactStore) -> list[tuple[str, str, float]]:
+    series = store.series
+    # MONTH_ORIGIN is a January, so quarter q covers months 3q .. 3q + 2.
+    quarter_of_month = np.arange(len(series.month_lines)) // 3
+    lines = np.bincount(quarter_of_month, weights=series.month_lines)
+    revenue = np.bincount(quarter_of_month, weights=series.month_revenue)
+    origin_year = MONTH_ORIGIN.astype("datetime64[Y]").astype(int) + 1970
+    return [
+        (str(origin_year + quarter // 4), f"Q{quarter % 4 + 1}", float(revenue[quarter]))
+        for quarter in np.flatnonzero(lines).tolist()
+    ]
+
+
+def sales_analytics(conn: sqlite3.Connection) -> SalesAnalytics:
+    store = current_fact_store(conn)
+    return {
+        "monthly": monthly_revenue(store),
+        "categories": category_revenue(store),
+        "employees": employee_revenue(store),
+        "quarters": quarterly_revenue(store),
+    }
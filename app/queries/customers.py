@@ -0,0 +1,121 @@
+"""Filtered, sorted and paged reads of the /customers directory.
+
+Each row joins ``Customers`` with its ``CustomerRollup`` row, so order count,
+revenue and last order are read rather than aggregated; the segment follows
+from them and the VIP cutoff of ``app.queries.segments``. Search goes through
+the ``CustomerSearch`` trigram index, the country / city filters and name sorts
+through the ``Customers`` indexes, and the rollup sorts and the segment filter
+through the ``CustomerRollup`` indexes.
+"""
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, TypedDict
+
+from app.db.query import fetch_all, fetch_value
+from app.db.search import customer_search_clause
+
+# Same rule as ``app.queries.segments``; the parameter is the VIP cutoff.
+SEGMENT = "CASE WHEN r.Orders = 0 THEN 'New' WHEN r.Revenue >= ? THEN 'VIP' ELSE 'Regular' END"
+SEGMENT_FILTERS = {
+    "New": "r.Orders = 0",
+    "VIP": "r.Orders > 0 AND r.Revenue >= ?",
+    "Regular": "r.Orders > 0 AND r.Revenue < ?",
+}
+
+# Sort key of the /customers page -> SQL column.
+SORT_COLUMNS = {
+    "customer_id": "c.CustomerID",
+    "company_name": "c.CompanyName",
+    "contact_name": "c.ContactName",
+    "city": "c.City",
+    "country": "c.Country",
+    "total_orders": "r.Orders",
+    "total_revenue": "r.Revenue",
+    "last_order_date": "r.LastOrder",
+}
+
+SELECT_PAGE = f"""
+    SELECT c.CustomerID AS customer_id, c.CompanyName AS company_name,
+           c.ContactName AS contact_name, c.City AS city, c.Country AS country,
+           r.Orders AS total_orders, r.Revenue AS total_revenue,
+           r.LastOrder AS last_order_date, {SEGMENT} AS customer_segment
+    FROM Customers c
+    JOIN CustomerRollup r ON r.CustomerID = c.CustomerID
+"""
+
+
+class CustomerPage(TypedDict):
+    rows: list[sqlite3.Row]
+    total: int
+    page: int
+
+
+@dataclass(frozen=True)
+class CustomerQuery:
+    search: str
+    country: str
+    city: str
+    segment: str
+    sort_by: str
+    descending: bool
+    page_size: int
+    vip_revenue: float
+
+    def where(self) -> tuple[list[str], list[Any]]:
+        clauses, params = [], []
+        if self.search:
+            clause, search_params = customer_search_clause(self.search, "c.rowid")
+            clauses.append(clause)
+            params += search_params
+        if self.country != "All":
+            clauses.append("c.Country = ?")
+            params.append(self.country)
+        if self.city != "All":
+            clauses.append("c.City = ?")
+            params.append(self.city)
+        if self.segment in SEGMENT_FILTERS:
+            clause = SEGMENT_FILTERS[self.segment]
+            clauses.append(clause)
+            params += [self.vip_revenue] * clause.count("?")
+        return clauses, params
+
+    def order_by(self) -> tuple[str, list[Any]]:
+        direction = "DESC" if self.descending else "ASC"
+        if self.sort_by == "customer_segment":
+            return f"{SEGMENT} {direction}, c.CustomerID {direction}", [self.vip_revenue]
+        column = SORT_COLUMNS.get(self.sort_by, SORT_COLUMNS["company_name"])
+        return f"{column} {direction}, c.CustomerID {direction}", []
+
+
+def _where_sql(clauses: list[str]) -> str:
+    return " WHERE " + " AND ".join(clauses) if clauses else ""
+
+
+async def count_customers(query: CustomerQuery) -> int:
+    clauses, params = query.where()
+    # Every customer has exactly one rollup row: join only when both sides filter.
+    if query.segment not in SEGMENT_FILTERS:
+        source = "Customers c"
+    elif not query.search and query.country == "All" and query.city == "All":
+        source = "CustomerRollup r"
+    else:
+        source = "Customers c JOIN CustomerRollup r ON r.CustomerID = c.CustomerID"
+    return await fetch_value(
+        f"SELECT COUNT(*) FROM {source} {_where_sql(clauses)}", params, default=0,
+        label="customers.count_filtered",
+    )
+
+
+async def fetch_customer_page(query: CustomerQuery, page: int) -> CustomerPage:
+    """Rows of ``page`` (1-based, clamped to the last page) and the filtered total."""
+    total = await count_customers(query)
+    page = min(max(1, page), max(1, -(-total // query.page_size)))
+    clauses, params = query.where()
+    order_by, order_params = query.order_by()
+    sql = SELECT_PAGE + _where_sql(clauses) + f" ORDER BY {order_by} LIMIT ? OFFSET ?"
+    rows = await fetch_all(
+        sql,
+        [query.vip_revenue, *params, *order_params, query.page_size, (page - 1) * query.page_size],
+        label="customers.page",
+    )
+    return {"rows": rows, "total": total, "page": page}
@@ -0,0 +1,188 @@
+"""Single-pass aggregation of every dashboard KPI and chart series.
+
+Instead of one query per widget, the date-range slice is read once from
+``DailySales`` (rolled up to month x product x customer x employee x
+country) and once from ``Orders`` (rolled up to customer x employee x
+shipped x has lines). The two scans and the dimension lookups are
+independent, so ``dashboard_group`` fans them out and ``build_snapshot``
+accumulates every KPI and series from their results.
+
+Both scans select by calendar day, ``date(OrderDate)`` (DailySales'
+``SaleDate``), so an order stamped with a time on the end date counts in
+revenue and in orders alike. Order totals count every order in the range;
+the per customer and per employee order counts only those with lines, as
+the joins with ``OrderDetails`` they replace did.
+"""
+import sqlite3
+from collections import defaultdict
+from typing import Any, TypedDict
+
+from app.db.query import QueryGroup
+
+
+class DashboardSnapshot(TypedDict):
+    total_revenue: float
+    total_orders: int
+    total_customers: int
+    total_products: int
+    shipped_count: int
+    monthly_sales: list[tuple[str, float]]
+    top_products: list[tuple[str, float]]
+    category_performance: list[tuple[str, float]]
+    top_customers: list[tuple[str, float, int]]
+    employee_performance: list[tuple[str, float, int]]
+    geo_sales: list[tuple[str | None, float]]
+
+
+def _ranked(totals: dict, limit: int | None = None) -> list:
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return ranked[:limit] if limit else ranked
+
+
+def load_dimensions(conn: sqlite3.Connection) -> dict[str, dict]:
+    return {
+        "products": {
+            row[0]: (row[1], row[2])
+            for row in conn.execute(
+                """
+                SELECT p.ProductID, p.ProductName, c.CategoryName
+                FROM Products p
+                LEFT JOIN Categories c ON p.CategoryID = c.CategoryID
+                """
+            )
+        },
+        "customers": dict(conn.execute("SELECT CustomerID, CompanyName FROM Customers")),
+        "employees": dict(
+            conn.execute("SELECT EmployeeID, FirstName || ' ' || LastName FROM Employees")
+        ),
+    }
+
+
+def scan_sales(conn: sqlite3.Connection, start: str, end: str) -> dict[str, Any]:
+    total_revenue = 0.0
+    by_month: dict[str, float] = defaultdict(float)
+    by_product: dict[int, float] = defaultdict(float)
+    by_customer: dict[str, float] = defaultdict(float)
+    by_employee: dict[int, float] = defaultdict(float)
+    by_country: dict[str | None, float] = defaultdict(float)
+    facts = conn.execute(
+        """
+        SELECT substr(SaleDate, 1, 7), ProductID, CustomerID, EmployeeID,
+               NULLIF(ShipCountry, ''), SUM(Revenue)
+        FROM DailySales
+        WHERE SaleDate BETWEEN ? AND ?
+        GROUP BY 1, 2, 3, 4, 5
+        """,
+        (start, end),
+    )
+    for month, product_id, customer_id, employee_id, country, revenue in facts:
+        total_revenue += revenue
+        by_month[month] += revenue
+        by_product[product_id] += revenue
+        by_customer[customer_id] += revenue
+        by_employee[employee_id] += revenue
+        by_country[country] += revenue
+    return {
+        "total_revenue": total_revenue,
+        "by_month": dict(by_month),
+        "by_product": dict(by_product),
+        "by_customer": dict(by_customer),
+        "by_employee": dict(by_employee),
+        "by_country": dict(by_country),
+    }
+
+
+def scan_orders(conn: sqlite3.Connection, start: str, end: str) -> dict[str, Any]:
+    total_orders = 0
+    shipped_count = 0
+    customers: set[str] = set()
+    by_customer: dict[str, int] = defaultdict(int)
+    by_employee: dict[int, int] = defaultdict(int)
+    orders = conn.execute(
+        """
+        SELECT o.CustomerID, o.EmployeeID, o.ShippedDate IS NOT NULL,
+               EXISTS (SELECT 1 FROM OrderDetails od WHERE od.OrderID = o.OrderID),
+               COUNT(*)
+        FROM Orders o
+        -- date(OrderDate) BETWEEN start AND end, in a form idx_orders_orderdate can seek.
+        WHERE o.OrderDate >= ? AND o.OrderDate < date(?, '+1 day')
+        GROUP BY 1, 2, 3, 4
+        """,
+        (start, end),
+    )
+    for customer_id, employee_id, shipped, has_lines, count in orders:
+        total_orders += count
+        if shipped:
+            shipped_count += count
+        if customer_id is not None:
+            customers.add(customer_id)
+        if not has_lines:
+            continue
+        if customer_id is not None:
+            by_customer[customer_id] += count
+        by_employee[employee_id] += count
+    return {
+        "total_orders": total_orders,
+        "shipped_count": shipped_count,
+        "total_customers": len(customers),
+        "by_customer": dict(by_customer),
+        "by_employee": dict(by_employee),
+    }
+
+
+def dashboard_group(start: str, end: str) -> QueryGroup:
+    return (
+        QueryGroup()
+        .run("dimensions", load_dimensions)
+        .run("sales", scan_sales, start, end)
+        .run("orders", scan_orders, start, end)
+    )
+
+
+def build_snapshot(results: dict[str, Any]) -> DashboardSnapshot:
+    dims, sales, orders = results["dimensions"], results["sales"], results["orders"]
+    products, customers, employees = dims["products"], dims["customers"], dims["employees"]
+
+    # Same semantics as the former inner joins: facts whose product, customer
+    # or employee no longer exists are left out of the per-entity rankings.
+    by_product: dict[str, float] = defaultdict(float)
+    by_category: dict[str, float] = defaultdict(float)
+    for product_id, revenue in sales["by_product"].items():
+        if product_id in products:
+            product_name, category_name = products[product_id]
+            by_product[product_name] += revenue
+            if category_name is not None:
+                by_category[category_name] += revenue
+    by_customer = {
+        customer_id: revenue
+        for customer_id, revenue in sales["by_customer"].items()
+        if customer_id in customers
+    }
+    by_employee: dict[str, float] = defaultdict(float)
+    orders_by_employee: dict[str, int] = defaultdict(int)
+    for employee_id, revenue in sales["by_employee"].items():
+        if employee_id in employees:
+            by_employee[employees[employee_id]] += revenue
+    for employee_id, count in orders["by_employee"].items():
+        if employee_id in employees:
+            orders_by_employee[employees[employee_id]] += count
+
+    return {
+        "total_revenue": sales["total_revenue"],
+        "total_orders": orders["total_orders"],
+        "total_customers": orders["total_customers"],
+        "total_products": len(products),
+        "shipped_count": orders["shipped_count"],
+        "monthly_sales": sorted(sales["by_month"].items()),
+        "top_products": _ranked(by_product, 5),
+        "category_performance": _ranked(by_category),
+        "top_customers": [
+            (customers[customer_id], revenue, orders["by_customer"].get(customer_id, 0))
+            for customer_id, revenue in _ranked(by_customer, 5)
+        ],
+        "employee_performance": [
+            (name, sales_total, orders_by_employee.get(name, 0))
+            for name, sales_total in _ranked(by_employee)
+        ],
+        "geo_sales": _ranked(sales["by_country"]),
+    }
@@ -0,0 +1,93 @@
+"""Process-wide headline metrics shared by every page.
+
+Total revenue, order / shipped / pending counts and customer and product
+counts over the whole history are shown by several pages. Each named metric
+is computed at most once per data version, by whichever session asks first,
+and served from memory to every other session and page until the next
+commit. Concurrent requests for the same metric wait for the first one
+instead of running the aggregate again. Date-filtered figures (the dashboard)
+are not metrics: they come with the scans that already read their range.
+"""
+import sqlite3
+import threading
+from typing import Any
+
+from app.db.cache import get_cache
+from app.db.query import run
+
+METRICS: dict[str, str] = {
+    "total_revenue": "SELECT SUM(LineTotal) FROM OrderDetails",
+    "total_orders": "SELECT SUM(Orders) FROM OrderCounts",
+    "shipped_orders": "SELECT Orders FROM OrderCounts WHERE Status = 'Shipped'",
+    "pending_orders": "SELECT Orders FROM OrderCounts WHERE Status = 'Pending'",
+    "total_customers": "SELECT COUNT(*) FROM Customers",
+    "total_products": "SELECT COUNT(*) FROM Products",
+    "countries_served": "SELECT COUNT(DISTINCT Country) FROM Customers",
+}
+
+
+class MetricsService:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._values: dict[str, Any] = {}
+        self._computing: dict[str, threading.Lock] = {}
+
+    def _compute(self, conn: sqlite3.Connection, sql: str) -> Any:
+        row = conn.execute(sql).fetchone()
+        return row[0] if row is not None and row[0] is not None else 0
+
+    def _sync(self, version: int) -> None:
+        # Caller holds the lock.
+        if version != self._version:
+            self._version, self._values, self._computing = version, {}, {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version, self._values, self._computing = None, {}, {}
+
+    def cached(self, names: tuple[str, ...]) -> dict[str, Any] | None:
+        """Every value of ``names`` for the current data version, or None if one is missing."""
+        version = get_cache().data_version()
+        with self._lock:
+            self._sync(version)
+            if all(name in self._values for name in names):
+                return {name: self._values[name] for name in names}
+        return None
+
+    def get(self, conn: sqlite3.Connection, name: str) -> Any:
+        sql = METRICS[name]
+        version = get_cache().data_version()
+        with self._lock:
+            self._sync(version)
+            if name in self._values:
+                return self._values[name]
+            computing = self._computing.setdefault(name, threading.Lock())
+        with computing:
+            with self._lock:
+                if self._version == version and name in self._values:
+                    return self._values[name]
+            value = self._compute(conn, sql)
+            with self._lock:
+                if self._version == version:
+                    self._values[name] = value
+            return value
+
+
+_service = MetricsService()
+
+
+def clear_metrics() -> None:
+    _service.clear()
+
+
+def metric_values(conn: sqlite3.Connection, names: tuple[str, ...]) -> dict[str, Any]:
+    """``names`` -> value."""
+    return {name: _service.get(conn, name) for name in names}
+
+
+async def get_metrics(*names: str) -> dict[str, Any]:
+    values = _service.cached(names)
+    if values is None:
+        values = await run(metric_values, names, label="metrics")
+    return values
@@ -0,0 +1,194 @@
+"""Keyset (seek) pagination over ``OrderSummary`` for the /orders table.
+
+A page is fetched with ``WHERE (sort_key, OrderID) < (?, ?) ORDER BY sort_key
+DESC, OrderID DESC LIMIT n`` (mirrored for ascending order), which walks the
+``(column, OrderID)`` index from the cursor instead of skipping ``OFFSET``
+rows, so page 5,000 costs about the same as page 1.
+
+Next / previous seek from the first or last row of the page on screen. Any
+other page is reached through a sparse page-boundary index: the sort key of
+every ``BOUNDARY_STRIDE``-th page boundary, computed once per data version and
+filter, from which at most ``BOUNDARY_STRIDE - 1`` pages are skipped.
+
+The total behind ``total_pages`` is only recounted when the filters or the
+data version change, so a next / previous click is a single query. Without a
+search term it comes from the trigger-maintained ``OrderCounts`` table; search
+terms are resolved through the ``OrderSearch`` trigram index.
+"""
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, TypedDict
+
+from app.db.cache import get_cache
+from app.db.query import fetch_all, fetch_value, run_cached
+from app.db.search import search_clause
+from app.db.summary import SORT_COLUMNS
+
+BOUNDARY_STRIDE = 16
+
+
+class PageCursor(TypedDict):
+    query: str
+    version: int
+    total: int
+    page: int
+    first: list
+    last: list
+
+
+class OrderPage(TypedDict):
+    rows: list[sqlite3.Row]
+    total: int
+    page: int
+    cursor: PageCursor
+
+
+@dataclass(frozen=True)
+class OrderQuery:
+    search: str
+    status: str
+    sort_by: str
+    descending: bool
+    page_size: int
+
+    @property
+    def column(self) -> str:
+        return SORT_COLUMNS.get(self.sort_by, "OrderID")
+
+    @property
+    def key(self) -> str:
+        return repr(self)
+
+    def where(self, per_row: bool = False) -> tuple[list[str], list[Any]]:
+        clauses, params = [], []
+        if self.search:
+            clause, search_params = search_clause(self.search, per_row=per_row)
+            clauses.append(clause)
+            params += search_params
+        if self.status in ("Shipped", "Pending"):
+            clauses.append("Status = ?")
+            params.append(self.status)
+        return clauses, params
+
+    def order_by(self, reverse: bool = False) -> str:
+        direction = "DESC" if self.descending != reverse else "ASC"
+        if self.column == "OrderID":
+            return f"OrderID {direction}"
+        return f"{self.column} {direction}, OrderID {direction}"
+
+    def seek(self, cursor: list, after: bool, inclusive: bool = False) -> tuple[str, list[Any]]:
+        """Condition for rows after (or before) ``cursor`` in display order."""
+        op = ("<" if self.descending == after else ">") + ("=" if inclusive else "")
+        if self.column == "OrderID":
+            return f"OrderID {op} ?", [cursor[1]]
+        return f"({self.column}, OrderID) {op} (?, ?)", list(cursor)
+
+
+SELECT_PAGE = """
+    SELECT {column} AS sort_key, OrderID AS order_id, CustomerName AS customer_name,
+           EmployeeName AS employee_name, OrderDate AS order_date,
+           NULLIF(ShippedDate, '') AS shipped_date, Status AS status,
+           TotalRevenue AS total_revenue
+    FROM OrderSummary
+"""
+
+
+def _where_sql(clauses: list[str]) -> str:
+    return " WHERE " + " AND ".join(clauses) if clauses else ""
+
+
+def page_boundaries(conn: sqlite3.Connection, query: OrderQuery) -> list[tuple[Any, int]]:
+    """(sort_key, OrderID) of the last row before pages 1 + k * BOUNDARY_STRIDE, k >= 1."""
+    clauses, params = query.where()
+    step = BOUNDARY_STRIDE * query.page_size
+    sql = f"""
+        SELECT sort_key, OrderID FROM (
+            SELECT {query.column} AS sort_key, OrderID,
+                   ROW_NUMBER() OVER (ORDER BY {query.order_by()}) AS rn
+            FROM OrderSummary {_where_sql(clauses)}
+        )
+        WHERE rn % ? = 0
+        ORDER BY rn
+    """
+    return [tuple(row) for row in conn.execute(sql, [*params, step])]
+
+
+async def count_orders(query: OrderQuery) -> int:
+    if not query.search:
+        if query.status in ("Shipped", "Pending"):
+            return await fetch_value(
+                "SELECT Orders FROM OrderCounts WHERE Status = ?", (query.status,), default=0,
+                label="orders.count",
+            )
+        return await fetch_value(
+            "SELECT SUM(Orders) FROM OrderCounts", default=0, label="orders.count"
+        )
+    clauses, params = query.where()
+    return await fetch_value(
+        f"SELECT COUNT(*) FROM OrderSummary {_where_sql(clauses)}", params, default=0,
+        label="orders.count",
+    )
+
+
+async def _fetch(
+    query: OrderQuery,
+    seek: tuple[str, list[Any]] | None = None,
+    offset: int = 0,
+    reverse: bool = False,
+) -> list[sqlite3.Row]:
+    clauses, params = query.where(per_row=True)
+    if seek is not None:
+        clauses = [*clauses, seek[0]]
+        params = [*params, *seek[1]]
+    sql = (
+        SELECT_PAGE.format(column=query.column)
+        + _where_sql(clauses)
+        + f" ORDER BY {query.order_by(reverse)} LIMIT ? OFFSET ?"
+    )
+    rows = await fetch_all(sql, [*params, query.page_size, offset], label="orders.page")
+    return rows[::-1] if reverse else rows
+
+
+async def fetch_order_page(
+    query: OrderQuery, page: int, cursor: PageCursor | None = None
+) -> OrderPage:
+    """Rows of ``page`` (1-based, clamped to the last page) and the cursor for the next call."""
+    version = get_cache().data_version()
+    same_query = bool(cursor) and cursor["query"] == query.key
+    if same_query and cursor["version"] == version:
+        total = cursor["total"]
+    else:
+        total = await count_orders(query)
+    page = min(max(1, page), max(1, -(-total // query.page_size)))
+
+    if same_query and cursor["first"]:
+        if page == cursor["page"] + 1:
+            rows = await _fetch(query, query.seek(cursor["last"], after=True))
+        elif page == cursor["page"] - 1:
+            rows = await _fetch(query, query.seek(cursor["first"], after=False), reverse=True)
+        elif page == cursor["page"]:
+            rows = await _fetch(query, query.seek(cursor["first"], after=True, inclusive=True))
+        else:
+            rows = await _jump(query, page)
+    else:
+        rows = await _jump(query, page)
+    new_cursor: PageCursor = {
+        "query": query.key,
+        "version": version,
+        "total": total,
+        "page": page,
+        "first": [rows[0]["sort_key"], rows[0]["order_id"]] if rows else [],
+        "last": [rows[-1]["sort_key"], rows[-1]["order_id"]] if rows else [],
+    }
+    return {"rows": rows, "total": total, "page": page, "cursor": new_cursor}
+
+
+async def _jump(query: OrderQuery, page: int) -> list[sqlite3.Row]:
+    block, within = divmod(page - 1, BOUNDARY_STRIDE)
+    offset = within * query.page_size
+    if block == 0:
+        return await _fetch(query, offset=offset)
+    boundaries = await run_cached(page_boundaries, query, label="orders.page_boundaries")
+    if block > len(boundaries):
+        return []
+    return await _fetch(query, query.seek(list(boundaries[block - 1]), after=True), offset=offset)
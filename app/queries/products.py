@@ -0,0 +1,88 @@
+"""Filtered, sorted and paged reads of the /products catalog.
+
+Search goes through the ``ProductSearch`` trigram index, the category filter
+and the column sorts through the indexes in ``app.db.catalog``, so a page is
+an index walk instead of loading, filtering and sorting the whole catalog in
+the session. Only the page and the filtered total reach the session.
+"""
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, TypedDict
+
+from app.db.catalog import INDEXED_SORTS, INVENTORY_STATUS, SORT_COLUMNS
+from app.db.query import fetch_all, fetch_value
+from app.db.search import product_search_clause
+
+SELECT_PAGE = f"""
+    SELECT p.ProductID AS product_id, p.ProductName AS product_name,
+           COALESCE(c.CategoryName, 'Uncategorized') AS category_name,
+           COALESCE(s.CompanyName, 'Unknown') AS supplier_name,
+           COALESCE(p.UnitPrice, 0) AS unit_price,
+           COALESCE(p.UnitsInStock, 0) AS units_in_stock,
+           {INVENTORY_STATUS} AS inventory_status
+    FROM Products p
+    LEFT JOIN Categories c ON c.CategoryID = p.CategoryID
+    LEFT JOIN Suppliers s ON s.SupplierID = p.SupplierID
+"""
+
+
+class ProductPage(TypedDict):
+    rows: list[sqlite3.Row]
+    total: int
+    page: int
+
+
+@dataclass(frozen=True)
+class ProductQuery:
+    search: str
+    category: str
+    sort_by: str
+    descending: bool
+    page_size: int
+
+    def where(self, per_row: bool = False) -> tuple[list[str], list[Any]]:
+        clauses, params = [], []
+        if self.search:
+            clause, search_params = product_search_clause(self.search, "p.ProductID", per_row)
+            clauses.append(clause)
+            params += search_params
+        if self.category != "All":
+            if self.category == "Uncategorized":
+                clauses.append(
+                    "NOT EXISTS (SELECT 1 FROM Categories WHERE CategoryID = p.CategoryID)"
+                )
+            else:
+                clauses.append("p.CategoryID IN (SELECT CategoryID FROM Categories WHERE CategoryName = ?)")
+                params.append(self.category)
+        return clauses, params
+
+    def order_by(self) -> str:
+        direction = "DESC" if self.descending else "ASC"
+        column = SORT_COLUMNS.get(self.sort_by, SORT_COLUMNS["product_name"])
+        return f"{column} {direction}, p.ProductID {direction}"
+
+
+def _where_sql(clauses: list[str]) -> str:
+    return " WHERE " + " AND ".join(clauses) if clauses else ""
+
+
+async def count_products(query: ProductQuery) -> int:
+    clauses, params = query.where()
+    return await fetch_value(
+        f"SELECT COUNT(*) FROM Products p {_where_sql(clauses)}", params, default=0,
+        label="products.count_filtered",
+    )
+
+
+async def fetch_product_page(query: ProductQuery, page: int) -> ProductPage:
+    """Rows of ``page`` (1-based, clamped to the last page) and the filtered total."""
+    total = await count_products(query)
+    page = min(max(1, page), max(1, -(-total // query.page_size)))
+    # Short search terms are checked row by row only while walking a sort
+    # index; with a temp b-tree sort every row is visited anyway.
+    clauses, params = query.where(per_row=query.sort_by in INDEXED_SORTS)
+    sql = SELECT_PAGE + _where_sql(clauses) + f" ORDER BY {query.order_by()} LIMIT ? OFFSET ?"
+    rows = await fetch_all(
+        sql, [*params, query.page_size, (page - 1) * query.page_size], label="products.page"
+    )
+    return {"rows": rows, "total": total, "page": page}
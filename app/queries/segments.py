@@ -0,0 +1,157 @@
+"""Customer segmentation shared by the /customers and /analytics pages.
+
+Every customer is scored at once from ``CustomerRollup`` with NumPy:
+
+* recency, frequency and monetary scores from 1 to 5, by quintile among the
+  customers with orders (0 for customers without);
+* the segment: ``New`` without orders, ``VIP`` in the top ``VIP_SHARE`` by
+  revenue (monetary score 5), ``Regular`` otherwise;
+* CLV: average order value x orders per year x ``CLV_YEARS``.
+
+Scores are computed once per data version and shared by every session of the
+worker. The VIP cutoff is a revenue, so the /customers page can filter and sort on the
+segment in SQL over the ``CustomerRollup`` indexes and still agree with these
+scores.
+"""
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import TypedDict
+
+import numpy as np
+
+from app.db.cache import get_cache
+from app.db.query import run
+
+SCORE_BINS = 5
+VIP_SHARE = 1 / SCORE_BINS
+CLV_YEARS = 3
+SEGMENTS = ("VIP", "Regular", "New")
+VIP, REGULAR, NEW = range(len(SEGMENTS))
+
+SCORES_SQL = """
+    SELECT r.CustomerID, c.CompanyName, r.Orders, r.Revenue,
+           julianday(substr(r.FirstOrder, 1, 10)), julianday(substr(r.LastOrder, 1, 10))
+    FROM CustomerRollup r
+    JOIN Customers c ON c.CustomerID = r.CustomerID
+    ORDER BY r.CustomerID
+"""
+
+
+class SegmentSummary(TypedDict):
+    segment: str
+    count: int
+    avg_revenue: float
+    total_revenue: float
+
+
+@dataclass(frozen=True)
+class CustomerScores:
+    """One entry per customer, in CustomerID order."""
+
+    customer_id: list[str]
+    company_name: list[str]
+    orders: np.ndarray  # int64
+    revenue: np.ndarray  # float64
+    recency_days: np.ndarray  # float64, days since the last order; NaN without orders
+    recency: np.ndarray  # int8 scores, 0 without orders
+    frequency: np.ndarray
+    monetary: np.ndarray
+    segment: np.ndarray  # int8 index into SEGMENTS
+    clv: np.ndarray  # float64
+    vip_revenue: float  # lowest revenue of a VIP customer
+
+    def rfm(self, index: int) -> str:
+        return f"{self.recency[index]}{self.frequency[index]}{self.monetary[index]}"
+
+    def segment_summary(self) -> list[SegmentSummary]:
+        counts = np.bincount(self.segment, minlength=len(SEGMENTS))
+        totals = np.bincount(self.segment, weights=self.revenue, minlength=len(SEGMENTS))
+        return [
+            {
+                "segment": name,
+                "count": int(counts[code]),
+                "avg_revenue": float(totals[code] / counts[code]) if counts[code] else 0.0,
+                "total_revenue": float(totals[code]),
+            }
+            for code, name in enumerate(SEGMENTS)
+        ]
+
+    def top(self, k: int, by: str = "clv") -> np.ndarray:
+        """Indices of the ``k`` highest customers by ``by``, highest first."""
+        values = getattr(self, by)
+        k = min(k, len(values))
+        if not k:
+            return np.zeros(0, dtype=np.int64)
+        top = np.argpartition(-values, k - 1)[:k]
+        return top[np.argsort(-values[top], kind="stable")]
+
+
+def _scores(values: np.ndarray, active: np.ndarray) -> np.ndarray:
+    """Quintile of each active value (1-5, higher value -> higher score); 0 elsewhere."""
+    scores = np.zeros(len(values), dtype=np.int8)
+    if active.any():
+        edges = np.quantile(values[active], np.linspace(0, 1, SCORE_BINS + 1)[1:-1])
+        scores[active] = 1 + np.searchsorted(edges, values[active], side="right")
+    return scores
+
+
+def load_customer_scores(conn: sqlite3.Connection) -> CustomerScores:
+    rows = conn.execute(SCORES_SQL).fetchall()
+    customer_id, company_name, orders, revenue, first, last = zip(*rows) if rows else ((),) * 6
+    orders = np.array(orders, dtype=np.int64)
+    revenue = np.nan_to_num(np.array(revenue, dtype=np.float64))
+    first = np.array(first, dtype=np.float64)
+    last = np.array(last, dtype=np.float64)
+
+    active = orders > 0
+    # Recency is measured from the latest order in the data, not from today.
+    latest = np.nanmax(last) if (active & ~np.isnan(last)).any() else 0.0
+    recency_days = np.where(active, latest - last, np.nan)
+
+    monetary = _scores(revenue, active)
+    segment = np.full(len(orders), REGULAR, dtype=np.int8)
+    segment[~active] = NEW
+    segment[monetary == SCORE_BINS] = VIP
+
+    # (revenue / orders) x (orders / tenure); at least a year of tenure, so
+    # one recent order is not extrapolated.
+    tenure_years = np.maximum(np.nan_to_num((latest - first) / 365.25), 1.0)
+    clv = revenue / tenure_years * CLV_YEARS
+
+    return CustomerScores(
+        customer_id=list(customer_id),
+        company_name=list(company_name),
+        orders=orders,
+        revenue=revenue,
+        recency_days=recency_days,
+        recency=_scores(np.nan_to_num(last), active),
+        frequency=_scores(orders.astype(np.float64), active),
+        monetary=monetary,
+        segment=segment,
+        clv=clv,
+        vip_revenue=float(revenue[segment == VIP].min()) if (segment == VIP).any() else float("inf"),
+    )
+
+
+_scores_cache: tuple[int, CustomerScores] | None = None
+_lock = threading.Lock()
+
+
+def current_customer_scores(conn: sqlite3.Connection) -> CustomerScores:
+    global _scores_cache
+    version = get_cache().data_version()
+    with _lock:
+        if _scores_cache is None or _scores_cache[0] != version:
+            _scores_cache = (version, load_customer_scores(conn))
+        return _scores_cache[1]
+
+
+def clear_customer_scores() -> None:
+    global _scores_cache
+    with _lock:
+        _scores_cache = None
+
+
+async def fetch_customer_scores() -> CustomerScores:
+    return await run(current_customer_scores, label="customers.scores")
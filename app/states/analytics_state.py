@@ -1,10 +1,12 @@
 import reflex as rx
-import sqlite3
-import pandas as pd
 from typing import TypedDict
 from datetime import datetime, timedelta
 
-DB_PATH = "northwind.db"
+from app.db.instrument import timed_handler
+from app.db.query import QueryGroup
+from app.queries.analytics import sales_analytics
+from app.queries.metrics import metric_values
+from app.queries.segments import current_customer_scores
 
 
 class RevenueTrend(TypedDict):
@@ -70,102 +72,36 @@ class AnalyticsState(rx.State):
     loading: bool = False
 
     @rx.event(background=True)
+    @timed_handler
     async def fetch_analytics_data(self):
         async with self:
             self.loading = True
         
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # 1. Revenue trends with YoY comparison
-        cursor.execute("""
-            SELECT 
-                strftime('%Y-%m', OrderDate) as month,
-                SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as revenue,
-                COUNT(DISTINCT o.OrderID) as order_count
-            FROM Orders o
-            JOIN OrderDetails od ON o.OrderID = od.OrderID
-            GROUP BY month
-            ORDER BY month
-        """)
-        revenue_data = cursor.fetchall()
-        
-        # 2. Category profitability with margin calculations
-        cursor.execute("""
-            SELECT 
-                c.CategoryName,
-                SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as revenue,
-                COUNT(od.Quantity) as total_units
-            FROM Categories c
-            JOIN Products p ON c.CategoryID = p.CategoryID
-            JOIN OrderDetails od ON p.ProductID = od.ProductID
-            GROUP BY c.CategoryName
-            ORDER BY revenue DESC
-        """)
-        category_data = cursor.fetchall()
-        
-        # 3. Customer segments and CLV
-        cursor.execute("""
-            SELECT 
-                c.CustomerID,
-                c.CompanyName,
-                COUNT(DISTINCT o.OrderID) as order_count,
-                SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as total_revenue,
-                MIN(o.OrderDate) as first_order,
-                MAX(o.OrderDate) as last_order
-            FROM Customers c
-            LEFT JOIN Orders o ON c.CustomerID = o.CustomerID
-            LEFT JOIN OrderDetails od ON o.OrderID = od.OrderID
-            GROUP BY c.CustomerID
-        """)
-        customer_data = cursor.fetchall()
-        
-        # 4. Employee performance
-        cursor.execute("""
-            SELECT 
-                e.FirstName || ' ' || e.LastName as employee_name,
-                COUNT(DISTINCT o.OrderID) as order_count,
-                SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as total_sales
-            FROM Employees e
-            JOIN Orders o ON e.EmployeeID = o.EmployeeID
-            JOIN OrderDetails od ON o.OrderID = od.OrderID
-            GROUP BY e.EmployeeID
-            ORDER BY total_sales DESC
-        """)
-        employee_data = cursor.fetchall()
-        
-        # 5. Seasonal patterns
-        cursor.execute("""
-            SELECT 
-                strftime('%Y', OrderDate) as year,
-                CASE 
-                    WHEN CAST(strftime('%m', OrderDate) AS INTEGER) IN (1,2,3) THEN 'Q1'
-                    WHEN CAST(strftime('%m', OrderDate) AS INTEGER) IN (4,5,6) THEN 'Q2'
-                    WHEN CAST(strftime('%m', OrderDate) AS INTEGER) IN (7,8,9) THEN 'Q3'
-                    ELSE 'Q4'
-                END as quarter,
-                SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as revenue
-            FROM Orders o
-            JOIN OrderDetails od ON o.OrderID = od.OrderID
-            GROUP BY year, quarter
-            ORDER BY year, quarter
-        """)
-        seasonal_data = cursor.fetchall()
-        
-        # 6. Key metrics
-        cursor.execute("SELECT COUNT(*) FROM Orders")
-        total_orders = cursor.fetchone()[0]
-        
-        cursor.execute("""
-            SELECT SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) 
-            FROM OrderDetails od
-        """)
-        total_revenue = cursor.fetchone()[0] or 0
-        
+        # Independent queries, fanned out over separate connections
+        group = QueryGroup()
+
+        # 1, 2, 4 and 5: sales aggregates over the columnar fact store
+        group.run("sales", sales_analytics)
+
+        # 6. Key metrics, shared with the other pages
+        group.run("metrics", metric_values, ("total_revenue", "total_orders"))
+
+        # 3. Customer segments and CLV; kept per data version by app.queries.segments,
+        # outside the byte-bounded query cache
+        group.run("customers", current_customer_scores, cache=False)
+
+        results = await group.execute()
+        sales = results["sales"]
+        revenue_data = sales["monthly"]
+        category_data = sales["categories"]
+        scores = results["customers"]
+        employee_data = sales["employees"]
+        seasonal_data = sales["quarters"]
+        total_orders = results["metrics"]["total_orders"]
+        total_revenue = results["metrics"]["total_revenue"]
+
         avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
         
-        conn.close()
-        
         # Process data
         revenue_trends = [
             {
@@ -192,59 +128,21 @@ class AnalyticsState(rx.State):
             })
         
         # Customer segmentation
-        customer_segments = []
-        vip_customers = regular_customers = new_customers = 0
-        vip_revenue = regular_revenue = 0
-        
-        for row in customer_data:
-            orders = row[2] or 0
-            revenue = row[3] or 0
-            
-            if orders == 0:
-                new_customers += 1
-            elif revenue > 5000:
-                vip_customers += 1
-                vip_revenue += revenue
-            else:
-                regular_customers += 1
-                regular_revenue += revenue
-        
-        total_customers = len([row for row in customer_data if row[2] > 0])
-        
-        customer_segments = [
-            {
-                "segment": "VIP",
-                "count": vip_customers,
-                "avg_revenue": vip_revenue / vip_customers if vip_customers > 0 else 0,
-                "total_revenue": vip_revenue,
-            },
-            {
-                "segment": "Regular",
-                "count": regular_customers,
-                "avg_revenue": regular_revenue / regular_customers if regular_customers > 0 else 0,
-                "total_revenue": regular_revenue,
-            },
-            {
-                "segment": "New",
-                "count": len([row for row in customer_data if row[2] == 0]),
-                "avg_revenue": 0,
-                "total_revenue": 0,
-            }
-        ]
+        customer_segments = scores.segment_summary()
         
         # Employee performance with performance score
         employee_performance = []
-        max_sales = max((row[2] or 0 for row in employee_data), default=1)
+        max_sales = max((row[1] for row in employee_data), default=1)
         
         for row in employee_data:
-            sales = row[2] or 0
-            orders = row[1] or 0
-            avg_order = sales / orders if orders > 0 else 0
-            performance_score = (sales / max_sales) * 100  # Performance score based on sales percentage
+            sales_total = row[1]
+            orders = row[2]
+            avg_order = sales_total / orders if orders > 0 else 0
+            performance_score = (sales_total / max_sales) * 100  # Performance score based on sales percentage
             
             employee_performance.append({
                 "employee_name": row[0],
-                "total_sales": sales,
+                "total_sales": sales_total,
                 "order_count": orders,
                 "avg_order_value": avg_order,
                 "performance_score": performance_score,
@@ -273,12 +171,13 @@ class AnalyticsState(rx.State):
         # Top customers by CLV
         top_customers_clv = [
             {
-                "company_name": row[1],
-                "order_count": row[2],
-                "total_revenue": row[3] or 0,
-                "clv": (row[3] or 0) / (row[2] or 1),  # Average revenue per order as proxy for CLV
+                "company_name": scores.company_name[index],
+                "order_count": int(scores.orders[index]),
+                "total_revenue": float(scores.revenue[index]),
+                "clv": float(scores.clv[index]),
+                "rfm": scores.rfm(index),
             }
-            for row in sorted(customer_data, key=lambda x: x[3] or 0, reverse=True)[:10]
+            for index in scores.top(10, by="clv")
         ]
         
         async with self:
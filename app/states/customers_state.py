@@ -1,9 +1,12 @@
 import reflex as rx
-import sqlite3
 from typing import TypedDict, Optional
 from datetime import datetime, timedelta
 
-DB_PATH = "northwind.db"
+from app.db.instrument import timed_handler
+from app.db.query import fetch_all, fetch_one
+from app.queries.customers import CustomerQuery, fetch_customer_page
+from app.queries.metrics import get_metrics
+from app.queries.segments import fetch_customer_scores
 
 
 class Customer(TypedDict):
@@ -36,6 +39,7 @@ class CustomerStats(TypedDict):
 
 
 class CustomersState(rx.State):
+    # Only the page on screen; filtering, sorting and paging run in SQL.
     customers: list[Customer] = []
     selected_customer: Customer | None = None
     customer_orders: list[CustomerOrder] = []
@@ -65,149 +69,81 @@ class CustomersState(rx.State):
     def total_pages(self) -> int:
         return -(-self.total_customers // self.items_per_page)
 
-    @rx.var
-    def filtered_customers(self) -> list[Customer]:
-        filtered = self.customers
-        if self.search_query:
-            query = self.search_query.lower()
-            filtered = [
-                c for c in filtered
-                if query in c["company_name"].lower()
-                or query in c["contact_name"].lower()
-                or query in c["city"].lower()
-                or query in c["country"].lower()
-            ]
-        if self.country_filter != "All":
-            filtered = [c for c in filtered if c["country"] == self.country_filter]
-        if self.city_filter != "All":
-            filtered = [c for c in filtered if c["city"] == self.city_filter]
-        if self.segment_filter != "All":
-            filtered = [c for c in filtered if c["customer_segment"] == self.segment_filter]
-        
-        reverse = self.sort_order == "desc"
-        filtered.sort(key=lambda x: x[self.sort_by], reverse=reverse)
-        
-        return filtered
-
     @rx.event(background=True)
+    @timed_handler
     async def fetch_customers(self):
         async with self:
             self.loading = True
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                c.CustomerID as customer_id,
-                c.CompanyName as company_name,
-                c.ContactName as contact_name,
-                c.City as city,
-                c.Country as country,
-                COUNT(DISTINCT o.OrderID) as total_orders,
-                COALESCE(SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)), 0) as total_revenue,
-                MAX(o.OrderDate) as last_order_date
-            FROM Customers c
-            LEFT JOIN Orders o ON c.CustomerID = o.CustomerID
-            LEFT JOIN OrderDetails od ON o.OrderID = od.OrderID
-            GROUP BY c.CustomerID
-            ORDER BY c.CompanyName
-        """)
-        
-        customers_raw = cursor.fetchall()
-        
-        # Get unique countries and cities
-        cursor.execute("SELECT DISTINCT Country FROM Customers ORDER BY Country")
-        countries_raw = cursor.fetchall()
-        cursor.execute("SELECT DISTINCT City FROM Customers ORDER BY City")
-        cities_raw = cursor.fetchall()
-        
-        conn.close()
-        
+
+        # Get unique countries and cities once per session
+        if not self.countries:
+            countries_raw = await fetch_all("SELECT DISTINCT Country FROM Customers ORDER BY Country", label="customers.countries")
+            cities_raw = await fetch_all("SELECT DISTINCT City FROM Customers ORDER BY City", label="customers.cities")
+            countries = ["All"] + [country[0] for country in countries_raw]
+            cities = ["All"] + [city[0] for city in cities_raw]
+        else:
+            countries, cities = self.countries, self.cities
+
+        query = CustomerQuery(
+            search=self.search_query,
+            country=self.country_filter,
+            city=self.city_filter,
+            segment=self.segment_filter,
+            sort_by=self.sort_by,
+            descending=self.sort_order == "desc",
+            page_size=self.items_per_page,
+            vip_revenue=(await fetch_customer_scores()).vip_revenue,
+        )
+        result = await fetch_customer_page(query, self.current_page)
+
         customers = []
-        for row in customers_raw:
-            total_revenue = row["total_revenue"] or 0
-            total_orders = row["total_orders"] or 0
-            
-            # Customer segmentation logic
-            if total_orders == 0:
-                segment = "New"
-            elif total_revenue > 5000:
-                segment = "VIP"
-            else:
-                segment = "Regular"
-            
+        for row in result["rows"]:
             last_order = row["last_order_date"]
             if last_order:
                 last_order_date = datetime.strptime(last_order.split(" ")[0], "%Y-%m-%d").strftime("%b %d, %Y")
             else:
                 last_order_date = "Never"
-                
+
             customers.append({
                 "customer_id": row["customer_id"],
                 "company_name": row["company_name"],
                 "contact_name": row["contact_name"],
                 "city": row["city"],
                 "country": row["country"],
-                "total_orders": total_orders,
-                "total_revenue": total_revenue,
+                "total_orders": row["total_orders"],
+                "total_revenue": row["total_revenue"],
                 "last_order_date": last_order_date,
-                "customer_segment": segment,
+                "customer_segment": row["customer_segment"],
             })
-        
-        countries = ["All"] + [country[0] for country in countries_raw]
-        cities = ["All"] + [city[0] for city in cities_raw]
-        
+
         async with self:
             self.customers = customers
             self.countries = countries
             self.cities = cities
-            self.total_customers = len(customers)
+            self.total_customers = result["total"]
+            self.current_page = result["page"]
             self.loading = False
 
     @rx.event(background=True)
+    @timed_handler
     async def fetch_stats(self):
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Total customers
-        cursor.execute("SELECT COUNT(*) FROM Customers")
-        total_customers = cursor.fetchone()[0]
-        
-        # Total revenue
-        cursor.execute("""
-            SELECT SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) 
-            FROM OrderDetails od
-        """)
-        total_revenue = cursor.fetchone()[0] or 0
-        
+        # Shared with the other pages, computed once per data version
+        metrics = await get_metrics("total_customers", "total_revenue", "countries_served")
+        total_customers = metrics["total_customers"]
+        total_revenue = metrics["total_revenue"]
+
         # Average revenue per customer
         avg_revenue = total_revenue / total_customers if total_customers > 0 else 0
-        
-        # VIP customers (revenue > 5000)
-        cursor.execute("""
-            SELECT COUNT(DISTINCT c.CustomerID)
-            FROM Customers c
-            JOIN Orders o ON c.CustomerID = o.CustomerID
-            JOIN OrderDetails od ON o.OrderID = od.OrderID
-            GROUP BY c.CustomerID
-            HAVING SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) > 5000
-        """)
-        vip_customers = len(cursor.fetchall())
-        
-        # New customers (no orders)
-        cursor.execute("""
-            SELECT COUNT(*) FROM Customers c
-            LEFT JOIN Orders o ON c.CustomerID = o.CustomerID
-            WHERE o.OrderID IS NULL
-        """)
-        new_customers = cursor.fetchone()[0]
-        
-        # Countries served
-        cursor.execute("SELECT COUNT(DISTINCT Country) FROM Customers")
-        countries_served = cursor.fetchone()[0]
-        
-        conn.close()
+
+        # VIP and new (no orders) customers, from the shared segmentation
+        segments = {
+            summary["segment"]: summary["count"]
+            for summary in (await fetch_customer_scores()).segment_summary()
+        }
+        vip_customers = segments["VIP"]
+        new_customers = segments["New"]
+
+        countries_served = metrics["countries_served"]
         
         async with self:
             self.stats = {
@@ -220,18 +156,15 @@ class CustomersState(rx.State):
             }
 
     @rx.event(background=True)
+    @timed_handler
     async def get_customer_details(self, customer_id: str):
         async with self:
             self.selected_customer = None
             self.customer_orders = []
             self.is_modal_open = True
         
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
         # Get customer details
-        cursor.execute("""
+        customer_row = await fetch_one("""
             SELECT 
                 c.CustomerID as customer_id,
                 c.CompanyName as company_name,
@@ -240,26 +173,22 @@ class CustomersState(rx.State):
                 c.Country as country
             FROM Customers c
             WHERE c.CustomerID = ?
-        """, (customer_id,))
-        
-        customer_row = cursor.fetchone()
-        
+        """, (customer_id,), label="customers.detail")
+
         if customer_row:
             # Get customer orders
-            cursor.execute("""
+            orders_raw = await fetch_all("""
                 SELECT 
                     o.OrderID as order_id,
                     o.OrderDate as order_date,
                     o.ShippedDate as shipped_date,
-                    SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as total_amount
+                    SUM(od.LineTotal) as total_amount
                 FROM Orders o
                 JOIN OrderDetails od ON o.OrderID = od.OrderID
                 WHERE o.CustomerID = ?
                 GROUP BY o.OrderID
                 ORDER BY o.OrderDate DESC
-            """, (customer_id,))
-            
-            orders_raw = cursor.fetchall()
+            """, (customer_id,), label="customers.orders")
             
             customer_orders = []
             for order_row in orders_raw:
@@ -287,8 +216,6 @@ class CustomersState(rx.State):
                     "country": customer_row["country"],
                 }
                 self.customer_orders = customer_orders
-        
-        conn.close()
 
     @rx.event
     def close_modal(self, open: bool):
@@ -301,22 +228,26 @@ class CustomersState(rx.State):
     def set_search_query(self, query: str):
         self.search_query = query
         self.current_page = 1
+        return CustomersState.fetch_customers
 
     @rx.event
     def set_country_filter(self, country: str):
         self.country_filter = country
         self.city_filter = "All"  # Reset city filter when country changes
         self.current_page = 1
+        return CustomersState.fetch_customers
 
     @rx.event
     def set_city_filter(self, city: str):
         self.city_filter = city
         self.current_page = 1
+        return CustomersState.fetch_customers
 
     @rx.event
     def set_segment_filter(self, segment: str):
         self.segment_filter = segment
         self.current_page = 1
+        return CustomersState.fetch_customers
 
     @rx.event
     def set_sort(self, column: str):
@@ -325,19 +256,16 @@ class CustomersState(rx.State):
         else:
             self.sort_by = column
             self.sort_order = "asc"
+        return CustomersState.fetch_customers
 
     @rx.event
     def next_page(self):
         if self.current_page < self.total_pages:
             self.current_page += 1
+            return CustomersState.fetch_customers
 
     @rx.event
     def prev_page(self):
         if self.current_page > 1:
             self.current_page -= 1
-
-    @rx.var
-    def paginated_customers(self) -> list[Customer]:
-        start = (self.current_page - 1) * self.items_per_page
-        end = start + self.items_per_page
-        return self.filtered_customers[start:end]
\ No newline at end of file
+            return CustomersState.fetch_customers
@@ -1,14 +1,15 @@
 import reflex as rx
-import sqlite3
 from typing import TypedDict, Any
+# Not deferred: reflex.utils.serializers imports it with Reflex itself, and
+# the geo_sales_fig return type is resolved when the class is created.
 import plotly.graph_objects as go
 import os
 import random
 from datetime import datetime, timedelta
-import pandas as pd
-import plotly.express as px
 
-DB_PATH = "northwind.db"
+from app.components.figures import geo_sales_figure
+from app.db.instrument import timed_handler
+from app.queries.dashboard import build_snapshot, dashboard_group
 
 
 class KPI(TypedDict):
@@ -114,31 +115,9 @@ class DashboardState(rx.State):
     analytics_top_products: list[AnalyticsTopProduct] = []
     analytics_sales_by_country: list[AnalyticsSalesByCountry] = []
 
-    @rx.var
+    @rx.var(deps=["geo_sales"], auto_deps=False)
     def geo_sales_fig(self) -> go.Figure:
-        if not self.geo_sales:
-            fig = go.Figure()
-            fig.update_layout(
-                margin=dict(l=0, r=0, t=0, b=0),
-                geo=dict(bgcolor="rgba(0,0,0,0)"),
-                paper_bgcolor="rgba(0,0,0,0)",
-            )
-            return fig
-        df = pd.DataFrame(self.geo_sales)
-        fig = px.choropleth(
-            data_frame=df,
-            locations="country",
-            locationmode="country names",
-            color="sales",
-            hover_name="country",
-            color_continuous_scale=px.colors.sequential.Teal,
-            template="plotly_white",
-        ).update_layout(
-            margin=dict(l=0, r=0, t=0, b=0),
-            geo=dict(bgcolor="rgba(0,0,0,0)"),
-            paper_bgcolor="rgba(0,0,0,0)",
-        )
-        return fig
+        return geo_sales_figure(self.geo_sales)
 
     @rx.event
     def toggle_drawer(self):
@@ -153,125 +132,14 @@ class DashboardState(rx.State):
         self.date_filter_end = value
 
     @rx.event(background=True)
+    @timed_handler
     async def on_load(self):
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # KPIs y datos principales
-        cursor.execute(
-            "SELECT SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) FROM OrderDetails od JOIN Orders o ON od.OrderID = o.OrderID WHERE o.OrderDate BETWEEN ? AND ?",
-            (self.date_filter_start, self.date_filter_end),
-        )
-        total_revenue = cursor.fetchone()[0] or 0
-        
-        cursor.execute(
-            "SELECT COUNT(*) FROM Orders WHERE OrderDate BETWEEN ? AND ?",
-            (self.date_filter_start, self.date_filter_end),
-        )
-        total_orders = cursor.fetchone()[0]
-        
-        cursor.execute(
-            "SELECT COUNT(DISTINCT CustomerID) FROM Orders WHERE OrderDate BETWEEN ? AND ?",
-            (self.date_filter_start, self.date_filter_end),
-        )
-        total_customers = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM Products")
-        total_products = cursor.fetchone()[0]
-        
-        cursor.execute(
-            """
-            SELECT strftime('%Y-%m', o.OrderDate) as month, SUM(od.UnitPrice * od.Quantity * (1 - od.Discount))
-            FROM OrderDetails od JOIN Orders o ON od.OrderID = o.OrderID
-            WHERE o.OrderDate BETWEEN ? AND ?
-            GROUP BY month ORDER BY month
-        """,
-            (self.date_filter_start, self.date_filter_end),
-        )
-        sales_data_raw = cursor.fetchall()
-        
-        cursor.execute(
-            """
-            SELECT p.ProductName, SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as total_revenue
-            FROM OrderDetails od
-            JOIN Products p ON od.ProductID = p.ProductID
-            JOIN Orders o ON od.OrderID = o.OrderID
-            WHERE o.OrderDate BETWEEN ? AND ?
-            GROUP BY p.ProductName
-            ORDER BY total_revenue DESC
-            LIMIT 5
-        """,
-            (self.date_filter_start, self.date_filter_end),
-        )
-        top_products_raw = cursor.fetchall()
-        
-        cursor.execute(
-            """
-            SELECT c.CategoryName, SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as total_revenue
-            FROM OrderDetails od
-            JOIN Products p ON od.ProductID = p.ProductID
-            JOIN Categories c ON p.CategoryID = c.CategoryID
-            JOIN Orders o ON od.OrderID = o.OrderID
-            WHERE o.OrderDate BETWEEN ? AND ?
-            GROUP BY c.CategoryName
-            ORDER BY total_revenue DESC
-        """,
-            (self.date_filter_start, self.date_filter_end),
-        )
-        category_performance_raw = cursor.fetchall()
-        
-        cursor.execute(
-            """
-            SELECT c.CompanyName, SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as total_revenue, COUNT(DISTINCT o.OrderID) as total_orders
-            FROM Customers c
-            JOIN Orders o ON c.CustomerID = o.CustomerID
-            JOIN OrderDetails od ON o.OrderID = od.OrderID
-            WHERE o.OrderDate BETWEEN ? AND ?
-            GROUP BY c.CustomerID
-            ORDER BY total_revenue DESC
-            LIMIT 5
-            """,
-            (self.date_filter_start, self.date_filter_end),
-        )
-        top_customers_raw = cursor.fetchall()
-        
-        cursor.execute(
-            """
-            SELECT e.FirstName || ' ' || e.LastName as EmployeeName, 
-                   SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as total_sales, 
-                   COUNT(DISTINCT o.OrderID) as total_orders
-            FROM Employees e
-            JOIN Orders o ON e.EmployeeID = o.EmployeeID
-            JOIN OrderDetails od ON o.OrderID = od.OrderID
-            WHERE o.OrderDate BETWEEN ? AND ?
-            GROUP BY EmployeeName
-            ORDER BY total_sales DESC
-            """,
-            (self.date_filter_start, self.date_filter_end),
-        )
-        employee_performance_raw = cursor.fetchall()
-        
-        cursor.execute(
-            """
-            SELECT o.ShipCountry as country, SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as total_sales
-            FROM Orders o
-            JOIN OrderDetails od ON o.OrderID = od.OrderID
-            WHERE o.OrderDate BETWEEN ? AND ?
-            GROUP BY country
-            ORDER BY total_sales DESC
-            """,
-            (self.date_filter_start, self.date_filter_end),
-        )
-        geo_sales_raw = cursor.fetchall()
-        
-        shipped_count = cursor.execute(
-            "SELECT COUNT(*) FROM Orders WHERE ShippedDate IS NOT NULL AND OrderDate BETWEEN ? AND ?",
-            (self.date_filter_start, self.date_filter_end),
-        ).fetchone()[0]
-        pending_count = total_orders - shipped_count
-        
+        # KPIs y datos principales: una sola pasada sobre el rango de fechas,
+        # en paralelo con las consultas históricas de analytics
+        group = dashboard_group(self.date_filter_start, self.date_filter_end)
+
         # Analytics charts data (sin filtros de fecha para mostrar datos históricos)
-        cursor.execute("""
+        group.fetch_all("sales_over_time", """
             SELECT
                 strftime('%Y-%m', OrderDate) as month,
                 COUNT(OrderID) as order_count
@@ -279,34 +147,38 @@ class DashboardState(rx.State):
             GROUP BY month
             ORDER BY month;
         """)
-        sales_over_time_data = cursor.fetchall()
-        
-        cursor.execute("""
+
+        group.fetch_all("top_products_analytics", """
             SELECT 
                 p.ProductName as producto,
-                SUM(od.Quantity) as cantidad
+                SUM(f.Quantity) as cantidad
             FROM Products p
-            JOIN OrderDetails od ON p.ProductID = od.ProductID
+            JOIN DailySales f ON p.ProductID = f.ProductID
             GROUP BY p.ProductName
             ORDER BY cantidad DESC
             LIMIT 5
         """)
-        top_products_analytics_data = cursor.fetchall()
-        
-        cursor.execute("""
+
+        group.fetch_all("sales_by_country", """
             SELECT 
                 c.Country as pais,
-                SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as ventas
+                SUM(f.Revenue) as ventas
             FROM Customers c
-            JOIN Orders o ON c.CustomerID = o.CustomerID
-            JOIN OrderDetails od ON o.OrderID = od.OrderID
+            JOIN DailySales f ON c.CustomerID = f.CustomerID
             GROUP BY c.Country
             ORDER BY ventas DESC
             LIMIT 10
         """)
-        sales_by_country_data = cursor.fetchall()
-        
-        conn.close()
+
+        results = await group.execute()
+        snapshot = build_snapshot(results)
+        total_revenue = snapshot["total_revenue"]
+        total_orders = snapshot["total_orders"]
+        shipped_count = snapshot["shipped_count"]
+        pending_count = total_orders - shipped_count
+        sales_over_time_data = results["sales_over_time"]
+        top_products_analytics_data = results["top_products_analytics"]
+        sales_by_country_data = results["sales_by_country"]
         
         async with self:
             # Actualizar KPIs
@@ -325,13 +197,13 @@ class DashboardState(rx.State):
                 },
                 {
                     "title": "Total Customers",
-                    "value": str(total_customers),
+                    "value": str(snapshot["total_customers"]),
                     "icon": "users",
                     "color": "text-purple-500",
                 },
                 {
                     "title": "Total Products",
-                    "value": str(total_products),
+                    "value": str(snapshot["total_products"]),
                     "icon": "package",
                     "color": "text-orange-500",
                 },
@@ -343,30 +215,30 @@ class DashboardState(rx.State):
                     "month": datetime.strptime(row[0], "%Y-%m").strftime("%b"),
                     "sales": row[1],
                 }
-                for row in sales_data_raw
+                for row in snapshot["monthly_sales"]
             ]
             
             self.top_products = [
-                {"name": row[0], "revenue": row[1]} for row in top_products_raw
+                {"name": row[0], "revenue": row[1]} for row in snapshot["top_products"]
             ]
             
             self.category_performance = [
                 {"category": row[0], "revenue": row[1]}
-                for row in category_performance_raw
+                for row in snapshot["category_performance"]
             ]
             
             self.top_customers = [
                 {"name": row[0], "revenue": row[1], "orders": row[2]}
-                for row in top_customers_raw
+                for row in snapshot["top_customers"]
             ]
             
             self.employee_performance = [
                 {"name": row[0], "sales": row[1], "orders": row[2]}
-                for row in employee_performance_raw
+                for row in snapshot["employee_performance"]
             ]
             
             self.geo_sales = [
-                {"country": row[0], "sales": row[1]} for row in geo_sales_raw
+                {"country": row[0], "sales": row[1]} for row in snapshot["geo_sales"]
             ]
             
             self.order_statuses = [
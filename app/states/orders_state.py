@@ -1,9 +1,11 @@
 import reflex as rx
-import sqlite3
 from typing import TypedDict, Optional
 from datetime import datetime
 
-DB_PATH = "northwind.db"
+from app.db.instrument import timed_handler
+from app.db.query import fetch_all
+from app.queries.metrics import get_metrics
+from app.queries.orders import OrderQuery, fetch_order_page
 
 
 class Order(TypedDict):
@@ -51,6 +53,8 @@ class OrdersState(rx.State):
     items_per_page: int = 10
     total_orders: int = 0
     loading: bool = False
+    # Backend-only: first/last sort keys of the page on screen, for keyset paging.
+    _page_cursor: dict = {}
     stats: OrderStats = {
         "total_orders": 0,
         "average_order_value": 0.0,
@@ -71,57 +75,23 @@ class OrdersState(rx.State):
         return -(-self.total_orders // self.items_per_page)
 
     @rx.event(background=True)
+    @timed_handler
     async def fetch_orders(self):
         async with self:
             self.loading = True
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        base_query = """
-            SELECT 
-                o.OrderID as order_id, 
-                c.CompanyName as customer_name, 
-                (e.FirstName || ' ' || e.LastName) as employee_name,
-                o.OrderDate as order_date, 
-                o.ShippedDate as shipped_date, 
-                SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) as total_revenue
-            FROM Orders o
-            JOIN Customers c ON o.CustomerID = c.CustomerID
-            JOIN Employees e ON o.EmployeeID = e.EmployeeID
-            JOIN OrderDetails od ON o.OrderID = od.OrderID
-        """
-        count_query = """
-            SELECT COUNT(DISTINCT o.OrderID) FROM Orders o 
-            JOIN Customers c ON o.CustomerID = c.CustomerID
-            JOIN Employees e ON o.EmployeeID = e.EmployeeID
-        """
-        where_clauses = []
-        params = []
-        if self.search_query:
-            search_term = f"%{self.search_query}%"
-            where_clauses.append(
-                " (o.OrderID LIKE ? OR c.CompanyName LIKE ? OR (e.FirstName || ' ' || e.LastName) LIKE ?) "
-            )
-            params.extend([search_term, search_term, search_term])
-        if self.status_filter != "All":
-            if self.status_filter == "Shipped":
-                where_clauses.append(" o.ShippedDate IS NOT NULL ")
-            else:
-                where_clauses.append(" o.ShippedDate IS NULL ")
-        if where_clauses:
-            base_query += " WHERE " + " AND ".join(where_clauses)
-            count_query += " WHERE " + " AND ".join(where_clauses)
-        cursor.execute(count_query, params)
-        total_orders = cursor.fetchone()[0]
-        base_query += " GROUP BY o.OrderID "
-        base_query += f" ORDER BY {self.sort_by} {self.sort_order.upper()} "
-        offset = (self.current_page - 1) * self.items_per_page
-        base_query += f" LIMIT {self.items_per_page} OFFSET {offset} "
-        cursor.execute(base_query, params)
-        orders_raw = cursor.fetchall()
-        conn.close()
+        query = OrderQuery(
+            search=self.search_query,
+            status=self.status_filter,
+            sort_by=self.sort_by,
+            descending=self.sort_order == "desc",
+            page_size=self.items_per_page,
+        )
+        result = await fetch_order_page(query, self.current_page, self._page_cursor or None)
+        orders_raw = result["rows"]
         async with self:
-            self.total_orders = total_orders
+            self.total_orders = result["total"]
+            self.current_page = result["page"]
+            self._page_cursor = result["cursor"]
             self.orders = [
                 {
                     "order_id": row["order_id"],
@@ -135,7 +105,7 @@ class OrdersState(rx.State):
                     ).strftime("%b %d, %Y")
                     if row["shipped_date"]
                     else None,
-                    "status": "Shipped" if row["shipped_date"] else "Pending",
+                    "status": row["status"],
                     "total_revenue": row["total_revenue"],
                 }
                 for row in orders_raw
@@ -143,20 +113,19 @@ class OrdersState(rx.State):
             self.loading = False
 
     @rx.event(background=True)
+    @timed_handler
     async def get_order_details(self, order_id: int):
         async with self:
             self.selected_order = None
             self.is_modal_open = True
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute(
+        rows = await fetch_all(
             """
             SELECT 
                 o.OrderID as order_id, c.CompanyName as customer_name, (e.FirstName || ' ' || e.LastName) as employee_name,
                 o.OrderDate as order_date, o.ShippedDate as shipped_date, o.Freight as freight,
                 o.ShipCity as ship_city, o.ShipCountry as ship_country,
-                p.ProductName as product_name, od.UnitPrice as unit_price, od.Quantity as quantity, od.Discount as discount
+                p.ProductName as product_name, od.UnitPrice as unit_price, od.Quantity as quantity, od.Discount as discount,
+                od.LineTotal as total
             FROM Orders o
             JOIN Customers c ON o.CustomerID = c.CustomerID
             JOIN Employees e ON o.EmployeeID = e.EmployeeID
@@ -165,15 +134,14 @@ class OrdersState(rx.State):
             WHERE o.OrderID = ?
         """,
             (order_id,),
+            label="orders.detail",
         )
-        rows = cursor.fetchall()
-        conn.close()
         if not rows:
             return
         order_items = []
         total_revenue = 0
         for row in rows:
-            total = row["unit_price"] * row["quantity"] * (1 - row["discount"])
+            total = row["total"]
             order_items.append(
                 {
                     "product_name": row["product_name"],
@@ -246,35 +214,30 @@ class OrdersState(rx.State):
             self.current_page -= 1
             return OrdersState.fetch_orders
 
+    @rx.event
+    def go_to_page(self, value: str):
+        try:
+            page = int(value)
+        except ValueError:
+            return
+        page = min(max(1, page), max(1, self.total_pages))
+        if page != self.current_page:
+            self.current_page = page
+            return OrdersState.fetch_orders
+
     @rx.event(background=True)
+    @timed_handler
     async def fetch_stats(self):
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Total orders
-        cursor.execute("SELECT COUNT(*) FROM Orders")
-        total_orders = cursor.fetchone()[0]
-        
-        # Total revenue
-        cursor.execute("""
-            SELECT SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)) 
-            FROM OrderDetails od
-        """)
-        total_revenue = cursor.fetchone()[0] or 0
+        # Shared with the other pages, computed once per data version
+        metrics = await get_metrics("shipped_orders", "pending_orders", "total_revenue")
+        shipped_orders = metrics["shipped_orders"]
+        pending_orders = metrics["pending_orders"]
+        total_orders = shipped_orders + pending_orders
+        total_revenue = metrics["total_revenue"]
         
         # Average order value
         avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
         
-        # Shipped orders
-        cursor.execute("SELECT COUNT(*) FROM Orders WHERE ShippedDate IS NOT NULL")
-        shipped_orders = cursor.fetchone()[0]
-        
-        # Pending orders
-        cursor.execute("SELECT COUNT(*) FROM Orders WHERE ShippedDate IS NULL")
-        pending_orders = cursor.fetchone()[0]
-        
-        conn.close()
-        
         async with self:
             self.stats = {
                 "total_orders": total_orders,
@@ -1,8 +1,9 @@
 import reflex as rx
-import sqlite3
 from typing import TypedDict, Optional
 
-DB_PATH = "northwind.db"
+from app.db.instrument import timed_handler
+from app.db.query import fetch_all, fetch_value
+from app.queries.products import ProductQuery, fetch_product_page
 
 
 class Product(TypedDict):
@@ -24,6 +25,7 @@ class ProductStats(TypedDict):
 
 
 class ProductsState(rx.State):
+    # Only the page on screen; filtering, sorting and paging run in SQL.
     products: list[Product] = []
     search_query: str = ""
     category_filter: str = "All"
@@ -47,113 +49,55 @@ class ProductsState(rx.State):
     def total_pages(self) -> int:
         return -(-self.total_products // self.items_per_page)
 
-    @rx.var
-    def filtered_products(self) -> list[Product]:
-        filtered = self.products
-        if self.search_query:
-            query = self.search_query.lower()
-            filtered = [
-                p for p in filtered
-                if query in p["product_name"].lower() 
-                or query in p["category_name"].lower()
-                or query in p["supplier_name"].lower()
-            ]
-        if self.category_filter != "All":
-            filtered = [p for p in filtered if p["category_name"] == self.category_filter]
-        
-        # Sorting
-        reverse = self.sort_order == "desc"
-        filtered.sort(key=lambda x: x[self.sort_by], reverse=reverse)
-        
-        return filtered
-
     @rx.event(background=True)
+    @timed_handler
     async def fetch_products(self):
         async with self:
             self.loading = True
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                p.ProductID as product_id,
-                p.ProductName as product_name,
-                c.CategoryName as category_name,
-                s.CompanyName as supplier_name,
-                p.UnitPrice as unit_price,
-                p.UnitsInStock as units_in_stock
-            FROM Products p
-            LEFT JOIN Categories c ON p.CategoryID = c.CategoryID
-            LEFT JOIN Suppliers s ON p.SupplierID = s.SupplierID
-            ORDER BY p.ProductName
-        """)
-        
-        products_raw = cursor.fetchall()
-        
-        # Get categories
-        cursor.execute("SELECT DISTINCT CategoryName FROM Categories ORDER BY CategoryName")
-        categories_raw = cursor.fetchall()
-        
-        conn.close()
-        
-        products = []
-        for row in products_raw:
-            units_in_stock = row["units_in_stock"] or 0
-            if units_in_stock == 0:
-                inventory_status = "Out of Stock"
-            elif units_in_stock < 10:
-                inventory_status = "Low Stock"
-            else:
-                inventory_status = "In Stock"
-                
-            products.append({
-                "product_id": row["product_id"],
-                "product_name": row["product_name"],
-                "category_name": row["category_name"] or "Uncategorized",
-                "supplier_name": row["supplier_name"] or "Unknown",
-                "unit_price": row["unit_price"] or 0,
-                "units_in_stock": units_in_stock,
-                "inventory_status": inventory_status,
-            })
-        
-        categories = ["All"] + [cat[0] for cat in categories_raw]
-        
+
+        # Categories only change with the data; load them once per session
+        if not self.categories:
+            categories_raw = await fetch_all("SELECT DISTINCT CategoryName FROM Categories ORDER BY CategoryName", label="products.categories")
+            categories = ["All"] + [cat[0] for cat in categories_raw]
+        else:
+            categories = self.categories
+
+        query = ProductQuery(
+            search=self.search_query,
+            category=self.category_filter,
+            sort_by=self.sort_by,
+            descending=self.sort_order == "desc",
+            page_size=self.items_per_page,
+        )
+        result = await fetch_product_page(query, self.current_page)
+
         async with self:
-            self.products = products
+            self.products = [dict(row) for row in result["rows"]]
             self.categories = categories
-            self.total_products = len(products)
+            self.total_products = result["total"]
+            self.current_page = result["page"]
             self.loading = False
 
     @rx.event(background=True)
+    @timed_handler
     async def fetch_stats(self):
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         # Total products
-        cursor.execute("SELECT COUNT(*) FROM Products")
-        total_products = cursor.fetchone()[0]
-        
+        total_products = await fetch_value("SELECT COUNT(*) FROM Products", label="products.count")
+
         # Total inventory value
-        cursor.execute("""
+        total_inventory_value = await fetch_value("""
             SELECT SUM(p.UnitPrice * p.UnitsInStock) 
             FROM Products p
-        """)
-        total_inventory_value = cursor.fetchone()[0] or 0
-        
+        """, default=0, label="products.inventory_value")
+
         # Low stock (less than 10 units)
-        cursor.execute("SELECT COUNT(*) FROM Products WHERE UnitsInStock < 10 AND UnitsInStock > 0")
-        low_stock_products = cursor.fetchone()[0]
-        
+        low_stock_products = await fetch_value("SELECT COUNT(*) FROM Products WHERE UnitsInStock < 10 AND UnitsInStock > 0", label="products.low_stock")
+
         # Out of stock
-        cursor.execute("SELECT COUNT(*) FROM Products WHERE UnitsInStock = 0")
-        out_of_stock_products = cursor.fetchone()[0]
-        
+        out_of_stock_products = await fetch_value("SELECT COUNT(*) FROM Products WHERE UnitsInStock = 0", label="products.out_of_stock")
+
         # Categories count
-        cursor.execute("SELECT COUNT(*) FROM Categories")
-        categories_count = cursor.fetchone()[0]
-        
-        conn.close()
+        categories_count = await fetch_value("SELECT COUNT(*) FROM Categories", label="products.categories_count")
         
         async with self:
             self.stats = {
@@ -168,11 +112,13 @@ class ProductsState(rx.State):
     def set_search_query(self, query: str):
         self.search_query = query
         self.current_page = 1
+        return ProductsState.fetch_products
 
     @rx.event
     def set_category_filter(self, category: str):
         self.category_filter = category
         self.current_page = 1
+        return ProductsState.fetch_products
 
     @rx.event
     def set_sort(self, column: str):
@@ -181,6 +127,7 @@ class ProductsState(rx.State):
         else:
             self.sort_by = column
             self.sort_order = "asc"
+        return ProductsState.fetch_products
 
     @rx.event
     def set_view_mode(self, mode: str):
@@ -190,14 +137,10 @@ class ProductsState(rx.State):
     def next_page(self):
         if self.current_page < self.total_pages:
             self.current_page += 1
+            return ProductsState.fetch_products
 
     @rx.event
     def prev_page(self):
         if self.current_page > 1:
             self.current_page -= 1
-
-    @rx.var
-    def paginated_products(self) -> list[Product]:
-        start = (self.current_page - 1) * self.items_per_page
-        end = start + self.items_per_page
-        return self.filtered_products[start:end]
\ No newline at end of file
+            return ProductsState.fetch_products
@@ -0,0 +1,204 @@
+"""Benchmark every state handler against generated databases of several sizes.
+
+    python -m benchmarks run --scales 1,10,100 --out benchmarks/results/latest.json
+    python -m benchmarks compare benchmarks/results/baseline.json benchmarks/results/latest.json
+    python -m benchmarks imports --budget-ms 3000
+
+``run`` generates ``benchmarks/data/northwind_sf<scale>.db`` with
+``app.db.generate`` when missing, then benchmarks each scale in its own
+process. Unless ``--cache`` is given, the query cache is off and the
+headline metrics, the analytics fact store, the customer scores and the
+dashboard figures are dropped before every iteration, so each one measures
+the SQL as well as the Python work. ``compare`` exits non-zero when a case
+got slower than ``--threshold``, issues more queries, or started failing.
+``imports`` reports the import time of the backend modules per package and
+exits non-zero past ``--budget-ms`` or when a module that should load on
+first use (pandas, plotly.express) is imported at startup.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+DATA_DIR = os.path.join("benchmarks", "data")
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "peak_rss_mb")
+
+
+def _database(scale: int, seed: int, data_dir: str) -> str:
+    path = os.path.join(data_dir, f"northwind_sf{scale}.db")
+    if not os.path.exists(path):
+        from app.db.generate import generate
+
+        os.makedirs(data_dir, exist_ok=True)
+        print(f"generating {path} (scale {scale}, seed {seed})", file=sys.stderr)
+        generate(path, scale=scale, seed=seed)
+    return path
+
+
+def _row_counts(db_path: str) -> dict[str, int]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("Orders", "OrderDetails", "Customers", "Products")
+        }
+    finally:
+        conn.close()
+
+
+def run(args: argparse.Namespace) -> int:
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "cache": args.cache,
+            "seed": args.seed,
+        },
+        "scales": {},
+    }
+    for scale in args.scales:
+        db_path = _database(scale, args.seed, args.data_dir)
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+            out = tmp.name
+        cmd = [
+            sys.executable, "-m", "benchmarks.worker",
+            "--db", db_path,
+            "--iterations", str(args.iterations),
+            "--warmup", str(args.warmup),
+            "--out", out,
+        ]
+        if args.cache:
+            cmd.append("--cache")
+        print(f"scale {scale}: {db_path}", file=sys.stderr)
+        try:
+            subprocess.run(cmd, check=True)
+            with open(out) as f:
+                cases = json.load(f)
+        finally:
+            os.remove(out)
+        report["scales"][str(scale)] = {"db": db_path, "rows": _row_counts(db_path), "cases": cases}
+        for name, result in cases.items():
+            if "error" in result:
+                print(f"  {name:<48} ERROR {result['error']}", file=sys.stderr)
+            else:
+                print(
+                    f"  {name:<48} p50 {result['p50_ms']:9.2f} ms  p95 {result['p95_ms']:9.2f} ms"
+                    f"  p99 {result['p99_ms']:9.2f} ms  queries {result['queries']}",
+                    file=sys.stderr,
+                )
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.out}", file=sys.stderr)
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    regressions = []
+    for scale, base_scale in baseline["scales"].items():
+        cur_scale = current["scales"].get(scale)
+        if cur_scale is None:
+            continue
+        for name, base in base_scale["cases"].items():
+            cur = cur_scale["cases"].get(name)
+            if cur is None or "error" in base:
+                continue
+            label = f"sf{scale} {name}"
+            if "error" in cur:
+                regressions.append(f"{label}: now fails ({cur['error']})")
+                continue
+            for metric in METRICS:
+                # Sub-millisecond timings are mostly noise; only flag them past the floor.
+                if max(base[metric], cur[metric]) < args.min_ms and metric.endswith("_ms"):
+                    continue
+                if base[metric] and cur[metric] > base[metric] * (1 + args.threshold):
+                    change = cur[metric] / base[metric] - 1
+                    regressions.append(
+                        f"{label}: {metric} {base[metric]:.2f} -> {cur[metric]:.2f} (+{change:.0%})"
+                    )
+            if (cur.get("queries") or 0) > (base.get("queries") or 0):
+                regressions.append(f"{label}: queries {base['queries']} -> {cur['queries']}")
+
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"no regressions above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def imports(args: argparse.Namespace) -> int:
+    from benchmarks.imports import FORBIDDEN, MODULES, report
+
+    result = report(tuple(args.module or MODULES), args.top, FORBIDDEN)
+    print(f"{result['module_count']} modules imported in {result['total_ms']:.0f} ms", file=sys.stderr)
+    print("  by package (self time):", file=sys.stderr)
+    for package, ms in result["packages_ms"].items():
+        print(f"    {package:<40} {ms:9.1f} ms", file=sys.stderr)
+    print("  slowest modules (cumulative):", file=sys.stderr)
+    for module, ms in result["slowest_ms"].items():
+        print(f"    {module:<40} {ms:9.1f} ms", file=sys.stderr)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+    failures = [f"{module} is imported at startup" for module in result["forbidden"]]
+    if args.budget_ms is not None and result["total_ms"] > args.budget_ms:
+        failures.append(f"import time {result['total_ms']:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+    for line in failures:
+        print(f"REGRESSION {line}")
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="benchmark handlers and write a JSON report")
+    run_parser.add_argument(
+        "--scales",
+        type=lambda value: [int(s) for s in value.split(",")],
+        default=[1, 10, 100],
+        help="comma-separated scale factors (default 1,10,100)",
+    )
+    run_parser.add_argument("--iterations", type=int, default=20)
+    run_parser.add_argument("--warmup", type=int, default=2)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--cache", action="store_true", help="keep the query result cache on")
+    run_parser.add_argument("--data-dir", default=DATA_DIR)
+    run_parser.add_argument("--out", default=os.path.join("benchmarks", "results", "latest.json"))
+
+    compare_parser = sub.add_parser("compare", help="flag regressions against a stored baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown (0.15 = 15%%)")
+    compare_parser.add_argument("--min-ms", type=float, default=1.0, help="ignore timings below this")
+
+    imports_parser = sub.add_parser("imports", help="report the import time of the backend modules")
+    imports_parser.add_argument("--module", action="append", help="module to import (default: pages and states)")
+    imports_parser.add_argument("--top", type=int, default=15)
+    imports_parser.add_argument("--budget-ms", type=float, help="fail when the total import time is above this")
+    imports_parser.add_argument("--out", help="also write the report as JSON")
+
+    args = parser.parse_args()
+    commands = {"run": run, "compare": compare, "imports": imports}
+    sys.exit(commands[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Handlers covered by the benchmark suite."""
+import sqlite3
+
+from benchmarks.harness import Case
+
+DASHBOARD = "app.states.dashboard_state:DashboardState"
+ORDERS = "app.states.orders_state:OrdersState"
+PRODUCTS = "app.states.products_state:ProductsState"
+CUSTOMERS = "app.states.customers_state:CustomersState"
+ANALYTICS = "app.states.analytics_state:AnalyticsState"
+
+# Every sortable column of the /orders table.
+ORDER_SORT_COLUMNS = [
+    "order_id",
+    "customer_name",
+    "employee_name",
+    "order_date",
+    "shipped_date",
+    "status",
+    "total_revenue",
+]
+ORDERS_PER_PAGE = 10
+# Type-ahead terms: one served by the trigram index, one too short for it.
+ORDER_SEARCH_TERMS = ["ber", "an"]
+
+
+def clear_caches() -> None:
+    """Drop the per-data-version caches the handlers keep outside the query cache."""
+    from app.components.figures import clear_figures
+    from app.db.columnar import clear_fact_store
+    from app.queries.metrics import clear_metrics
+    from app.queries.segments import clear_customer_scores
+
+    clear_metrics()
+    clear_fact_store()
+    clear_customer_scores()
+    clear_figures()
+
+
+def _order_pages(db_path: str) -> dict[str, int]:
+    conn = sqlite3.connect(db_path)
+    try:
+        total = conn.execute("SELECT COUNT(*) FROM Orders").fetchone()[0]
+    finally:
+        conn.close()
+    last = max(1, -(-total // ORDERS_PER_PAGE))
+    return {"first": 1, "middle": max(1, last // 2), "last": last}
+
+
+def build_cases(db_path: str) -> list[Case]:
+    cases = [
+        Case(
+            "dashboard.on_load",
+            DASHBOARD,
+            "on_load",
+            {"date_filter_start": "2024-01-01", "date_filter_end": "2024-12-31"},
+        ),
+    ]
+    for column in ORDER_SORT_COLUMNS:
+        for label, page in _order_pages(db_path).items():
+            cases.append(
+                Case(
+                    f"orders.fetch_orders[{column},{label}]",
+                    ORDERS,
+                    "fetch_orders",
+                    {
+                        "search_query": "",
+                        "status_filter": "All",
+                        "sort_by": column,
+                        "sort_order": "desc",
+                        "current_page": page,
+                        "items_per_page": ORDERS_PER_PAGE,
+                        "_page_cursor": {},
+                    },
+                )
+            )
+    for term in ORDER_SEARCH_TERMS:
+        cases.append(
+            Case(
+                f"orders.fetch_orders[search={term}]",
+                ORDERS,
+                "fetch_orders",
+                {
+                    "search_query": term,
+                    "status_filter": "All",
+                    "sort_by": "order_date",
+                    "sort_order": "desc",
+                    "current_page": 1,
+                    "items_per_page": ORDERS_PER_PAGE,
+                    "_page_cursor": {},
+                },
+            )
+        )
+    for label, search, sort_by in (
+        ("", "", "product_name"),
+        ("[search=che]", "che", "unit_price"),
+        ("[search=ch]", "ch", "supplier_name"),
+    ):
+        cases.append(
+            Case(
+                f"products.fetch_products{label}",
+                PRODUCTS,
+                "fetch_products",
+                {
+                    "search_query": search,
+                    "category_filter": "All",
+                    "sort_by": sort_by,
+                    "sort_order": "asc",
+                    "current_page": 1,
+                    "items_per_page": 12,
+                    "categories": [],
+                },
+            )
+        )
+    cases += [
+        Case(
+            "customers.fetch_customers",
+            CUSTOMERS,
+            "fetch_customers",
+            {
+                "search_query": "",
+                "country_filter": "All",
+                "city_filter": "All",
+                "segment_filter": "All",
+                "sort_by": "company_name",
+                "sort_order": "asc",
+                "current_page": 1,
+                "items_per_page": 12,
+                "countries": [],
+                "cities": [],
+            },
+        ),
+        Case("analytics.fetch_analytics_data", ANALYTICS, "fetch_analytics_data"),
+        # Headline figures shared through the metrics service.
+        Case("orders.fetch_stats", ORDERS, "fetch_stats"),
+        Case("customers.fetch_stats", CUSTOMERS, "fetch_stats"),
+    ]
+    return cases
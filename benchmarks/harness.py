@@ -0,0 +1,160 @@
+"""Drive Reflex state handlers directly, without a browser or a running app."""
+import asyncio
+import importlib
+import math
+import resource
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    state: str  # "module:Class"
+    handler: str
+    inputs: dict[str, Any] = field(default_factory=dict)
+    # Computed vars evaluated (and timed separately) after the handler ran.
+    computed: tuple[str, ...] = ()
+
+
+class StandInState:
+    """Plain object standing in for an ``rx.State`` instance.
+
+    Handlers only read and assign attributes and enter ``async with self``, so
+    that is all this provides; computed vars of the real class are evaluated on
+    demand against the stand-in.
+    """
+
+    def __init__(self, state_cls: type, **values: Any):
+        object.__setattr__(self, "_state_cls", state_cls)
+        self.__dict__.update(values)
+
+    def __getattr__(self, name: str) -> Any:
+        fget = computed_var(self._state_cls, name)
+        if fget is None:
+            raise AttributeError(f"{self._state_cls.__name__}.{name} is not set on the stand-in")
+        return fget(self)
+
+    async def __aenter__(self) -> "StandInState":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> bool:
+        return False
+
+
+def load_state(path: str) -> type:
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def handler_fn(state_cls: type, name: str) -> Callable[..., Any]:
+    # @rx.event wraps the method in an EventHandler that keeps the original in .fn
+    handler = getattr(state_cls, name)
+    return getattr(handler, "fn", handler)
+
+
+def computed_var(state_cls: type, name: str) -> Callable[[Any], Any] | None:
+    var = getattr(state_cls, "computed_vars", {}).get(name)
+    if var is None:
+        return None
+    return getattr(var, "_fget", None) or getattr(var, "fget", None)
+
+
+class QueryCounter:
+    """Counts the queries reported by app.db.instrument while a case runs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, record: dict) -> None:
+        with self._lock:
+            self.count += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.count = 0
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux (bytes on macOS); this is the process high-water mark.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def summarize(samples: list[float], queries: int | None) -> dict[str, Any]:
+    return {
+        "iterations": len(samples),
+        "mean_ms": sum(samples) / len(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "queries": queries,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+async def _run_case(
+    case: Case,
+    counter: QueryCounter,
+    iterations: int,
+    warmup: int,
+    reset: Callable[[], None] | None = None,
+) -> dict[str, dict]:
+    state_cls = load_state(case.state)
+    fn = handler_fn(state_cls, case.handler)
+    timings: list[float] = []
+    computed_timings: dict[str, list[float]] = {name: [] for name in case.computed}
+    queries = None
+    for i in range(warmup + iterations):
+        if reset is not None:
+            reset()
+        state = StandInState(state_cls, **case.inputs)
+        counter.reset()
+        started = time.perf_counter()
+        await fn(state)
+        elapsed = time.perf_counter() - started
+        if i < warmup:
+            continue
+        timings.append(elapsed)
+        queries = counter.count
+        for name in case.computed:
+            started = time.perf_counter()
+            getattr(state, name)
+            computed_timings[name].append(time.perf_counter() - started)
+
+    results = {case.name: summarize(timings, queries)}
+    for name, samples in computed_timings.items():
+        results[f"{case.name}.{name}"] = summarize(samples, 0)
+    return results
+
+
+def run_cases(
+    cases: list[Case],
+    counter: QueryCounter,
+    iterations: int,
+    warmup: int,
+    reset: Callable[[], None] | None = None,
+) -> dict[str, dict]:
+    """``reset`` is called, untimed, before every iteration."""
+    results: dict[str, dict] = {}
+
+    async def main() -> None:
+        for case in cases:
+            try:
+                results.update(await _run_case(case, counter, iterations, warmup, reset))
+            except Exception as exc:  # a failing handler is a result, not a crash
+                results[case.name] = {"error": f"{type(exc).__name__}: {exc}"}
+
+    asyncio.run(main())
+    return results
@@ -0,0 +1,90 @@
+"""Import-time report of the backend modules, from ``python -X importtime``.
+
+The modules are imported in a fresh interpreter (nothing is run against the
+database) and the per-module timings are summed per top-level package, so a
+new heavy dependency at module level shows up as a new line near the top.
+"""
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# What a backend worker imports before serving, minus app.app itself (which migrates the database).
+MODULES = (
+    "app.pages.dashboard",
+    "app.pages.orders",
+    "app.pages.products",
+    "app.pages.customers",
+    "app.pages.analytics",
+    "app.states.dashboard_state",
+    "app.states.orders_state",
+    "app.states.products_state",
+    "app.states.customers_state",
+    "app.states.analytics_state",
+    "app.metrics",
+)
+# Only needed by pages and vars that load them on first use. plotly.graph_objects
+# is not among them: reflex.utils.serializers imports it whenever plotly is installed.
+FORBIDDEN = ("pandas", "plotly.express")
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        module = name.lstrip(" ")
+        # Nested imports are indented two spaces per level past the first.
+        depth = (len(name) - len(module) - 1) // 2
+        records.append(ImportRecord(module.rstrip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def measure(modules: tuple[str, ...]) -> tuple[list[ImportRecord], set[str]]:
+    """Import records and the modules left in ``sys.modules``.
+
+    Failed optional imports (``try: import pandas``) are timed too, so whether
+    a module is loaded is read from ``sys.modules`` rather than the records.
+    """
+    code = f"import sys, {', '.join(modules)}; print(' '.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(errors[-1] if errors else "import failed")
+    return parse_importtime(result.stderr), set(result.stdout.split())
+
+
+def by_package(records: list[ImportRecord]) -> dict[str, int]:
+    """Self time per top-level package, in microseconds, slowest first."""
+    totals: dict[str, int] = {}
+    for record in records:
+        package = record.module.partition(".")[0]
+        totals[package] = totals.get(package, 0) + record.self_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def report(modules: tuple[str, ...], top: int, forbidden: tuple[str, ...]) -> dict:
+    records, loaded = measure(modules)
+    return {
+        "modules": list(modules),
+        "total_ms": sum(record.cumulative_us for record in records if record.depth == 0) / 1000,
+        "module_count": len(records),
+        "packages_ms": {package: us / 1000 for package, us in list(by_package(records).items())[:top]},
+        "slowest_ms": {
+            record.module: record.cumulative_us / 1000
+            for record in sorted(records, key=lambda record: record.cumulative_us, reverse=True)[:top]
+        },
+        "forbidden": [module for module in forbidden if module in loaded],
+    }
@@ -0,0 +1,37 @@
+"""Benchmark one database file in a fresh process (so peak RSS is per scale)."""
+import argparse
+import json
+import os
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", required=True)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--cache", action="store_true")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    # app.db.settings reads these at import time.
+    os.environ["NORTHWIND_DB_PATH"] = args.db
+    os.environ["NORTHWIND_QUERY_CACHE"] = "1" if args.cache else "0"
+    # EXPLAIN QUERY PLAN for slow queries would be timed too; opt in explicitly.
+    os.environ.setdefault("NORTHWIND_SLOW_QUERY_MS", "-1")
+
+    from app.db.instrument import subscribe
+    from app.db.pool import configure_pool
+    from benchmarks.cases import build_cases, clear_caches
+    from benchmarks.harness import QueryCounter, run_cases
+
+    counter = QueryCounter()
+    subscribe(on_query=counter.record)
+    configure_pool(args.db)
+    reset = None if args.cache else clear_caches
+    results = run_cases(build_cases(args.db), counter, args.iterations, args.warmup, reset)
+    with open(args.out, "w") as f:
+        json.dump(results, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Shared fixtures: small generated databases, one read-only for the whole run
+and a fresh writable copy for tests that change data.
+
+``app.db.settings`` reads the environment at import time, so it is set here,
+before any test module imports the app.
+"""
+import os
+import tempfile
+
+_DATA_DIR = tempfile.mkdtemp(prefix="northwind-tests-")
+os.environ["NORTHWIND_DB_PATH"] = os.path.join(_DATA_DIR, "northwind.db")
+os.environ["NORTHWIND_QUERY_CACHE"] = "0"
+os.environ["NORTHWIND_SLOW_QUERY_MS"] = "-1"
+
+import sqlite3
+
+import pytest
+
+from app.db.generate import generate
+from app.db.settings import DB_PATH
+from app.db.storage import open_writer
+
+SEED = 7
+
+
+@pytest.fixture(scope="session")
+def database() -> str:
+    """Path of the shared database (``DB_PATH``); tests must not write to it."""
+    generate(DB_PATH, scale=1, seed=SEED)
+    return DB_PATH
+
+
+@pytest.fixture
+def writer(tmp_path) -> sqlite3.Connection:
+    """Autocommit connection to a fresh, fully migrated database of its own."""
+    path = str(tmp_path / "northwind.db")
+    generate(path, scale=1, seed=SEED)
+    conn = open_writer(path, isolation_level=None)
+    yield conn
+    conn.close()
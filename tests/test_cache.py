@@ -0,0 +1,40 @@
+"""Query cache: size estimates that see array buffers and object fields, and a cheap data version."""
+import numpy as np
+
+from app.db.cache import DataVersion, _estimate_size
+from app.db.storage import open_reader
+from app.queries.segments import load_customer_scores
+
+
+def test_arrays_are_counted():
+    values = np.zeros(100_000)
+    assert _estimate_size(values) >= values.nbytes
+    # Views do not own their buffer; getsizeof alone reports almost nothing.
+    assert _estimate_size(values[::2]) >= values[::2].nbytes
+    assert _estimate_size({"values": values}) >= values.nbytes
+
+
+def test_objects_are_counted(database):
+    conn = open_reader(database)
+    try:
+        scores = load_customer_scores(conn)
+    finally:
+        conn.close()
+    arrays = sum(value.nbytes for value in vars(scores).values() if isinstance(value, np.ndarray))
+    names = sum(len(name) for name in scores.company_name)
+    assert _estimate_size(scores) >= arrays + names
+
+
+def test_data_version_probes_at_most_once_per_interval(writer):
+    path = writer.execute("PRAGMA database_list").fetchone()[2]
+    version = DataVersion(path, interval=60)
+    first = version.current()
+    probes = []
+    version._probe().set_trace_callback(probes.append)
+    writer.execute("UPDATE Products SET UnitsInStock = UnitsInStock + 1 WHERE ProductID = 1")
+    assert [version.current() for _ in range(100)] == [first] * 100
+    assert probes == []
+
+    version.interval = 0
+    assert version.current() != first
+    assert len(probes) == 1
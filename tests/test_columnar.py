@@ -0,0 +1,147 @@
+"""The columnar fact store must agree with the baseline SQL, whether loaded or extended."""
+import sqlite3
+
+import numpy as np
+import pytest
+
+from app.db import columnar
+from app.db.columnar import LINE_COLUMNS, ORDER_COLUMNS, FactStore
+from app.queries.analytics import category_revenue, employee_revenue, monthly_revenue, quarterly_revenue
+
+LINE = "od.UnitPrice * od.Quantity * (1 - od.Discount)"
+BASELINE = {
+    "monthly": f"""
+        SELECT strftime('%Y-%m', o.OrderDate), SUM({LINE}), COUNT(DISTINCT o.OrderID)
+        FROM Orders o JOIN OrderDetails od ON o.OrderID = od.OrderID
+        GROUP BY 1 ORDER BY 1""",
+    "categories": f"""
+        SELECT c.CategoryName, SUM({LINE}) AS revenue, COUNT(od.Quantity)
+        FROM Categories c
+        JOIN Products p ON c.CategoryID = p.CategoryID
+        JOIN OrderDetails od ON p.ProductID = od.ProductID
+        GROUP BY c.CategoryName ORDER BY revenue DESC""",
+    "employees": f"""
+        SELECT e.FirstName || ' ' || e.LastName, SUM({LINE}) AS total_sales, COUNT(DISTINCT o.OrderID)
+        FROM Employees e
+        JOIN Orders o ON e.EmployeeID = o.EmployeeID
+        JOIN OrderDetails od ON o.OrderID = od.OrderID
+        GROUP BY e.EmployeeID ORDER BY total_sales DESC""",
+    "quarters": f"""
+        SELECT strftime('%Y', o.OrderDate), 'Q' || ((CAST(strftime('%m', o.OrderDate) AS INTEGER) + 2) / 3), SUM({LINE})
+        FROM Orders o JOIN OrderDetails od ON o.OrderID = od.OrderID
+        GROUP BY 1, 2 ORDER BY 1, 2""",
+}
+SERIES = {
+    "monthly": monthly_revenue,
+    "categories": category_revenue,
+    "employees": employee_revenue,
+    "quarters": quarterly_revenue,
+}
+
+
+def _rounded(rows) -> list[tuple]:
+    return [tuple(round(value, 6) if isinstance(value, float) else value for value in row) for row in rows]
+
+
+def assert_matches(conn: sqlite3.Connection, store: FactStore) -> None:
+    for name, sql in BASELINE.items():
+        assert _rounded(SERIES[name](store)) == _rounded(conn.execute(sql)), name
+    full = columnar.load_fact_store(conn, store.dimensions, store.generation, store.version)
+    for column in LINE_COLUMNS + ORDER_COLUMNS:
+        assert np.array_equal(getattr(store, column), getattr(full, column)), column
+
+
+class Refresher:
+    """Refreshes a store through fake data versions and records which path each took."""
+
+    def __init__(self, conn: sqlite3.Connection, monkeypatch):
+        self.conn = conn
+        self.paths: list[str] = []
+        for path in ("load", "extend"):
+            original = getattr(columnar, f"{path}_fact_store")
+            monkeypatch.setattr(columnar, f"{path}_fact_store", self._recording(path, original))
+        self.version = 0
+        self.store = columnar.refresh_fact_store(conn, None, 0)
+
+    def _recording(self, path, original):
+        def wrapper(*args, **kwargs):
+            self.paths.append(path)
+            return original(*args, **kwargs)
+
+        return wrapper
+
+    def refresh(self) -> str:
+        """Refresh for the next data version; returns the path taken."""
+        self.version += 1
+        self.store = columnar.refresh_fact_store(self.conn, self.store, self.version)
+        return self.paths[-1]
+
+
+def _order(conn: sqlite3.Connection, order_id: int, customer: str, lines: int = 2, date: str = "2025-01-10") -> None:
+    conn.execute(
+        "INSERT INTO Orders (OrderID, CustomerID, EmployeeID, OrderDate, ShipCountry) VALUES (?, ?, 3, ?, 'Spain')",
+        (order_id, customer, date),
+    )
+    for product in range(1, lines + 1):
+        conn.execute(
+            "INSERT INTO OrderDetails (OrderID, ProductID, UnitPrice, Quantity, Discount) VALUES (?, ?, 10.5, 3, 0.1)",
+            (order_id, product),
+        )
+
+
+@pytest.fixture
+def refresher(writer, monkeypatch) -> Refresher:
+    return Refresher(writer, monkeypatch)
+
+
+def _max_order(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT MAX(OrderID) FROM Orders").fetchone()[0]
+
+
+def _customer(conn: sqlite3.Connection) -> str:
+    return conn.execute("SELECT MIN(CustomerID) FROM Customers").fetchone()[0]
+
+
+def test_full_load(refresher):
+    assert_matches(refresher.conn, refresher.store)
+
+
+def test_appends_extend(refresher):
+    conn = refresher.conn
+    top = _max_order(conn)
+    for offset in (1, 2, 3):
+        _order(conn, top + offset, _customer(conn))
+    assert refresher.refresh() == "extend"
+    assert_matches(conn, refresher.store)
+
+    # A line on the newest order, an order without lines, then lines for it.
+    conn.execute("INSERT INTO OrderDetails (OrderID, ProductID, UnitPrice, Quantity, Discount) VALUES (?, 9, 99, 1, 0)", (top + 3,))
+    assert refresher.refresh() == "extend"
+    assert_matches(conn, refresher.store)
+    _order(conn, top + 10, _customer(conn), lines=0, date="2025-03-05")
+    assert refresher.refresh() == "extend"
+    assert_matches(conn, refresher.store)
+    conn.execute("INSERT INTO OrderDetails (OrderID, ProductID, UnitPrice, Quantity, Discount) VALUES (?, 4, 5, 1, 0)", (top + 10,))
+    assert refresher.refresh() == "extend"
+    assert_matches(conn, refresher.store)
+
+    conn.execute("INSERT INTO Customers (CustomerID, CompanyName) VALUES ('ZZNEW', 'New Co')")
+    _order(conn, top + 11, "ZZNEW")
+    assert refresher.refresh() == "extend"
+    assert_matches(conn, refresher.store)
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "UPDATE OrderDetails SET Quantity = Quantity + 1 WHERE OrderID = (SELECT MIN(OrderID) FROM Orders)",
+        "DELETE FROM OrderDetails WHERE OrderID = (SELECT MIN(OrderID) FROM Orders)",
+        "UPDATE Orders SET EmployeeID = 2, OrderDate = '2020-05-05' WHERE OrderID = (SELECT MIN(OrderID) FROM Orders)",
+        "UPDATE Products SET CategoryID = 2 WHERE ProductID = 1",
+    ],
+    ids=["edit line", "delete lines", "edit order", "recategorize"],
+)
+def test_rewrites_reload(refresher, sql):
+    refresher.conn.execute(sql)
+    assert refresher.refresh() == "load"
+    assert_matches(refresher.conn, refresher.store)
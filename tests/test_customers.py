@@ -0,0 +1,105 @@
+"""SQL paging of the /customers directory must show what the in-session filter and sort did."""
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.queries.customers import SORT_COLUMNS, CustomerQuery, fetch_customer_page
+
+PAGE_SIZE = 12
+SEARCHED = ("company_name", "contact_name", "city", "country")
+SORTS = [*SORT_COLUMNS, "customer_segment"]
+# (search, country, city, segment)
+FILTERS = [
+    ("", "All", "All", "All"),
+    ("an", "All", "All", "All"),
+    ("ber", "All", "All", "All"),
+    ("", "Germany", "All", "All"),
+    ("", "All", "All", "New"),
+    ("", "All", "All", "VIP"),
+    ("", "All", "All", "Regular"),
+    ("e", "Germany", "All", "Regular"),
+]
+# The aggregate CustomersState.fetch_customers used to run.
+BASELINE = """
+    SELECT c.CustomerID AS customer_id, c.CompanyName AS company_name,
+           c.ContactName AS contact_name, c.City AS city, c.Country AS country,
+           COUNT(DISTINCT o.OrderID) AS total_orders,
+           COALESCE(SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)), 0) AS total_revenue,
+           MAX(o.OrderDate) AS last_order_date
+    FROM Customers c
+    LEFT JOIN Orders o ON c.CustomerID = o.CustomerID
+    LEFT JOIN OrderDetails od ON o.OrderID = od.OrderID
+    GROUP BY c.CustomerID
+"""
+
+
+def _rounded(row: dict) -> dict:
+    return {key: round(value, 6) if isinstance(value, float) else value for key, value in row.items()}
+
+
+@pytest.fixture(scope="module")
+def directory(database) -> list[dict]:
+    conn = sqlite3.connect(database)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [_rounded(dict(row)) for row in conn.execute(BASELINE)]
+    finally:
+        conn.close()
+
+
+@pytest.fixture(scope="module")
+def vip_revenue(directory) -> float:
+    revenues = sorted(row["total_revenue"] for row in directory if row["total_orders"])
+    return revenues[len(revenues) * 3 // 4]
+
+
+def _segment(row: dict, vip_revenue: float) -> str:
+    if row["total_orders"] == 0:
+        return "New"
+    return "VIP" if row["total_revenue"] >= vip_revenue else "Regular"
+
+
+def _expected(directory: list[dict], query: CustomerQuery) -> list[dict]:
+    """The baseline's filtered_customers, with the customer ID breaking ties."""
+    term = query.search.lower()
+    rows = [{**row, "customer_segment": _segment(row, query.vip_revenue)} for row in directory]
+    rows = [
+        row
+        for row in rows
+        if (not term or any(term in (row[key] or "").lower() for key in SEARCHED))
+        and query.country in ("All", row["country"])
+        and query.city in ("All", row["city"])
+        and query.segment in ("All", row["customer_segment"])
+    ]
+    # SQLite sorts NULL first.
+    return sorted(
+        rows,
+        key=lambda row: (row[query.sort_by] is not None, row[query.sort_by], row["customer_id"]),
+        reverse=query.descending,
+    )
+
+
+def _page(query: CustomerQuery, page: int):
+    result = asyncio.run(fetch_customer_page(query, page))
+    return [_rounded(dict(row)) for row in result["rows"]], result["total"], result["page"]
+
+
+@pytest.mark.parametrize("descending", [False, True], ids=["asc", "desc"])
+@pytest.mark.parametrize("sort_by", SORTS)
+@pytest.mark.parametrize("search,country,city,segment", FILTERS)
+def test_pages_match_the_in_session_sort(directory, vip_revenue, search, country, city, segment, sort_by, descending):
+    query = CustomerQuery(search, country, city, segment, sort_by, descending, PAGE_SIZE, vip_revenue)
+    expected = _expected(directory, query)
+    pages = max(1, -(-len(expected) // PAGE_SIZE))
+    for page in range(1, pages + 1):
+        rows, total, got_page = _page(query, page)
+        assert (total, got_page) == (len(expected), page)
+        assert rows == expected[(page - 1) * PAGE_SIZE:page * PAGE_SIZE], page
+
+
+def test_city_filter_and_clamping(directory, vip_revenue):
+    city = directory[0]["city"]
+    query = CustomerQuery("", "All", city, "All", "company_name", False, PAGE_SIZE, vip_revenue)
+    rows, total, page = _page(query, 99)
+    assert page == 1 and total == len(rows) == sum(row["city"] == city for row in directory)
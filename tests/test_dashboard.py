@@ -0,0 +1,122 @@
+"""The dashboard's two scans must reproduce the original per-widget queries."""
+import sqlite3
+
+import pytest
+
+from app.queries.dashboard import build_snapshot, load_dimensions, scan_orders, scan_sales
+
+LINE = "od.UnitPrice * od.Quantity * (1 - od.Discount)"
+IN_RANGE = "date(o.OrderDate) BETWEEN ? AND ?"
+# The queries DashboardState.on_load used to run, one per widget, by calendar day.
+BASELINE = {
+    "total_revenue": f"SELECT COALESCE(SUM({LINE}), 0) FROM OrderDetails od JOIN Orders o ON od.OrderID = o.OrderID WHERE {IN_RANGE}",
+    "total_orders": f"SELECT COUNT(*) FROM Orders o WHERE {IN_RANGE}",
+    "total_customers": f"SELECT COUNT(DISTINCT CustomerID) FROM Orders o WHERE {IN_RANGE}",
+    "shipped_count": f"SELECT COUNT(*) FROM Orders o WHERE ShippedDate IS NOT NULL AND {IN_RANGE}",
+    "monthly_sales": f"""
+        SELECT strftime('%Y-%m', o.OrderDate) AS month, SUM({LINE})
+        FROM OrderDetails od JOIN Orders o ON od.OrderID = o.OrderID
+        WHERE {IN_RANGE} GROUP BY month ORDER BY month""",
+    "top_products": f"""
+        SELECT p.ProductName, SUM({LINE}) AS total_revenue
+        FROM OrderDetails od
+        JOIN Products p ON od.ProductID = p.ProductID
+        JOIN Orders o ON od.OrderID = o.OrderID
+        WHERE {IN_RANGE} GROUP BY p.ProductName ORDER BY total_revenue DESC LIMIT 5""",
+    "category_performance": f"""
+        SELECT c.CategoryName, SUM({LINE}) AS total_revenue
+        FROM OrderDetails od
+        JOIN Products p ON od.ProductID = p.ProductID
+        JOIN Categories c ON p.CategoryID = c.CategoryID
+        JOIN Orders o ON od.OrderID = o.OrderID
+        WHERE {IN_RANGE} GROUP BY c.CategoryName ORDER BY total_revenue DESC""",
+    "top_customers": f"""
+        SELECT c.CompanyName, SUM({LINE}) AS total_revenue, COUNT(DISTINCT o.OrderID)
+        FROM Customers c
+        JOIN Orders o ON c.CustomerID = o.CustomerID
+        JOIN OrderDetails od ON o.OrderID = od.OrderID
+        WHERE {IN_RANGE} GROUP BY c.CustomerID ORDER BY total_revenue DESC LIMIT 5""",
+    "employee_performance": f"""
+        SELECT e.FirstName || ' ' || e.LastName AS EmployeeName, SUM({LINE}) AS total_sales,
+               COUNT(DISTINCT o.OrderID)
+        FROM Employees e
+        JOIN Orders o ON e.EmployeeID = o.EmployeeID
+        JOIN OrderDetails od ON o.OrderID = od.OrderID
+        WHERE {IN_RANGE} GROUP BY EmployeeName ORDER BY total_sales DESC""",
+    "geo_sales": f"""
+        SELECT o.ShipCountry AS country, SUM({LINE}) AS total_sales
+        FROM Orders o JOIN OrderDetails od ON o.OrderID = od.OrderID
+        WHERE {IN_RANGE} GROUP BY country ORDER BY total_sales DESC""",
+}
+RANGES = [("2024-01-01", "2024-12-31"), ("2022-03-15", "2022-03-15"), ("2000-01-01", "2100-01-01")]
+
+
+def _rounded(value):
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, (list, tuple)):
+        return [_rounded(item) for item in value]
+    return value
+
+
+def snapshot(conn: sqlite3.Connection, start: str, end: str):
+    results = {
+        "dimensions": load_dimensions(conn),
+        "sales": scan_sales(conn, start, end),
+        "orders": scan_orders(conn, start, end),
+    }
+    return build_snapshot(results)
+
+
+def assert_matches_baseline(conn: sqlite3.Connection, start: str, end: str) -> None:
+    got = snapshot(conn, start, end)
+    for key, sql in BASELINE.items():
+        rows = conn.execute(sql, (start, end)).fetchall()
+        expected = rows[0][0] if key.startswith(("total_", "shipped_")) else rows
+        assert _rounded(got[key]) == _rounded(expected), key
+    assert got["total_products"] == conn.execute("SELECT COUNT(*) FROM Products").fetchone()[0]
+
+
+@pytest.mark.parametrize("start,end", RANGES)
+def test_matches_per_widget_queries(database, start, end):
+    conn = sqlite3.connect(database)
+    try:
+        assert_matches_baseline(conn, start, end)
+    finally:
+        conn.close()
+
+
+def test_two_scans_per_load(database):
+    conn = sqlite3.connect(database)
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        snapshot(conn, *RANGES[0])
+    finally:
+        conn.close()
+    # Products, customers and employees lookups, then the two scans.
+    assert len(statements) == 5
+
+
+def test_end_date_and_orders_without_lines(writer):
+    customer = writer.execute("SELECT MIN(CustomerID) FROM Customers").fetchone()[0]
+    top = writer.execute("SELECT MAX(OrderID) FROM Orders").fetchone()[0]
+    # Stamped with a time on the end date: in revenue and in the order counts.
+    writer.execute(
+        "INSERT INTO Orders (OrderID, CustomerID, EmployeeID, OrderDate, ShipCountry)"
+        " VALUES (?, ?, 1, '2024-12-31 18:30:00', 'Spain')",
+        (top + 1, customer),
+    )
+    writer.execute(
+        "INSERT INTO OrderDetails (OrderID, ProductID, UnitPrice, Quantity, Discount) VALUES (?, 1, 1000000, 1, 0)",
+        (top + 1,),
+    )
+    # No lines: counted as an order, not in the customer and employee rankings.
+    writer.execute(
+        "INSERT INTO Orders (OrderID, CustomerID, EmployeeID, OrderDate) VALUES (?, ?, 1, '2024-06-01')",
+        (top + 2, customer),
+    )
+    assert_matches_baseline(writer, "2024-01-01", "2024-12-31")
+    got = snapshot(writer, "2024-01-01", "2024-12-31")
+    name = writer.execute("SELECT CompanyName FROM Customers WHERE CustomerID = ?", (customer,)).fetchone()[0]
+    assert got["top_customers"][0][0] == name
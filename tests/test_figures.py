@@ -0,0 +1,53 @@
+"""The geo sales choropleth is built and serialized once per distinct set of rows."""
+import json
+
+import pytest
+
+pytest.importorskip("plotly")
+pytest.importorskip("reflex")
+import plotly.io as pio
+from reflex.utils.serializers import serialize
+
+from app.components import figures
+from app.components.figures import MAX_FIGURES, clear_figures, geo_sales_figure
+
+ROWS = [{"country": "Germany", "sales": 1250.5}, {"country": "France", "sales": 980.0}]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_figures()
+    yield
+    clear_figures()
+
+
+def test_same_rows_share_one_figure(monkeypatch):
+    builds = []
+    build = figures._geo_sales_figure
+    monkeypatch.setattr(figures, "_geo_sales_figure", lambda rows: builds.append(rows) or build(rows))
+    first = geo_sales_figure(ROWS)
+    assert geo_sales_figure([dict(row) for row in ROWS]) is first
+    assert geo_sales_figure(ROWS[:1]) is not first
+    assert len(builds) == 2
+
+
+def test_serialized_once_as_plotly_json():
+    figure = geo_sales_figure(ROWS)
+    payload = serialize(figure)
+    assert payload is figure._plotly_json
+    assert payload == json.loads(pio.to_json(figure, validate=False))
+    (trace,) = payload["data"]
+    assert trace["type"] == "choropleth" and trace["locationmode"] == "country names"
+    assert list(trace["locations"]) == ["Germany", "France"] and list(trace["z"]) == [1250.5, 980.0]
+
+
+def test_no_rows():
+    assert serialize(geo_sales_figure([]))["data"] == []
+
+
+def test_cache_is_bounded():
+    kept = [geo_sales_figure([{"country": "Spain", "sales": float(n)}]) for n in range(MAX_FIGURES + 5)]
+    assert len(figures._figures) == MAX_FIGURES
+    # The oldest were evicted and are rebuilt; the newest are still shared.
+    assert geo_sales_figure([{"country": "Spain", "sales": 0.0}]) is not kept[0]
+    assert geo_sales_figure([{"country": "Spain", "sales": float(MAX_FIGURES + 4)}]) is kept[-1]
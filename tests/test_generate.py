@@ -0,0 +1,84 @@
+"""The generator is reproducible from its seed and writes consistent, migrated data."""
+import hashlib
+import sqlite3
+
+import pytest
+
+from app.db.generate import END_DATE, ORDERS_PER_SCALE, START_DATE, generate
+from app.db.migrations import MIGRATIONS
+
+
+def _digest(path: str) -> str:
+    conn = sqlite3.connect(path)
+    try:
+        digest = hashlib.sha256()
+        for table in ("Customers", "Products", "Orders", "OrderDetails"):
+            for row in conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2"):
+                digest.update(repr(row).encode())
+        return digest.hexdigest()
+    finally:
+        conn.close()
+
+
+def _value(conn: sqlite3.Connection, sql: str):
+    return conn.execute(sql).fetchone()[0]
+
+
+@pytest.fixture(scope="module")
+def reader(database):
+    conn = sqlite3.connect(database)
+    yield conn
+    conn.close()
+
+
+def test_same_seed_same_data(tmp_path):
+    paths = [str(tmp_path / name) for name in ("a.db", "b.db", "c.db")]
+    generate(paths[0], scale=1, seed=3)
+    generate(paths[1], scale=1, seed=3)
+    generate(paths[2], scale=1, seed=4)
+    assert _digest(paths[0]) == _digest(paths[1]) != _digest(paths[2])
+
+
+def test_scale_and_counts(tmp_path):
+    path = str(tmp_path / "sf2.db")
+    counts = generate(path, scale=2, seed=1, chunk_orders=500)
+    conn = sqlite3.connect(path)
+    try:
+        for table, rows in counts.items():
+            assert _value(conn, f"SELECT COUNT(*) FROM {table}") == rows, table
+        assert counts["Orders"] == 2 * ORDERS_PER_SCALE
+        assert _value(conn, "SELECT MAX(Version) FROM SchemaMigrations") == MIGRATIONS[-1][0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("scale", [0, 10_001])
+def test_scale_out_of_range(tmp_path, scale):
+    with pytest.raises(ValueError):
+        generate(str(tmp_path / "bad.db"), scale=scale)
+
+
+def test_orders_are_consistent(reader):
+    assert _value(reader, "SELECT COUNT(*) FROM Orders WHERE OrderID NOT IN (SELECT OrderID FROM OrderDetails)") == 0
+    assert _value(
+        reader,
+        f"SELECT COUNT(*) FROM Orders WHERE OrderDate NOT BETWEEN '{START_DATE}' AND '{END_DATE}'"
+        " OR ShippedDate <= OrderDate OR RequiredDate <= OrderDate",
+    ) == 0
+    # Shipped to the customer's own city and country, not a placeholder.
+    assert _value(
+        reader,
+        "SELECT COUNT(*) FROM Orders o JOIN Customers c USING (CustomerID)"
+        " WHERE o.ShipCity IS NOT c.City OR o.ShipCountry IS NOT c.Country",
+    ) == 0
+    assert _value(reader, "SELECT COUNT(DISTINCT ShipCountry) FROM Orders") > 5
+    assert _value(reader, "SELECT COUNT(*) FROM OrderDetails WHERE Quantity < 1 OR Discount NOT BETWEEN 0 AND 1") == 0
+
+
+def test_lines_reference_existing_products(reader):
+    assert _value(reader, "SELECT COUNT(*) FROM OrderDetails WHERE ProductID NOT IN (SELECT ProductID FROM Products)") == 0
+    assert _value(
+        reader,
+        "SELECT COUNT(*) FROM Orders WHERE CustomerID NOT IN (SELECT CustomerID FROM Customers)"
+        " OR EmployeeID NOT IN (SELECT EmployeeID FROM Employees)",
+    ) == 0
@@ -0,0 +1,69 @@
+"""Headline metrics: the original aggregates, computed once per data version."""
+import pytest
+
+from app.db.storage import open_reader
+from app.queries import metrics
+from app.queries.metrics import METRICS, MetricsService
+
+BASELINE = {
+    "total_revenue": "SELECT SUM(UnitPrice * Quantity * (1 - Discount)) FROM OrderDetails",
+    "total_orders": "SELECT COUNT(*) FROM Orders",
+    "shipped_orders": "SELECT COUNT(*) FROM Orders WHERE ShippedDate IS NOT NULL",
+    "pending_orders": "SELECT COUNT(*) FROM Orders WHERE ShippedDate IS NULL",
+    "total_customers": "SELECT COUNT(*) FROM Customers",
+    "total_products": "SELECT COUNT(*) FROM Products",
+    "countries_served": "SELECT COUNT(DISTINCT Country) FROM Customers",
+}
+
+
+class Version:
+    """Stands in for the query cache's data version."""
+
+    def __init__(self):
+        self.value = 1
+
+    def data_version(self) -> int:
+        return self.value
+
+
+@pytest.fixture
+def version(monkeypatch) -> Version:
+    version = Version()
+    monkeypatch.setattr(metrics, "get_cache", lambda: version)
+    return version
+
+
+@pytest.fixture(scope="module")
+def reader(database):
+    conn = open_reader(database)
+    yield conn
+    conn.close()
+
+
+def test_values_match_the_original_aggregates(reader, version):
+    service = MetricsService()
+    assert set(METRICS) == set(BASELINE)
+    for name, sql in BASELINE.items():
+        assert service.get(reader, name) == pytest.approx(reader.execute(sql).fetchone()[0]), name
+
+
+def test_computed_once_per_data_version(reader, version):
+    service = MetricsService()
+    statements = []
+    reader.set_trace_callback(statements.append)
+    try:
+        for _ in range(3):
+            service.get(reader, "total_revenue")
+            service.get(reader, "total_orders")
+        assert len(statements) == 2
+        assert service.cached(("total_revenue", "total_orders")) is not None
+        assert service.cached(("total_products",)) is None
+
+        version.value = 2
+        assert service.cached(("total_revenue",)) is None
+        service.get(reader, "total_revenue")
+        assert len(statements) == 3
+    finally:
+        reader.set_trace_callback(None)
+    # One entry per metric name, whatever was asked before.
+    assert len(service._values) <= len(METRICS)
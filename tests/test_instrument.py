@@ -0,0 +1,77 @@
+"""Slow-query records stay bounded and opt-in, and failed queries are recorded too."""
+import json
+import sqlite3
+
+import pytest
+
+from app.db import instrument
+from app.db.instrument import MAX_STATEMENTS, StatementTrace
+
+
+def test_trace_skips_sub_statements_and_duplicates():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.executescript(
+        """
+        CREATE TABLE t (x);
+        CREATE TABLE log (x);
+        CREATE TRIGGER t_log AFTER INSERT ON t BEGIN INSERT INTO log VALUES (NEW.x); END;
+        """
+    )
+    trace = StatementTrace()
+    conn.set_trace_callback(trace)
+    for _ in range(3):
+        conn.execute("INSERT INTO t VALUES (1)")
+    conn.set_trace_callback(None)
+    assert trace.statements == ["INSERT INTO t VALUES (1)"]
+    assert trace.omitted == 0
+
+
+def test_trace_is_capped():
+    trace = StatementTrace()
+    for value in range(MAX_STATEMENTS + 5):
+        trace(f"SELECT {value}")
+    assert len(trace.statements) == MAX_STATEMENTS
+    assert trace.omitted == 5
+
+
+def test_log_rotates(tmp_path, monkeypatch):
+    log = str(tmp_path / "slow.jsonl")
+    monkeypatch.setattr(instrument, "SLOW_QUERY_LOG", log)
+    monkeypatch.setattr(instrument, "SLOW_QUERY_LOG_MAX_BYTES", 1000)
+    line = json.dumps({"sql": "x" * 300})
+    for _ in range(10):
+        instrument._append_log(line)
+    assert (tmp_path / "slow.jsonl").stat().st_size <= 1000
+    assert (tmp_path / "slow.jsonl.1").stat().st_size <= 1000
+
+
+def _failing(conn: sqlite3.Connection) -> None:
+    conn.execute("SELECT 1").fetchall()
+    conn.execute("SELECT * FROM missing").fetchall()
+
+
+def test_failed_query_is_reported_and_logged(tmp_path, monkeypatch):
+    log = tmp_path / "slow.jsonl"
+    monkeypatch.setattr(instrument, "SLOW_QUERY_LOG", str(log))
+    monkeypatch.setattr(instrument, "SLOW_QUERY_MS", 0)
+    records = []
+    instrument.subscribe(on_query=records.append)
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            instrument.timed(sqlite3.connect(":memory:"), "failing", "Handler.fn", _failing)
+    finally:
+        instrument.unsubscribe(records.append)
+    assert [(record["label"], record["rows"], record["error"]) for record in records] == [("failing", None, True)]
+    (entry,) = [json.loads(line) for line in log.read_text().splitlines()]
+    assert entry["error"].startswith("OperationalError: no such table")
+    # A statement that fails to prepare never reaches the trace; the error names it.
+    assert [statement["sql"] for statement in entry["statements"]] == ["SELECT 1"]
+
+
+def test_log_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(instrument, "SLOW_QUERY_LOG", "")
+    monkeypatch.setattr(instrument, "SLOW_QUERY_MS", 0)
+    conn = sqlite3.connect(":memory:")
+    assert instrument.timed(conn, "select", None, lambda conn: conn.execute("SELECT 1").fetchall()) == [(1,)]
+    assert list(tmp_path.iterdir()) == []
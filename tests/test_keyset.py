@@ -0,0 +1,78 @@
+"""Keyset paging of /orders must return the same rows as ORDER BY ... LIMIT / OFFSET."""
+import asyncio
+import random
+import sqlite3
+
+import pytest
+
+from app.db.summary import SORT_COLUMNS
+from app.queries.orders import BOUNDARY_STRIDE, OrderQuery, fetch_order_page
+
+PAGE_SIZE = 10
+FILTERS = [("", "All"), ("", "Pending"), ("an", "Shipped"), ("ber", "All"), ("a", "Pending")]
+
+
+def _offset_page(conn: sqlite3.Connection, query: OrderQuery, page: int) -> list[int]:
+    clauses, params = query.where()
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    return [
+        row[0]
+        for row in conn.execute(
+            f"SELECT OrderID FROM OrderSummary{where} ORDER BY {query.order_by()} LIMIT ? OFFSET ?",
+            [*params, query.page_size, (page - 1) * query.page_size],
+        )
+    ]
+
+
+def _count(conn: sqlite3.Connection, query: OrderQuery) -> int:
+    clauses, params = query.where()
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    return conn.execute(f"SELECT COUNT(*) FROM OrderSummary{where}", params).fetchone()[0]
+
+
+@pytest.mark.parametrize("descending", [True, False], ids=["desc", "asc"])
+@pytest.mark.parametrize("sort_by", list(SORT_COLUMNS))
+def test_random_walk_matches_offset(database, sort_by, descending):
+    conn = sqlite3.connect(database)
+    rnd = random.Random(f"{sort_by}-{descending}")
+
+    async def walk(query: OrderQuery) -> None:
+        total = _count(conn, query)
+        last = max(1, -(-total // PAGE_SIZE))
+        cursor, page = None, 1
+        # Far enough to cross several sparse page boundaries.
+        moves = ["next", "prev", "same", "jump", "far"]
+        for _ in range(30):
+            move = rnd.choice(moves)
+            page = {
+                "next": page + 1,
+                "prev": page - 1,
+                "same": page,
+                "jump": rnd.randint(1, last),
+                "far": page + BOUNDARY_STRIDE + 1,
+            }[move]
+            page = min(max(1, page), last)
+            result = await fetch_order_page(query, page, cursor)
+            cursor = result["cursor"]
+            assert result["page"] == page
+            assert result["total"] == total
+            got = [row["order_id"] for row in result["rows"]]
+            assert got == _offset_page(conn, query, page), (query, move, page)
+
+    try:
+        for search, status in FILTERS:
+            asyncio.run(walk(OrderQuery(search, status, sort_by, descending, PAGE_SIZE)))
+    finally:
+        conn.close()
+
+
+def test_last_page_and_beyond(database):
+    conn = sqlite3.connect(database)
+    try:
+        query = OrderQuery("", "All", "order_date", True, PAGE_SIZE)
+        last = -(-_count(conn, query) // PAGE_SIZE)
+        result = asyncio.run(fetch_order_page(query, last + 5))
+        assert result["page"] == last
+        assert [row["order_id"] for row in result["rows"]] == _offset_page(conn, query, last)
+    finally:
+        conn.close()
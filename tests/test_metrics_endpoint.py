@@ -0,0 +1,95 @@
+"""/metrics serves handler and query latencies, cache, pool and session figures."""
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("starlette.testclient")
+from starlette.testclient import TestClient
+
+from app import metrics
+from app.db.instrument import timed, timed_handler
+from app.metrics import CONTENT_TYPE, Histogram, create_metrics_app, render
+
+
+def _samples(text: str) -> dict[str, float]:
+    """``name{labels}`` -> value of every sample line."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+class MetricsProbe:
+    @timed_handler
+    async def probe_ok(self):
+        return "ok"
+
+    @timed_handler
+    async def probe_fails(self):
+        raise RuntimeError("boom")
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("t_seconds", "Test.", "key", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe("a", value)
+    samples = _samples("\n".join(histogram.render()))
+    assert samples['t_seconds_bucket{key="a",le="0.1"}'] == 1
+    assert samples['t_seconds_bucket{key="a",le="1.0"}'] == 2
+    assert samples['t_seconds_bucket{key="a",le="+Inf"}'] == 3
+    assert samples['t_seconds_count{key="a"}'] == 3
+    assert samples['t_seconds_sum{key="a"}'] == pytest.approx(5.55)
+
+
+def test_handlers_and_queries_are_recorded():
+    probe = MetricsProbe()
+    before = _samples(render())
+    asyncio.run(probe.probe_ok())
+    with pytest.raises(RuntimeError):
+        asyncio.run(probe.probe_fails())
+    conn = sqlite3.connect(":memory:")
+    timed(conn, "metrics.probe", None, lambda conn: conn.execute("VALUES (1), (2), (3)").fetchall())
+
+    after = _samples(render())
+
+    def grew(name: str) -> float:
+        return after.get(name, 0) - before.get(name, 0)
+
+    ok, fails = MetricsProbe.probe_ok.__qualname__, MetricsProbe.probe_fails.__qualname__
+    assert grew(f'northwind_handler_duration_seconds_count{{handler="{ok}"}}') == 1
+    assert grew(f'northwind_handler_duration_seconds_count{{handler="{fails}"}}') == 1
+    assert grew(f'northwind_handler_errors_total{{handler="{fails}"}}') == 1
+    assert grew(f'northwind_handler_errors_total{{handler="{ok}"}}') == 0
+    assert grew('northwind_query_duration_seconds_count{label="metrics.probe"}') == 1
+    assert grew('northwind_query_rows_total{label="metrics.probe"}') == 3
+    assert after[f'northwind_handlers_in_flight{{handler="{ok}"}}'] == 0
+
+
+def test_endpoint(monkeypatch):
+    monkeypatch.setattr(metrics, "STATE_SIZE_INTERVAL", 0)
+    sessions = {token: {"rows": list(range(size))} for token, size in (("a", 10), ("b", 1000))}
+    app = SimpleNamespace(state_manager=SimpleNamespace(states=sessions))
+    client = TestClient(create_metrics_app(lambda: app))
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    samples = _samples(response.text)
+    for name in (
+        "northwind_query_cache_hit_ratio",
+        'northwind_pool_connections{state="open"}',
+        "northwind_pool_waits_total",
+    ):
+        assert name in samples, name
+    assert samples["northwind_sessions"] == 2
+    assert 0 < samples['northwind_session_state_bytes{stat="mean"}'] < samples['northwind_session_state_bytes{stat="max"}']
+
+
+def test_endpoint_without_sessions():
+    response = TestClient(create_metrics_app()).get("/metrics")
+    assert response.status_code == 200
+    assert "northwind_sessions" not in _samples(response.text)
@@ -0,0 +1,59 @@
+"""migrate() is idempotent, including when several workers start at once, and
+the hot-path queries are answered from the indexes it adds."""
+import sqlite3
+
+import pytest
+
+from app.db import migrations
+from app.db.migrations import MIGRATIONS, migrate
+
+
+# Hot-path query -> index its plan must search.
+PLANS = {
+    "SELECT COUNT(*) FROM Orders WHERE OrderDate BETWEEN '2024-01-01' AND '2024-03-31'": "idx_orders_orderdate",
+    "SELECT MAX(OrderDate) FROM Orders WHERE CustomerID = 'ALFKI' AND OrderDate >= '2024-01-01'": "idx_orders_customer_date",
+    "SELECT COUNT(*) FROM Orders WHERE EmployeeID = 3 AND OrderDate >= '2024-01-01'": "idx_orders_employee_date",
+    "SELECT COUNT(*) FROM Orders WHERE ShippedDate IS NULL": "idx_orders_shippeddate",
+    "SELECT SUM(LineTotal) FROM OrderDetails WHERE OrderID = 10248": "idx_orderdetails_order_linetotal",
+    "SELECT SUM(LineTotal), COUNT(DISTINCT OrderID) FROM OrderDetails WHERE ProductID = 11": "idx_orderdetails_product_linetotal",
+}
+
+
+def _recorded(path: str) -> list[int]:
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute("SELECT Version FROM SchemaMigrations ORDER BY Version")]
+    finally:
+        conn.close()
+
+
+def test_migrate_again_is_a_no_op(writer):
+    path = writer.execute("PRAGMA database_list").fetchone()[2]
+    latest = MIGRATIONS[-1][0]
+    assert _recorded(path) == [version for version, _, _ in MIGRATIONS]
+    assert migrate(path) == latest
+    assert _recorded(path) == [version for version, _, _ in MIGRATIONS]
+
+
+def test_version_applied_by_another_worker_is_skipped(writer, monkeypatch):
+    # Another worker applied every version between our read and our BEGIN IMMEDIATE.
+    path = writer.execute("PRAGMA database_list").fetchone()[2]
+    monkeypatch.setattr(migrations, "applied_versions", lambda conn: [])
+    assert migrate(path) == MIGRATIONS[-1][0]
+    assert _recorded(path) == [version for version, _, _ in MIGRATIONS]
+
+
+def test_missing_database(tmp_path):
+    assert migrate(str(tmp_path / "missing.db")) == 0
+
+
+@pytest.mark.parametrize("sql", PLANS)
+def test_hot_paths_search_their_index(database, sql):
+    conn = sqlite3.connect(database)
+    try:
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+    finally:
+        conn.close()
+    steps = [step for step in plan if step.startswith(("SEARCH", "SCAN"))]
+    # Covering, so the table itself is never visited.
+    assert len(steps) == 1 and f"USING COVERING INDEX {PLANS[sql]} (" in steps[0], plan
@@ -0,0 +1,54 @@
+"""The pool hands out a bounded number of read-only connections and reuses them."""
+import sqlite3
+import threading
+
+import pytest
+
+from app.db.pool import ConnectionPool
+
+
+@pytest.fixture
+def pool(database):
+    pool = ConnectionPool(database, size=2, timeout=0.05)
+    yield pool
+    pool.close()
+
+
+def test_connections_are_reused(pool):
+    for _ in range(5):
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM Orders").fetchone()[0] > 0
+    stats = pool.stats()
+    assert (stats["open_connections"], stats["checkouts"], stats["misses"], stats["hits"]) == (1, 5, 1, 4)
+    assert stats["hit_rate"] == 0.8
+
+
+def test_connections_are_read_only(pool):
+    with pool.connection() as conn:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            conn.execute("DELETE FROM Orders")
+
+
+def test_release_ends_an_open_transaction(pool):
+    with pool.connection() as conn:
+        conn.execute("BEGIN")
+        conn.execute("SELECT 1 FROM Orders LIMIT 1").fetchone()
+    with pool.connection() as again:
+        assert again is conn and not again.in_transaction
+
+
+def test_exhausted_pool_waits_then_times_out(pool):
+    held = [pool.acquire(), pool.acquire()]
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    # A connection given back while a caller waits goes to that caller.
+    threading.Timer(0.01, pool.release, (held[0],)).start()
+    pool.timeout = 5
+    assert pool.acquire() is held[0]
+
+    stats = pool.stats()
+    assert (stats["open_connections"], stats["waits"], stats["timeouts"]) == (2, 2, 1)
+    assert stats["wait_time"] > 0
+    for conn in held:
+        pool.release(conn)
@@ -0,0 +1,60 @@
+"""SQL paging of the /products catalog must show what the in-session filter and sort did."""
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.db.catalog import SORT_COLUMNS
+from app.queries.products import SELECT_PAGE, ProductQuery, fetch_product_page
+
+PAGE_SIZE = 12
+FILTERS = [("", "All"), ("ch", "All"), ("che", "All"), ("", "Beverages"), ("an", "Seafood"), ("", "Uncategorized")]
+
+
+@pytest.fixture(scope="module")
+def catalog(database) -> list[dict]:
+    conn = sqlite3.connect(database)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute(SELECT_PAGE)]
+    finally:
+        conn.close()
+
+
+def _expected(catalog: list[dict], query: ProductQuery) -> list[dict]:
+    """The baseline's filtered_products, with the product ID breaking ties."""
+    term = query.search.lower()
+    rows = [
+        row
+        for row in catalog
+        if (not term or any(term in row[key].lower() for key in ("product_name", "category_name", "supplier_name")))
+        and (query.category == "All" or row["category_name"] == query.category)
+    ]
+    return sorted(rows, key=lambda row: (row[query.sort_by], row["product_id"]), reverse=query.descending)
+
+
+def _page(query: ProductQuery, page: int):
+    result = asyncio.run(fetch_product_page(query, page))
+    return [dict(row) for row in result["rows"]], result["total"], result["page"]
+
+
+@pytest.mark.parametrize("descending", [False, True], ids=["asc", "desc"])
+@pytest.mark.parametrize("sort_by", SORT_COLUMNS)
+@pytest.mark.parametrize("search,category", FILTERS)
+def test_pages_match_the_in_session_sort(catalog, search, category, sort_by, descending):
+    query = ProductQuery(search, category, sort_by, descending, PAGE_SIZE)
+    expected = _expected(catalog, query)
+    pages = max(1, -(-len(expected) // PAGE_SIZE))
+    for page in range(1, pages + 1):
+        rows, total, got_page = _page(query, page)
+        assert (total, got_page) == (len(expected), page)
+        assert rows == expected[(page - 1) * PAGE_SIZE:page * PAGE_SIZE], page
+
+
+def test_page_is_clamped(catalog):
+    query = ProductQuery("", "All", "product_name", False, PAGE_SIZE)
+    last = -(-len(catalog) // PAGE_SIZE)
+    assert _page(query, last + 5)[2] == last
+    assert _page(query, 0)[2] == 1
+    empty = ProductQuery("zzzz", "All", "product_name", False, PAGE_SIZE)
+    assert _page(empty, 3) == ([], 0, 1)
@@ -0,0 +1,110 @@
+"""QueryGroup runs independent queries at once, on separate connections, as one snapshot."""
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.db import query
+from app.db.query import QueryGroup
+
+DELAY = 0.2
+
+
+class Tracker:
+    """Query functions that record which connection ran them and how many overlapped."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        # (connection, whether it was inside a transaction) per call.
+        self.calls: list[tuple[int, bool]] = []
+
+    def slow_count(self, conn: sqlite3.Connection, table: str) -> int:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.calls.append((id(conn), conn.in_transaction))
+        try:
+            time.sleep(DELAY)
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class MovingVersion:
+    """A data version that changes on every read, as if commits kept landing."""
+
+    def __init__(self):
+        self.value = 0
+
+    def data_version(self) -> int:
+        self.value += 1
+        return self.value
+
+
+def _group(tracker: Tracker, parallelism: int) -> QueryGroup:
+    group = QueryGroup(parallelism=parallelism)
+    for table in ("Orders", "Customers", "Products"):
+        group.run(table, tracker.slow_count, table)
+    return group
+
+
+@pytest.fixture
+def counts(database) -> dict[str, int]:
+    conn = sqlite3.connect(database)
+    try:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("Orders", "Customers", "Products")
+        }
+    finally:
+        conn.close()
+
+
+def test_fans_out_on_separate_connections(counts):
+    tracker = Tracker()
+    started = time.perf_counter()
+    results = asyncio.run(_group(tracker, parallelism=3).execute())
+    elapsed = time.perf_counter() - started
+    assert results == counts
+    assert tracker.peak == 3 and len({conn for conn, _ in tracker.calls}) == 3
+    # Set by the slowest query, not the sum of the three.
+    assert elapsed < 2 * DELAY
+
+
+def test_parallelism_is_bounded(counts):
+    tracker = Tracker()
+    assert asyncio.run(_group(tracker, parallelism=2).execute()) == counts
+    assert tracker.peak == 2
+
+
+def test_fetch_helpers_shape_results(database, counts):
+    conn = sqlite3.connect(database)
+    try:
+        first = [row[0] for row in conn.execute("SELECT OrderID FROM Orders ORDER BY OrderID LIMIT 2")]
+    finally:
+        conn.close()
+    group = (
+        QueryGroup()
+        .fetch_value("orders", "SELECT COUNT(*) FROM Orders")
+        .fetch_value("none", "SELECT MAX(OrderID) FROM Orders WHERE OrderID < 0", default=0)
+        .fetch_all("ids", "SELECT OrderID FROM Orders ORDER BY OrderID LIMIT ?", (2,))
+    )
+    results = asyncio.run(group.execute())
+    assert results["orders"] == counts["Orders"] and results["none"] == 0
+    assert [row[0] for row in results["ids"]] == first
+
+
+def test_falls_back_to_one_serial_snapshot(counts, monkeypatch):
+    monkeypatch.setattr(query, "get_cache", MovingVersion)
+    tracker = Tracker()
+    assert asyncio.run(_group(tracker, parallelism=3).execute()) == counts
+    # (retries + 1) fanned-out attempts, then every query in one transaction on one connection.
+    attempts = 3 * (QueryGroup().retries + 1)
+    serial = tracker.calls[attempts:]
+    assert len(serial) == 3 and len({conn for conn, _ in serial}) == 1
+    assert all(in_transaction for _, in_transaction in serial)
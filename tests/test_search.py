@@ -0,0 +1,112 @@
+"""Search clauses must answer the baseline's case-insensitive substring check."""
+import sqlite3
+
+import pytest
+
+from app.db.search import (
+    CUSTOMER_SEARCH_COLUMNS,
+    PRODUCT_SEARCH_COLUMNS,
+    SEARCH_COLUMNS,
+    customer_search_clause,
+    product_search_clause,
+    search_clause,
+)
+from app.db.storage import open_reader
+
+TERMS = ["a", "AN", "ber", "Ber", "lyon", "%", "_", "\\", "é", "zzzz"]
+
+
+def _matching(conn: sqlite3.Connection, table: str, key: str, clause: str, params) -> set:
+    return {row[0] for row in conn.execute(f"SELECT {key} FROM {table} WHERE {clause}", params)}
+
+
+def _expected(conn: sqlite3.Connection, index: str, key: str, columns: tuple[str, ...], term: str) -> set:
+    rows = conn.execute(f"SELECT {key}, {', '.join(columns)} FROM {index}")
+    return {row[0] for row in rows if any(term.lower() in (value or "").lower() for value in row[1:])}
+
+
+@pytest.fixture(scope="module")
+def reader(database):
+    conn = open_reader(database)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("per_row", [False, True])
+@pytest.mark.parametrize("term", TERMS)
+def test_order_search(reader, term, per_row):
+    clause, params = search_clause(term, "o.OrderID", per_row)
+    got = _matching(reader, "Orders o", "o.OrderID", clause, params)
+    assert got == _expected(reader, "OrderSearch", "rowid", SEARCH_COLUMNS, term)
+
+
+@pytest.mark.parametrize("per_row", [False, True])
+@pytest.mark.parametrize("term", TERMS)
+def test_product_search(reader, term, per_row):
+    clause, params = product_search_clause(term, "p.ProductID", per_row)
+    got = _matching(reader, "Products p", "p.ProductID", clause, params)
+    assert got == _expected(reader, "ProductSearch", "rowid", PRODUCT_SEARCH_COLUMNS, term)
+
+
+@pytest.mark.parametrize("per_row", [False, True])
+@pytest.mark.parametrize("term", TERMS)
+def test_customer_search(reader, term, per_row):
+    clause, params = customer_search_clause(term, "c.rowid", per_row)
+    got = _matching(reader, "Customers c", "c.rowid", clause, params)
+    assert got == _expected(reader, "Customers", "rowid", CUSTOMER_SEARCH_COLUMNS, term)
+
+
+def test_product_wildcards_match_literally(writer):
+    writer.execute("UPDATE Products SET ProductName = '100% Cotton_Tee' WHERE ProductID = 1")
+    for term in ("%", "_", "% c", "n_t"):
+        clause, params = product_search_clause(term, "p.ProductID")
+        assert _matching(writer, "Products p", "p.ProductID", clause, params) == {1}, term
+
+
+def test_customer_wildcards_match_literally(writer):
+    customer = writer.execute("SELECT MIN(CustomerID) FROM Customers").fetchone()[0]
+    writer.execute("UPDATE Customers SET ContactName = 'Ana_Maria 50%' WHERE CustomerID = ?", (customer,))
+    for term in ("%", "_", "0%", "a_m"):
+        clause, params = customer_search_clause(term, "c.rowid")
+        assert _matching(writer, "Customers c", "c.CustomerID", clause, params) == {customer}, term
+
+
+def test_non_ascii_case_folding(writer):
+    writer.execute("UPDATE Products SET ProductName = 'Émincé' WHERE ProductID = 1")
+    for term in ("é", "É", "ém", "ÉM", "émincé", "ÉMINCÉ"):
+        clause, params = product_search_clause(term, "p.ProductID")
+        assert 1 in _matching(writer, "Products p", "p.ProductID", clause, params), term
+
+
+def test_order_index_follows_customers(writer):
+    writer.execute(
+        "UPDATE Customers SET CompanyName = 'Quixotic Traders'"
+        " WHERE CustomerID = (SELECT CustomerID FROM Orders WHERE OrderID = (SELECT MIN(OrderID) FROM Orders))"
+    )
+    clause, params = search_clause("quixotic", "o.OrderID")
+    expected = {
+        row[0]
+        for row in writer.execute(
+            "SELECT OrderID FROM Orders o JOIN Customers c USING (CustomerID) WHERE c.CompanyName = 'Quixotic Traders'"
+        )
+    }
+    assert expected and _matching(writer, "Orders o", "o.OrderID", clause, params) == expected
+
+
+def test_product_index_follows_categories(writer):
+    writer.execute("UPDATE Categories SET CategoryName = 'Xylophones' WHERE CategoryID = 1")
+    clause, params = product_search_clause("xylo", "p.ProductID")
+    expected = {row[0] for row in writer.execute("SELECT ProductID FROM Products WHERE CategoryID = 1")}
+    assert _matching(writer, "Products p", "p.ProductID", clause, params) == expected
+
+
+def test_customer_index_follows_customers(writer):
+    customer = writer.execute("SELECT MIN(CustomerID) FROM Customers").fetchone()[0]
+    writer.execute("UPDATE Customers SET CompanyName = 'Quixotic Traders' WHERE CustomerID = ?", (customer,))
+    writer.execute("UPDATE Customers SET CustomerID = 'ZZKEY', City = NULL WHERE CustomerID = ?", (customer,))
+    writer.execute("INSERT INTO Customers (CustomerID, CompanyName) VALUES ('ZZNEW', 'Quixotic Two')")
+    writer.execute("DELETE FROM Customers WHERE CustomerID = (SELECT MAX(CustomerID) FROM Customers WHERE CustomerID < 'ZZ')")
+    # External content: the index must hold exactly what Customers holds.
+    writer.execute("INSERT INTO CustomerSearch (CustomerSearch, rank) VALUES ('integrity-check', 1)")
+    clause, params = customer_search_clause("quixotic", "c.rowid")
+    assert _matching(writer, "Customers c", "c.CustomerID", clause, params) == {"ZZKEY", "ZZNEW"}
@@ -0,0 +1,87 @@
+"""Customer scores: consistent segments and top-K, kept per data version outside the query cache."""
+import asyncio
+import sqlite3
+
+import numpy as np
+import pytest
+
+from app.db import query
+from app.db.cache import QueryCache
+from app.db.query import QueryGroup
+from app.queries import segments
+from app.queries.segments import NEW, REGULAR, SCORE_BINS, VIP, current_customer_scores, load_customer_scores
+
+BASELINE = """
+    SELECT c.CustomerID, COUNT(DISTINCT o.OrderID),
+           COALESCE(SUM(od.UnitPrice * od.Quantity * (1 - od.Discount)), 0)
+    FROM Customers c
+    LEFT JOIN Orders o ON c.CustomerID = o.CustomerID
+    LEFT JOIN OrderDetails od ON o.OrderID = od.OrderID
+    GROUP BY c.CustomerID ORDER BY c.CustomerID
+"""
+
+
+@pytest.fixture(scope="module")
+def conn(database):
+    conn = sqlite3.connect(database)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def scores(conn):
+    return load_customer_scores(conn)
+
+
+def test_totals_match_the_baseline(conn, scores):
+    rows = conn.execute(BASELINE).fetchall()
+    assert scores.customer_id == [row[0] for row in rows]
+    assert scores.orders.tolist() == [row[1] for row in rows]
+    assert np.allclose(scores.revenue, [row[2] for row in rows])
+
+
+def test_segments_follow_scores(scores):
+    active = scores.orders > 0
+    assert (scores.segment == NEW).tolist() == (~active).tolist()
+    for score in (scores.recency, scores.frequency, scores.monetary):
+        assert (score[~active] == 0).all() and set(score[active].tolist()) <= set(range(1, SCORE_BINS + 1))
+    vip = scores.segment == VIP
+    assert vip.tolist() == (active & (scores.revenue >= scores.vip_revenue)).tolist()
+    assert vip.tolist() == (scores.monetary == SCORE_BINS).tolist()
+    assert ((scores.segment == REGULAR) == (active & ~vip)).all()
+    # Monetary score never drops as revenue grows.
+    order = np.argsort(scores.revenue[active], kind="stable")
+    assert (np.diff(scores.monetary[active][order]) >= 0).all()
+    assert 0.1 < vip.sum() / active.sum() <= 0.25
+
+
+def test_top_k(scores):
+    expected = sorted(range(len(scores.clv)), key=lambda index: -scores.clv[index])[:10]
+    assert scores.top(10).tolist() == expected
+    assert scores.top(0).tolist() == []
+    assert len(scores.top(10_000)) == len(scores.clv)
+
+
+def test_summary_adds_up(scores):
+    summary = scores.segment_summary()
+    assert sum(row["count"] for row in summary) == len(scores.customer_id)
+    assert sum(row["total_revenue"] for row in summary) == pytest.approx(scores.revenue.sum())
+
+
+def test_scores_stay_out_of_the_query_cache(database, monkeypatch):
+    cache = QueryCache(database, max_bytes=64 * 1024 * 1024, ttl=300)
+    monkeypatch.setattr(query, "QUERY_CACHE_ENABLED", True)
+    monkeypatch.setattr(query, "get_cache", lambda: cache)
+    monkeypatch.setattr(segments, "get_cache", lambda: cache)
+    monkeypatch.setattr(segments, "_scores_cache", None)
+    loads = []
+    monkeypatch.setattr(segments, "load_customer_scores", lambda conn: loads.append(1) or load_customer_scores(conn))
+
+    async def both_pages():
+        # /analytics through its query group, /customers directly.
+        results = await QueryGroup().run("customers", current_customer_scores, cache=False).execute()
+        return results["customers"], await segments.fetch_customer_scores()
+
+    analytics, customers = asyncio.run(both_pages())
+    assert analytics is customers and len(loads) == 1
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,203 @@
+"""Trigger-maintained tables must match a rebuild from the source tables after any change."""
+import sqlite3
+
+import pytest
+
+from app.db.facts import rebuild_daily_sales
+from app.db.rollup import rebuild_customer_rollup
+from app.db.summary import rebuild_order_counts, rebuild_order_summary
+
+# Table -> (rows to compare, rebuild). Rows a delta brought back to zero are
+# left behind by the triggers and never produced by a rebuild.
+DERIVED = {
+    "DailySales": ("SELECT * FROM DailySales WHERE LineCount != 0", rebuild_daily_sales),
+    "OrderSummary": ("SELECT * FROM OrderSummary", rebuild_order_summary),
+    "OrderCounts": ("SELECT * FROM OrderCounts WHERE Orders != 0", rebuild_order_counts),
+    "CustomerRollup": ("SELECT * FROM CustomerRollup", rebuild_customer_rollup),
+}
+
+
+def _rows(conn: sqlite3.Connection, sql: str) -> list[tuple]:
+    return sorted(
+        tuple(round(value, 6) + 0.0 if isinstance(value, float) else value for value in row)
+        for row in conn.execute(sql)
+    )
+
+
+def assert_consistent(conn: sqlite3.Connection) -> None:
+    maintained = {name: _rows(conn, sql) for name, (sql, _) in DERIVED.items()}
+    conn.execute("BEGIN")
+    try:
+        for name, (sql, rebuild) in DERIVED.items():
+            rebuild(conn)
+            assert _rows(conn, sql) == maintained[name], name
+    finally:
+        conn.execute("ROLLBACK")
+
+
+def _value(conn: sqlite3.Connection, sql: str, *params):
+    return conn.execute(sql, params).fetchone()[0]
+
+
+def _new_order(conn: sqlite3.Connection, customer: str, lines: int = 2) -> int:
+    order_id = _value(conn, "SELECT MAX(OrderID) FROM Orders") + 1
+    conn.execute(
+        "INSERT INTO Orders (OrderID, CustomerID, EmployeeID, OrderDate, ShipCity, ShipCountry)"
+        " VALUES (?, ?, 1, '2024-06-15', 'Lyon', 'France')",
+        (order_id, customer),
+    )
+    products = [row[0] for row in conn.execute("SELECT ProductID FROM Products ORDER BY ProductID LIMIT ?", (lines,))]
+    for product in products:
+        conn.execute(
+            "INSERT INTO OrderDetails (OrderID, ProductID, UnitPrice, Quantity, Discount) VALUES (?, ?, 12.5, 3, 0.05)",
+            (order_id, product),
+        )
+    return order_id
+
+
+def _any_line(conn: sqlite3.Connection) -> tuple[int, int]:
+    return conn.execute("SELECT OrderID, ProductID FROM OrderDetails ORDER BY OrderID, ProductID LIMIT 1").fetchone()
+
+
+def _new_customer(conn):
+    conn.execute("INSERT INTO Customers (CustomerID, CompanyName, City, Country) VALUES ('ZZNEW', 'Nouveau', 'Lyon', 'France')")
+    _new_order(conn, "ZZNEW")
+
+
+def _line_added_to_old_order(conn):
+    order_id = _value(conn, "SELECT MIN(OrderID) FROM Orders")
+    product = _value(
+        conn,
+        "SELECT MAX(ProductID) FROM Products WHERE ProductID NOT IN (SELECT ProductID FROM OrderDetails WHERE OrderID = ?)",
+        order_id,
+    )
+    conn.execute(
+        "INSERT INTO OrderDetails (OrderID, ProductID, UnitPrice, Quantity, Discount) VALUES (?, ?, 7, 2, 0)",
+        (order_id, product),
+    )
+
+
+def _lines_before_order(conn):
+    order_id = _value(conn, "SELECT MAX(OrderID) FROM Orders") + 1
+    customer = _value(conn, "SELECT MIN(CustomerID) FROM Customers")
+    conn.execute(
+        "INSERT INTO OrderDetails (OrderID, ProductID, UnitPrice, Quantity, Discount) VALUES (?, 1, 10, 2, 0)",
+        (order_id,),
+    )
+    conn.execute(
+        "INSERT INTO Orders (OrderID, CustomerID, EmployeeID, OrderDate, ShipCountry)"
+        " VALUES (?, ?, 1, '2024-05-05', 'Germany')",
+        (order_id, customer),
+    )
+
+
+def _line_repriced(conn):
+    conn.execute(
+        "UPDATE OrderDetails SET Quantity = Quantity + 5, Discount = 0.2 WHERE (OrderID, ProductID) = (?, ?)",
+        _any_line(conn),
+    )
+
+
+def _line_moved(conn):
+    order_id, product = _any_line(conn)
+    target = _value(
+        conn,
+        "SELECT MAX(OrderID) FROM Orders WHERE OrderID NOT IN (SELECT OrderID FROM OrderDetails WHERE ProductID = ?)",
+        product,
+    )
+    conn.execute("UPDATE OrderDetails SET OrderID = ? WHERE (OrderID, ProductID) = (?, ?)", (target, order_id, product))
+
+
+def _line_deleted(conn):
+    conn.execute("DELETE FROM OrderDetails WHERE (OrderID, ProductID) = (?, ?)", _any_line(conn))
+
+
+def _order_reassigned(conn):
+    order_id = _value(conn, "SELECT MIN(OrderID) FROM Orders")
+    customer = _value(conn, "SELECT MAX(CustomerID) FROM Customers")
+    conn.execute(
+        "UPDATE Orders SET CustomerID = ?, EmployeeID = 2, OrderDate = '2021-02-03', ShipCountry = 'Peru' WHERE OrderID = ?",
+        (customer, order_id),
+    )
+
+
+def _order_shipped(conn):
+    conn.execute(
+        "UPDATE Orders SET ShippedDate = '2024-12-01'"
+        " WHERE OrderID = (SELECT MIN(OrderID) FROM Orders WHERE ShippedDate IS NULL)"
+    )
+
+
+def _order_deleted(conn):
+    order_id = _value(conn, "SELECT MAX(OrderID) FROM Orders WHERE OrderID < (SELECT MAX(OrderID) FROM Orders)")
+    conn.execute("DELETE FROM OrderDetails WHERE OrderID = ?", (order_id,))
+    conn.execute("DELETE FROM Orders WHERE OrderID = ?", (order_id,))
+
+
+def _names_changed(conn):
+    conn.execute("UPDATE Customers SET CompanyName = 'Renamed Ltd' WHERE CustomerID = (SELECT MIN(CustomerID) FROM Customers)")
+    conn.execute("UPDATE Employees SET LastName = 'Renamed' WHERE EmployeeID = 1")
+
+
+def _customer_rekeyed(conn):
+    conn.execute("UPDATE Customers SET CustomerID = 'ZZKEY' WHERE CustomerID = (SELECT MIN(CustomerID) FROM Customers)")
+
+
+def _ordering_customer_rekeyed(conn):
+    customer = _value(conn, "SELECT CustomerID FROM Orders WHERE OrderID = (SELECT MIN(OrderID) FROM Orders)")
+    # Its orders keep pointing at the old key.
+    conn.execute("UPDATE Customers SET CustomerID = 'ZZORD' WHERE CustomerID = ?", (customer,))
+
+
+def _ordering_employee_deleted(conn):
+    conn.execute("DELETE FROM Employees WHERE EmployeeID = (SELECT MAX(EmployeeID) FROM Employees)")
+
+
+def _customer_deleted(conn):
+    conn.execute(
+        "DELETE FROM Customers WHERE CustomerID = ("
+        " SELECT MIN(CustomerID) FROM Customers WHERE CustomerID NOT IN (SELECT CustomerID FROM Orders))"
+    )
+
+
+def _bulk_append(conn):
+    customer = _value(conn, "SELECT MIN(CustomerID) FROM Customers")
+    conn.execute("BEGIN")
+    for _ in range(50):
+        _new_order(conn, customer, lines=3)
+    conn.execute("COMMIT")
+
+
+CHANGES = [
+    _new_customer,
+    _line_added_to_old_order,
+    _lines_before_order,
+    _line_repriced,
+    _line_moved,
+    _line_deleted,
+    _order_reassigned,
+    _order_shipped,
+    _order_deleted,
+    _names_changed,
+    _customer_rekeyed,
+    _ordering_customer_rekeyed,
+    _ordering_employee_deleted,
+    _customer_deleted,
+    _bulk_append,
+]
+
+
+def test_generated_database_is_consistent(writer):
+    assert_consistent(writer)
+
+
+@pytest.mark.parametrize("change", CHANGES, ids=lambda change: change.__name__.strip("_"))
+def test_tables_follow_change(writer, change):
+    change(writer)
+    assert_consistent(writer)
+
+
+def test_tables_follow_every_change_in_sequence(writer):
+    for change in CHANGES:
+        change(writer)
+    assert_consistent(writer)